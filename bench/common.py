@@ -0,0 +1,44 @@
+"""Shared fixtures for the benchmarks; run them from the repo root, e.g. `python -m bench.node_index`"""
+import resource
+import time
+from typing import Callable
+
+from packed_udvts.member import Member
+from packed_udvts.udvt import UserDefinedValueType
+
+
+def readme_example() -> UserDefinedValueType:
+    """The layout used by example/example.py"""
+    members = [
+        Member(name="foo", width_bits=8, bytesN=None, signed=True, expansion_bits=10),
+        Member(name="bar", width_bits=31, bytesN=4, signed=False),
+        Member(name="baz", width_bits=69, bytesN=None, signed=False),
+        Member(name="qux", width_bits=25, bytesN=None, signed=False, expansion_bits=1),
+    ]
+    return UserDefinedValueType.from_members(
+        name="UDVT", members=members, value_type="uint256"
+    )
+
+
+def max_packed_array() -> UserDefinedValueType:
+    """The largest library the generator can produce: a packed array of 1-bit members"""
+    return UserDefinedValueType.packed_array_of(Member(name="flag", width_bits=1))
+
+
+def rss_kib() -> int:
+    """Current resident set size in KiB (falls back to the peak RSS off Linux)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def timeit(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Best wall-clock time of `repeat` calls to fn, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
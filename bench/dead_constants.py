@@ -0,0 +1,29 @@
+"""Source size and constant count of generated libraries with and without pruning of
+unreferenced constants (render_file(optimize=True)).
+
+    python -m bench.dead_constants
+"""
+
+from sol_ast.ast import VariableDeclarationStatement
+from bench.common import max_packed_array, readme_example
+
+
+def constants(unit) -> int:
+    library = unit.nodes[-1]
+    return sum(isinstance(n, VariableDeclarationStatement) for n in library.nodes)
+
+
+def main() -> None:
+    print(f"{'layout':<20} {'optimize':<9} {'constants':>9} {'bytes':>9}")
+    for label, udvt in (
+        ("readme example", readme_example()),
+        ("max packed array", max_packed_array()),
+    ):
+        for optimize in (False, True):
+            unit = udvt.render_file(optimize=optimize)
+            size = len(unit.fmt().encode())
+            print(f"{label:<20} {str(optimize):<9} {constants(unit):>9} {size:>9}")
+
+
+if __name__ == "__main__":
+    main()
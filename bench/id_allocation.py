@@ -0,0 +1,37 @@
+"""Node construction throughput under each id allocator; RandomIdAllocator is the original scheme.
+
+    python -m bench.id_allocation
+"""
+from sol_ast.ast import (
+    Identifier,
+    LazyIdAllocator,
+    RandomIdAllocator,
+    SequentialIdAllocator,
+    YulFunctionCall,
+    YulIdentifier,
+)
+from bench.common import readme_example, timeit
+
+NODES = 100_000
+
+
+def construct() -> None:
+    name = YulIdentifier("and")
+    for _ in range(NODES // 2):
+        YulFunctionCall(name, [Identifier("self")])
+
+
+def main() -> None:
+    udvt = readme_example()
+    print(f"{'allocator':<24} {'nodes/sec':>12} {'render ms':>10}")
+    for allocator in (RandomIdAllocator, SequentialIdAllocator, LazyIdAllocator):
+        with allocator():
+            construct_time = timeit(construct)
+            render_time = timeit(lambda: udvt.render_file().fmt())
+        print(
+            f"{allocator.__name__:<24} {NODES / construct_time:>12,.0f} {render_time * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Cold-start cost of the generator: `python -X importtime -c "import packed_udvts.udvt"`.
+
+Runs each import in a fresh interpreter with a warm bytecode cache (in a temporary
+PYTHONPYCACHEPREFIX) and reports the median self time of the slowest modules, and the
+cumulative time of the whole import against a budget.
+
+python -m bench.import_time
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+TARGET = "packed_udvts.udvt"
+BUDGET_MS = 50.0
+RUNS = 7
+
+
+def import_times(module: str, env: dict[str, str]) -> dict[str, tuple[int, int]]:
+    """(self, cumulative) microseconds per imported module in one run"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_us), int(cumulative)
+    return times
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as cache:
+        env = {**os.environ, "PYTHONPYCACHEPREFIX": cache, "PYTHONPATH": os.getcwd()}
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        import_times(TARGET, env)  # warm up the bytecode cache
+        runs = [import_times(TARGET, env) for _ in range(RUNS)]
+    self_ms = {
+        name: statistics.median(run.get(name, (0, 0))[0] for run in runs) / 1000
+        for name in runs[0]
+    }
+    total_ms = statistics.median(run[TARGET][1] for run in runs) / 1000
+    print(f"{'module':<28} {'self ms':>8}")
+    for name, ms in sorted(self_ms.items(), key=lambda item: -item[1])[:10]:
+        print(f"{name:<28} {ms:>8.1f}")
+    status = "ok" if total_ms <= BUDGET_MS else "OVER BUDGET"
+    print(f"\nimport {TARGET}: {total_ms:.1f} ms (budget {BUDGET_MS:.0f} ms) {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Allocations made while rendering a 32-member UDVT, with and without leaf interning.
+
+python -m bench.interning
+"""
+
+import gc
+import tracemalloc
+
+from packed_udvts.member import Member
+from packed_udvts.udvt import UserDefinedValueType
+from sol_ast.ast import AstId, SequentialIdAllocator, set_interning
+
+
+class CountingIdAllocator(SequentialIdAllocator):
+    """Counts the nodes constructed across every unit it numbers"""
+
+    constructed = 0
+
+    def allocate(self) -> AstId:
+        CountingIdAllocator.constructed += 1
+        return super().allocate()
+
+
+def measure(udvt: UserDefinedValueType) -> tuple[int, int, int]:
+    CountingIdAllocator.constructed = 0
+    gc.collect()
+    tracemalloc.start()
+    with CountingIdAllocator():
+        unit = udvt.render_file()
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    del unit
+    return CountingIdAllocator.constructed, blocks, peak
+
+
+def main() -> None:
+    members = [Member(name=f"field{i}", width_bits=8) for i in range(32)]
+    udvt = UserDefinedValueType.from_members(
+        name="Wide", members=members, value_type="uint256"
+    )
+    print(f"{'interning':<10} {'nodes built':>12} {'live blocks':>12} {'peak KiB':>10}")
+    for enabled in (False, True):
+        previous = set_interning(enabled)
+        try:
+            constructed, blocks, peak = measure(udvt)
+        finally:
+            set_interning(previous)
+        print(f"{str(enabled):<10} {constructed:>12} {blocks:>12} {peak / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Memory across repeated renders: nodes must not outlive the render that built them.
+
+    python -m bench.node_index [iterations]
+"""
+import gc
+import sys
+import tracemalloc
+
+from bench.common import max_packed_array, rss_kib
+
+
+def main(iterations: int = 20) -> None:
+    udvt = max_packed_array()
+    tracemalloc.start()
+    print(f"{'iter':>4} {'traced KiB':>12} {'rss KiB':>10}")
+    for i in range(iterations):
+        udvt.render_file().fmt()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        print(f"{i:>4} {current // 1024:>12} {rss_kib():>10}")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
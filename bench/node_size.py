@@ -0,0 +1,47 @@
+"""Memory footprint of the typesafe AST built by render_file(): node count, bytes per node
+and total size.
+
+    python -m bench.node_size
+"""
+import gc
+import sys
+import tracemalloc
+
+from sol_ast.ast import NodeIndex
+from bench.common import max_packed_array, readme_example
+
+
+def node_bytes(node: object) -> int:
+    """Shallow size of a node, including its instance __dict__ if it has one"""
+    size = sys.getsizeof(node)
+    if hasattr(node, "__dict__"):
+        size += sys.getsizeof(node.__dict__)
+    return size
+
+
+def measure(label: str, udvt) -> None:
+    # traced separately from the index so its bookkeeping is not counted
+    gc.collect()
+    tracemalloc.start()
+    unit = udvt.render_file()
+    total, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del unit
+
+    with NodeIndex() as index:
+        unit = udvt.render_file()
+    nodes = list(index.nodes.values())
+    shallow = sum(node_bytes(n) for n in nodes)
+    print(
+        f"{label:<28} {len(nodes):>8} {shallow / len(nodes):>10.1f} {total / 1024:>12.1f}"
+    )
+
+
+def main() -> None:
+    print(f"{'layout':<28} {'nodes':>8} {'B/node':>10} {'AST KiB':>12}")
+    measure("readme example", readme_example())
+    measure("max packed array", max_packed_array())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Structural hashing of a full library versus rendering it and hashing the text.
+
+    python -m bench.structural_hash
+"""
+import time
+from hashlib import blake2b
+
+from sol_ast.hashing import structural_hash
+from bench.common import max_packed_array
+
+
+def best(run_on_fresh_unit, udvt, repeat: int = 5) -> float:
+    """Best time of run_on_fresh_unit(unit) over freshly built units (build not timed)"""
+    times = []
+    for _ in range(repeat):
+        unit = udvt.render_file()
+        start = time.perf_counter()
+        run_on_fresh_unit(unit)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    udvt = max_packed_array()
+    warm = udvt.render_file()
+    structural_hash(warm)
+    passes = {
+        "fmt() + blake2b": lambda unit: blake2b(unit.fmt().encode()).digest(),
+        "structural_hash (cold)": structural_hash,
+        "structural_hash (cached)": lambda unit: structural_hash(warm),
+    }
+    print(f"{'pass':<26} {'ms':>8}")
+    for label, run in passes.items():
+        print(f"{label:<26} {best(run, udvt) * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Throughput of the generic traversals over the largest generated library.
+
+python -m bench.traversal
+"""
+
+from sol_ast.visitor import NodeTransformer, NodeVisitor, walk
+from bench.common import max_packed_array, timeit
+
+
+class Counter(NodeVisitor):
+    def __init__(self):
+        self.count = 0
+
+    def generic_visit(self, node):
+        self.count += 1
+
+
+def main() -> None:
+    unit = max_packed_array().render_file()
+    nodes = sum(1 for _ in walk(unit))
+    passes = {
+        "walk()": lambda: sum(1 for _ in walk(unit)),
+        "NodeVisitor": lambda: Counter().visit(unit),
+        "NodeTransformer (identity)": lambda: NodeTransformer().visit(unit),
+    }
+    print(f"{nodes} nodes")
+    print(f"{'pass':<28} {'ms':>8} {'nodes/sec':>12}")
+    for label, run in passes.items():
+        seconds = timeit(run)
+        print(f"{label:<28} {seconds * 1000:>8.2f} {nodes / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
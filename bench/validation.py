@@ -0,0 +1,25 @@
+"""Cost of the debug-only structural checks on a large library render.
+
+    python -m bench.validation
+"""
+from sol_ast.utils import set_validation
+from bench.common import max_packed_array, timeit
+
+
+def main() -> None:
+    udvt = max_packed_array()
+    render = lambda: udvt.render_file().fmt()
+    previous = set_validation(True)
+    try:
+        checked = timeit(render)
+    finally:
+        set_validation(False)
+    unchecked = timeit(render)
+    set_validation(previous)
+    print(f"validation on:  {checked * 1000:8.2f} ms")
+    print(f"validation off: {unchecked * 1000:8.2f} ms")
+    print(f"saved:          {(checked - unchecked) * 1000:8.2f} ms ({1 - unchecked / checked:.1%})")
+
+
+if __name__ == "__main__":
+    main()
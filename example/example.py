@@ -26,11 +26,11 @@ import os
 os.makedirs("src/lib", exist_ok=True)
 
 with open("src/lib/UDVTType.sol", "w") as f:
-    f.write(u.render_file(typesafe=False).fmt())
+    u.render_file(typesafe=False).write(f)
 
 
 with open("test/foundry/UDVT.t.sol", "w") as f:
-    f.write(tg.generate().fmt())
+    tg.generate().write(f)
 
 # print(u.render_file(typesafe=False))
 
@@ -0,0 +1,30 @@
+"""Generator for packed user-defined value types. The main classes are exported lazily:
+`from packed_udvts import UserDefinedValueType` only imports the modules it needs."""
+from importlib import import_module
+
+_EXPORTS = {
+    "AccessGroup": "packed_udvts.packer",
+    "ConstantPool": "packed_udvts.constant_pool",
+    "Member": "packed_udvts.member",
+    "PackedArray": "packed_udvts.array",
+    "PackedRecord": "packed_udvts.record",
+    "pack_members": "packed_udvts.packer",
+    "Region": "packed_udvts.region",
+    "TestGen": "packed_udvts.test_gen",
+    "UserDefinedValueType": "packed_udvts.udvt",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
@@ -0,0 +1,311 @@
+"""Dynamic-index accessors for the packed arrays made by
+UserDefinedValueType.packed_array_of.
+
+An array UDVT holds its length in one member and its elements in equal-width members
+after it. Instead of one getter and setter per index, PackedArray generates get(i),
+set(i, value), push, pop and length, which compute the element's offset as
+ELEMENT_OFFSET + i * ELEMENT_WIDTH_BITS at runtime and check i against the length.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from packed_udvts.region import Region
+from sol_ast.ast import (
+    Block,
+    ElementaryTypeName,
+    ErrorDefinition,
+    FunctionCall,
+    FunctionDefinition,
+    Identifier,
+    InlineAssembly,
+    Literal,
+    ParameterList,
+    Statement,
+    TypeName,
+    VariableDeclaration,
+    VariableDeclarationStatement,
+    YulAssignment,
+    YulBlock,
+    YulExpression,
+    YulIdentifier,
+    YulLiteral,
+    YulStatement,
+    YulVariableDeclaration,
+    yul_add,
+    yul_and,
+    yul_iszero,
+    yul_lt,
+    yul_mul,
+    yul_not,
+    yul_or,
+    yul_shl,
+    yul_shr,
+    yul_sub,
+)
+from sol_ast.enums import FunctionCallKind, Mutability, StateMutability
+
+
+@dataclass
+class PackedArray:
+    """The length and element layout of an array UDVT"""
+
+    # the member holding the number of elements in use
+    length: Region
+    # a member of the element width at the offset of the first element
+    element: Region
+    # the number of elements the word has room for
+    capacity: int
+
+    @property
+    def capacity_name(self) -> Identifier:
+        return Identifier.interned("CAPACITY")
+
+    def get_constant_declarations(self) -> list[VariableDeclaration]:
+        """Get the constants the dynamic accessors use beyond the length's: the
+        element's end mask, offset and width, and the capacity"""
+        element_constants = [
+            d
+            for d in self.element.get_constant_declarations()
+            if d.name.name != self.element.not_mask_name.name
+        ]
+        return element_constants + [
+            VariableDeclaration(
+                mutability=Mutability.Constant,
+                type_name=ElementaryTypeName("uint256"),
+                name=self.capacity_name,
+                value=Literal.interned(str(self.capacity)),
+            )
+        ]
+
+    def error_definition(self) -> ErrorDefinition:
+        return ErrorDefinition("IndexOutOfBounds", ParameterList())
+
+    def declarations(
+        self, udt_name: TypeName, typesafe: bool = True
+    ) -> list[FunctionDefinition]:
+        """Get length, get, set, push and pop"""
+        return [
+            self.length_getter(udt_name),
+            self.getter(udt_name, typesafe),
+            self.setter(udt_name, typesafe),
+            self.push(udt_name, typesafe),
+            self.pop(udt_name),
+        ]
+
+    def length_getter(self, udt_name: TypeName) -> FunctionDefinition:
+        """Get length(self), the number of elements in use"""
+        return FunctionDefinition(
+            name="length",
+            parameters=ParameterList(self_declaration(udt_name)),
+            return_parameters=ParameterList(
+                VariableDeclaration(
+                    type_name=ElementaryTypeName("uint256"),
+                    name=self.length.member.shadowed_name,
+                )
+            ),
+            state_mutability=StateMutability.Pure,
+            body=Block(
+                InlineAssembly(YulBlock(self.length._shift_and_unmask_statement()))
+            ),
+        )
+
+    def getter(self, udt_name: TypeName, typesafe: bool = True) -> FunctionDefinition:
+        """Get get(self, i), which reverts with IndexOutOfBounds unless i < length"""
+        i = YulIdentifier.interned("i")
+        return FunctionDefinition(
+            name="get",
+            parameters=ParameterList(self_declaration(udt_name), index_declaration()),
+            return_parameters=ParameterList(
+                VariableDeclaration(
+                    type_name=self.element.member.typestr(typesafe),
+                    name=self.element.member.shadowed_name,
+                )
+            ),
+            state_mutability=StateMutability.Pure,
+            body=self._checked_block(
+                [],
+                yul_iszero(yul_lt(i, self._length_value())),
+                None,
+                YulAssignment(
+                    self.element.member.shadowed_name.to_yul_identifier(),
+                    value=yul_and(
+                        yul_shr(self._element_shift(i), YulIdentifier.interned("self")),
+                        self.element.end_mask_name.to_yul_identifier(),
+                    ),
+                ),
+            ),
+        )
+
+    def setter(self, udt_name: TypeName, typesafe: bool = True) -> FunctionDefinition:
+        """Get set(self, i, value), which reverts with IndexOutOfBounds unless
+        i < length; with typesafe, a value that does not fit reverts with UnsafeValue"""
+        i = YulIdentifier.interned("i")
+        shift = YulIdentifier.interned("shift")
+        return FunctionDefinition(
+            name="set",
+            parameters=ParameterList(
+                self_declaration(udt_name),
+                index_declaration(),
+                self.element.get_shadowed_declaration(typesafe),
+            ),
+            return_parameters=ParameterList(updated_declaration(udt_name)),
+            state_mutability=StateMutability.Pure,
+            body=self._checked_block(
+                [],
+                yul_iszero(yul_lt(i, self._length_value())),
+                self._violation_predicate(typesafe),
+                YulVariableDeclaration(shift, value=self._element_shift(i)),
+                YulAssignment(
+                    YulIdentifier.interned("updated"),
+                    value=self._write_element(YulIdentifier.interned("self"), shift),
+                ),
+            ),
+        )
+
+    def push(self, udt_name: TypeName, typesafe: bool = True) -> FunctionDefinition:
+        """Get push(self, value), which appends value and reverts with
+        IndexOutOfBounds if the array is full"""
+        length = YulIdentifier.interned("len")
+        shift = YulIdentifier.interned("shift")
+        incremented = yul_add(
+            YulIdentifier.interned("self"),
+            self.length.shift_into_place(YulLiteral.interned("1")),
+        )
+        return FunctionDefinition(
+            name="push",
+            parameters=ParameterList(
+                self_declaration(udt_name),
+                self.element.get_shadowed_declaration(typesafe),
+            ),
+            return_parameters=ParameterList(updated_declaration(udt_name)),
+            state_mutability=StateMutability.Pure,
+            body=self._checked_block(
+                [YulVariableDeclaration(length, value=self._length_value())],
+                yul_iszero(yul_lt(length, self.capacity_name.to_yul_identifier())),
+                self._violation_predicate(typesafe),
+                YulVariableDeclaration(shift, value=self._element_shift(length)),
+                YulAssignment(
+                    YulIdentifier.interned("updated"),
+                    value=self._write_element(incremented, shift),
+                ),
+            ),
+        )
+
+    def pop(self, udt_name: TypeName) -> FunctionDefinition:
+        """Get pop(self), which removes and clears the last element and reverts with
+        IndexOutOfBounds if the array is empty"""
+        length = YulIdentifier.interned("len")
+        decremented = yul_sub(
+            YulIdentifier.interned("self"),
+            self.length.shift_into_place(YulLiteral.interned("1")),
+        )
+        last = yul_sub(length, YulLiteral.interned("1"))
+        return FunctionDefinition(
+            name="pop",
+            parameters=ParameterList(self_declaration(udt_name)),
+            return_parameters=ParameterList(updated_declaration(udt_name)),
+            state_mutability=StateMutability.Pure,
+            body=self._checked_block(
+                [YulVariableDeclaration(length, value=self._length_value())],
+                yul_iszero(length),
+                None,
+                YulAssignment(
+                    YulIdentifier.interned("updated"),
+                    value=yul_and(
+                        decremented,
+                        yul_not(self._element_mask(self._element_shift(last))),
+                    ),
+                ),
+            ),
+        )
+
+    def _length_value(self) -> YulExpression:
+        return self.length.extract_bits(YulIdentifier.interned("self"))
+
+    def _element_shift(self, index: YulExpression) -> YulExpression:
+        """Get the offset of the element at index"""
+        return yul_add(
+            self.element.offset_bits_name.to_yul_identifier(),
+            yul_mul(index, self.element.width_bits_name.to_yul_identifier()),
+        )
+
+    def _element_mask(self, shift: YulExpression) -> YulExpression:
+        return yul_shl(shift, self.element.end_mask_name.to_yul_identifier())
+
+    def _write_element(
+        self, word: YulExpression, shift: YulExpression
+    ) -> YulExpression:
+        """Get word with the element at shift replaced by the value parameter"""
+        value = self.element.compact_bits(
+            self.element.member.shadowed_name.to_yul_identifier()
+        )
+        return yul_or(
+            yul_and(word, yul_not(self._element_mask(shift))),
+            yul_shl(shift, self.element.packed_bits(value)),
+        )
+
+    def _violation_predicate(self, typesafe: bool) -> Optional[YulExpression]:
+        if not typesafe:
+            return None
+        return self.element.violation_predicate(self.element.compacted_reference())
+
+    def _checked_block(
+        self,
+        bindings: Sequence[YulStatement],
+        out_of_bounds: YulExpression,
+        violation: Optional[YulExpression],
+        *statements: YulStatement,
+    ) -> Block:
+        """Get one assembly block with the let-bindings the predicates refer to, then
+        outOfBounds (and err, given a violation predicate) and the statements; the
+        reverts follow the block"""
+        flags: list[tuple[str, YulExpression, str]] = [
+            ("outOfBounds", out_of_bounds, "IndexOutOfBounds")
+        ]
+        if violation is not None:
+            flags.append(("err", violation, "UnsafeValue"))
+        checks = [
+            YulAssignment(YulIdentifier.interned(flag), value=predicate)
+            for flag, predicate, _ in flags
+        ]
+        assembly = InlineAssembly(YulBlock(*bindings, *checks, *statements))
+        body: list[Statement] = [flag_declaration(flag) for flag, _, _ in flags]
+        body.append(assembly)
+        body.extend(
+            self.element.assertion(
+                Identifier.interned(flag),
+                FunctionCall(
+                    Identifier.interned(error),
+                    kind=FunctionCallKind.FunctionCall,
+                    arguments=[],
+                ),
+            )
+            for flag, _, error in flags
+        )
+        return Block(*body)
+
+
+def self_declaration(udt_name: TypeName) -> VariableDeclaration:
+    return VariableDeclaration(type_name=udt_name, name=Identifier.interned("self"))
+
+
+def updated_declaration(udt_name: TypeName) -> VariableDeclaration:
+    return VariableDeclaration(type_name=udt_name, name=Identifier.interned("updated"))
+
+
+def index_declaration() -> VariableDeclaration:
+    return VariableDeclaration(
+        type_name=ElementaryTypeName("uint256"), name=Identifier.interned("i")
+    )
+
+
+def flag_declaration(name: str) -> Statement:
+    return VariableDeclarationStatement(
+        assignments=[
+            VariableDeclaration(
+                type_name=ElementaryTypeName("bool"), name=Identifier.interned(name)
+            )
+        ],
+        initial_value=None,
+    )
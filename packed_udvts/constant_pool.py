@@ -0,0 +1,51 @@
+from typing import Iterable, Iterator
+
+from sol_ast.ast import VariableDeclaration, VariableDeclarationStatement
+
+
+class ConstantPool:
+    """Constant declarations keyed by name, in the order they were first added. Adding a
+    name that is already pooled with the same value is a no-op, so regions sharing a mask
+    (e.g. every 8-bit member's _8_BIT_END_MASK) declare it once; the same name with a
+    different value is an error.
+    """
+
+    def __init__(self, declarations: Iterable[VariableDeclaration] = ()):
+        self._declarations: dict[str, VariableDeclaration] = {}
+        self.extend(declarations)
+
+    def add(self, declaration: VariableDeclaration) -> None:
+        """Pool a constant declaration"""
+        name = declaration.name.name
+        existing = self._declarations.get(name)
+        if existing is None:
+            self._declarations[name] = declaration
+        elif _value(existing) != _value(declaration):
+            raise ValueError(
+                f"Conflicting values for constant {name}: "
+                f"{_value(existing)} and {_value(declaration)}"
+            )
+
+    def extend(self, declarations: Iterable[VariableDeclaration]) -> None:
+        for declaration in declarations:
+            self.add(declaration)
+
+    def statements(self) -> list[VariableDeclarationStatement]:
+        """Get the pooled constants as declaration statements"""
+        return [
+            VariableDeclarationStatement(assignments=[d], initial_value=None)
+            for d in self._declarations.values()
+        ]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._declarations
+
+    def __iter__(self) -> Iterator[VariableDeclaration]:
+        return iter(self._declarations.values())
+
+    def __len__(self) -> int:
+        return len(self._declarations)
+
+
+def _value(declaration: VariableDeclaration) -> str:
+    return declaration.value.fmt() if declaration.value is not None else ""
@@ -101,12 +101,12 @@ class Member:
     @property
     def identifier(self) -> Identifier:
         """Get the identifier of this region"""
-        return Identifier(self.camel)
+        return Identifier.interned(self.camel)
 
     @property
     def shadowed_name(self) -> Identifier:
         """Get the shadowed name of this region"""
-        return Identifier(f"_{self.camel}")
+        return Identifier.interned(f"_{self.camel}")
 
     @property
     def safe_typestr(self) -> ElementaryTypeName:
@@ -114,12 +114,7 @@ class Member:
         TODO: udvt members?
         """
         if self.bytesN is None:
-            num_bytes = (self.width_bits + (self.expansion_bits or 0)) // 8
-            recovered_bits = num_bytes * 8
-            if recovered_bits == self.width_bits:
-                num_bits = recovered_bits
-            else:
-                num_bits = (num_bytes + 1) * 8
+            num_bits = self.ceil_bytes * 8
             return ElementaryTypeName(f"{'' if self.signed else 'u'}int{num_bits}")
         return ElementaryTypeName(f"bytes{self.bytesN}")
 
@@ -0,0 +1,120 @@
+"""Assign members to storage words so that fields read together share a word.
+
+pack_members() takes the members and the access groups they are read in (the fields one
+call reads, weighted by how often it runs) and fills words greedily: the heaviest groups
+are placed first, each into a single word where possible, preferring a word that
+already holds part of the group. Members in no group fill the remaining space,
+widest first.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from packed_udvts.member import Member
+from packed_udvts.record import PackedRecord
+from packed_udvts.udvt import UserDefinedValueType
+
+WORD_BITS = 256
+
+
+@dataclass
+class AccessGroup:
+    """Members read together by one kind of call, and how often it runs"""
+
+    name: str
+    members: list[str]
+    weight: float = 1.0
+
+
+@dataclass
+class Packing:
+    """Members assigned to words; within a word, members keep declaration order"""
+
+    members: list[Member]
+    groups: list[AccessGroup]
+    words: list[list[Member]] = field(default_factory=list)
+
+    @property
+    def word_of(self) -> dict[str, int]:
+        """Get the index of the word holding each member, by member name"""
+        return {m.name: i for i, word in enumerate(self.words) for m in word}
+
+    def slots_touched(self, group: AccessGroup) -> int:
+        """Get the number of words a call reading the group's members loads"""
+        word_of = self.word_of
+        return len({word_of[name] for name in group.members})
+
+    def report(self) -> dict[str, int]:
+        """Get the number of words touched by each access group, by group name"""
+        return {group.name: self.slots_touched(group) for group in self.groups}
+
+    def expected_slots(self) -> float:
+        """Get the average number of words touched per call, weighted by group"""
+        total = sum(group.weight for group in self.groups)
+        if not total:
+            return 0.0
+        return (
+            sum(group.weight * self.slots_touched(group) for group in self.groups)
+            / total
+        )
+
+    def to_udvts(self, name: str) -> list[UserDefinedValueType]:
+        """Get one UDVT per word, named {name}Word{i}"""
+        return PackedRecord.word_udvts(name, self.words)
+
+    def to_record(self, name: str) -> PackedRecord:
+        """Get a multi-word record with this packing"""
+        return PackedRecord(name, self.members, words=self.words)
+
+
+def pack_members(members: list[Member], groups: Iterable[AccessGroup] = ()) -> Packing:
+    """Assign members to as few words per access group as the greedy order finds"""
+    groups = list(groups)
+    by_name = {m.name: m for m in members}
+    assert len(by_name) == len(members), "Member names must be unique"
+    for group in groups:
+        unknown = [n for n in group.members if n not in by_name]
+        assert not unknown, f"Access group {group.name} has unknown members {unknown}"
+    words: list[list[Member]] = []
+    free: list[int] = []
+    word_of: dict[str, int] = {}
+
+    def place(word: int, batch: list[Member]) -> None:
+        words[word].extend(batch)
+        free[word] -= sum(m.width_bits for m in batch)
+        word_of.update((m.name, word) for m in batch)
+
+    def fit(need: int, preferred: set[int] = set()) -> int:
+        """Get a word with room for need bits, opening one if none has: a preferred
+        word if possible, then the fullest one (best fit)"""
+        candidates = [i for i in range(len(words)) if free[i] >= need]
+        if not candidates:
+            words.append([])
+            free.append(WORD_BITS)
+            return len(words) - 1
+        return max(candidates, key=lambda i: (i in preferred, -free[i]))
+
+    # stable: groups of equal weight are placed in the order given
+    for group in sorted(groups, key=lambda g: -g.weight):
+        pending = [by_name[n] for n in dict.fromkeys(group.members) if n not in word_of]
+        if not pending:
+            continue
+        touched = {word_of[n] for n in group.members if n in word_of}
+        need = sum(m.width_bits for m in pending)
+        if need <= WORD_BITS:
+            place(fit(need, touched), pending)
+            continue
+        # the group cannot share one word: keep as much of it together as fits
+        for m in sorted(pending, key=lambda m: -m.width_bits):
+            word = fit(m.width_bits, touched)
+            place(word, [m])
+            touched.add(word)
+    rest = [m for m in members if m.name not in word_of]
+    for m in sorted(rest, key=lambda m: -m.width_bits):
+        place(fit(m.width_bits), [m])
+    order = {m.name: i for i, m in enumerate(members)}
+    return Packing(
+        members=members,
+        groups=groups,
+        words=[sorted(word, key=lambda m: order[m.name]) for word in words],
+    )
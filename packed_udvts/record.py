@@ -0,0 +1,506 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from packed_udvts.constant_pool import ConstantPool
+from packed_udvts.member import Member
+from packed_udvts.region import Region
+from packed_udvts.udvt import UserDefinedValueType
+from sol_ast.ast import (
+    Assignment,
+    BinaryOperation,
+    Block,
+    ContractDefinition,
+    ElementaryTypeName,
+    ElementaryTypeNameExpression,
+    ErrorDefinition,
+    Expression,
+    ExpressionStatement,
+    FunctionCall,
+    FunctionDefinition,
+    FunctionIdentifierPath,
+    Identifier,
+    IfStatement,
+    License,
+    MemberAccess,
+    ParameterList,
+    PragmaDirective,
+    RevertStatement,
+    SourceUnit,
+    Statement,
+    StructDefinition,
+    TupleExpression,
+    TypeName,
+    UserDefinedTypeName,
+    UsingForDirective,
+    VariableDeclaration,
+    VariableDeclarationStatement,
+    source_unit_ids,
+)
+from sol_ast.enums import (
+    AssignmentOperator,
+    BinaryOperator,
+    ContractKind,
+    FunctionCallKind,
+    Mutability,
+    StateMutability,
+    StorageLocation,
+)
+
+WORD_BITS = 256
+
+
+@dataclass
+class Straddle:
+    """A member split across two consecutive words: its low bits fill the top of one
+    word and its high bits start the next"""
+
+    member: Member
+    # index of the word holding the low part
+    word: int
+    lo: Member
+    hi: Member
+
+    @property
+    def lo_width_bits_name(self) -> Identifier:
+        return Region(self.lo, 0).width_bits_name
+
+    def get_shared_constant_declarations(self) -> list[VariableDeclaration]:
+        """Get the width masks of the member and of its low part"""
+        return [
+            *Region(self.member, 0).get_shared_constant_declarations(),
+            *Region(self.lo, 0).get_shared_constant_declarations(),
+        ]
+
+    def get_constant_declarations(self) -> list[VariableDeclaration]:
+        """Get the constants for splitting and joining the member"""
+        lo = Region(self.lo, 0)
+        return self.get_shared_constant_declarations() + [
+            VariableDeclaration(
+                mutability=Mutability.Constant,
+                type_name=ElementaryTypeName("uint256"),
+                name=lo.width_bits_name,
+                value=lo.width_bits,
+            )
+        ]
+
+
+@dataclass
+class PackedRecord:
+    """A record wider than one word, stored as a struct of per-word UDVTs. Members are
+    packed in declaration order; a member that does not fit in the rest of a word
+    starts the next one, so each getter and setter reads or writes a single word.
+    With allow_straddle, plain unsigned integers are instead split across the two words
+    to pack tighter, at the cost of touching both words on access.
+    """
+
+    name: UserDefinedTypeName
+    members: list[Member]
+    words: list[UserDefinedValueType]
+    # index of the word holding each member, by member name
+    word_of: dict[str, int]
+    straddles: dict[str, Straddle]
+
+    def __init__(
+        self,
+        name: str,
+        members: list[Member],
+        allow_straddle: bool = False,
+        words: Optional[list[list[Member]]] = None,
+    ):
+        """words, if given, assigns the members to words explicitly (e.g. from
+        packed_udvts.packer); members still sets the order of create's parameters"""
+        assert len(members) > 0, "Records must have at least one member"
+        self.name = UserDefinedTypeName(name=name)
+        self.members = members
+        self.word_of = {}
+        self.straddles = {}
+        if words is not None:
+            assert not allow_straddle, "Explicit words cannot straddle"
+            self.word_of = {m.name: i for i, word in enumerate(words) for m in word}
+            assert sum(len(word) for word in words) == len(members) and set(
+                self.word_of
+            ) == {m.name for m in members}, "Every member must be in exactly one word"
+            self.words = self.word_udvts(name, words)
+            return
+        word_members: list[list[Member]] = [[]]
+        used = 0
+        for m in members:
+            free = WORD_BITS - used
+            if m.width_bits > free:
+                if allow_straddle and free and PackedRecord.can_straddle(m):
+                    lo = Member(name=f"{m.name}_lo", width_bits=free)
+                    hi = Member(name=f"{m.name}_hi", width_bits=m.width_bits - free)
+                    self.straddles[m.name] = Straddle(m, len(word_members) - 1, lo, hi)
+                    word_members[-1].append(lo)
+                    word_members.append([hi])
+                    used = hi.width_bits
+                    continue
+                word_members.append([])
+                used = 0
+            self.word_of[m.name] = len(word_members) - 1
+            word_members[-1].append(m)
+            used += m.width_bits
+        self.words = self.word_udvts(name, word_members)
+
+    @staticmethod
+    def word_udvts(name: str, words: list[list[Member]]) -> list[UserDefinedValueType]:
+        """Get the UDVT of each word, named {name}Word{i}"""
+        return [
+            UserDefinedValueType.from_members(
+                name=f"{name}Word{i}", members=word, value_type="uint256"
+            )
+            for i, word in enumerate(words)
+        ]
+
+    @staticmethod
+    def can_straddle(member: Member) -> bool:
+        """Whether a member can be split across words: only plain unsigned integers"""
+        return not (
+            member.signed
+            or member.bytesN
+            or member.expansion_bits
+            or member.custom_typestr is not None
+        )
+
+    @property
+    def width_bits(self) -> int:
+        """Get the number of bits used by the members of this record"""
+        return sum(m.width_bits for m in self.members)
+
+    @property
+    def lib_name(self) -> Identifier:
+        """Get the library name for this record"""
+        return Identifier(f"{self.name}Type")
+
+    @property
+    def struct_declaration(self) -> StructDefinition:
+        """Get the struct holding one UDVT per word"""
+        return StructDefinition(
+            name=self.name.name,
+            members=[
+                VariableDeclaration(type_name=w.name, name=self.word_field(i))
+                for i, w in enumerate(self.words)
+            ],
+        )
+
+    @property
+    def using_declaration(self) -> UsingForDirective:
+        """Get the using declaration for this record"""
+        return UsingForDirective(
+            function_list=[FunctionIdentifierPath(self.lib_name.to_identifier_path())],
+            type_name=self.name,
+            global_=True,
+        )
+
+    @staticmethod
+    def word_field(index: int) -> Identifier:
+        return Identifier.interned(f"word{index}")
+
+    def word_access(self, index: int) -> MemberAccess:
+        """Get the expression `self.word<index>`"""
+        return MemberAccess(Identifier.interned("self"), self.word_field(index).name)
+
+    def call_word(
+        self, index: int, function: str, *arguments: Expression
+    ) -> FunctionCall:
+        """Get a call to a function of the word's library, bound to `self.word<index>`"""
+        return FunctionCall(
+            expression=MemberAccess(self.word_access(index), function),
+            kind=FunctionCallKind.FunctionCall,
+            arguments=list(arguments),
+        )
+
+    def self_declaration(self) -> VariableDeclaration:
+        return VariableDeclaration(
+            type_name=self.name,
+            name=Identifier.interned("self"),
+            storage_location=StorageLocation.Memory,
+        )
+
+    def parameter_declaration(self, m: Member, typesafe: bool) -> VariableDeclaration:
+        return VariableDeclaration(type_name=m.typestr(typesafe), name=m.shadowed_name)
+
+    def fit_check(self, straddle: Straddle, typesafe: bool) -> list[Statement]:
+        """Get the check that a straddled parameter fits its member. The parts are
+        narrowed before being passed on, which would otherwise drop excess bits"""
+        m = straddle.member
+        if not typesafe or m.width_bits % 8 == 0:
+            return []
+        return [
+            IfStatement(
+                BinaryOperation(
+                    m.shadowed_name,
+                    BinaryOperator.GreaterThan,
+                    Region(m, 0).end_mask_name,
+                ),
+                Block(
+                    RevertStatement(
+                        FunctionCall(
+                            Identifier.interned("UnsafeValue"),
+                            kind=FunctionCallKind.FunctionCall,
+                            arguments=[],
+                        )
+                    )
+                ),
+            )
+        ]
+
+    @staticmethod
+    def convert(type_name: TypeName, value: Expression) -> FunctionCall:
+        return FunctionCall(
+            expression=ElementaryTypeNameExpression(type_name),
+            kind=FunctionCallKind.TypeConversion,
+            arguments=[value],
+        )
+
+    def split(
+        self, straddle: Straddle, typesafe: bool
+    ) -> tuple[Expression, Expression]:
+        """Get the low and high parts of a straddled parameter"""
+        value = straddle.member.shadowed_name
+        lo = BinaryOperation(
+            value, BinaryOperator.BitAnd, Region(straddle.lo, 0).end_mask_name
+        )
+        hi = BinaryOperation(value, BinaryOperator.Shr, straddle.lo_width_bits_name)
+        if not typesafe:
+            return lo, hi
+        return (
+            self.convert(straddle.lo.typestr(typesafe), lo),
+            self.convert(straddle.hi.typestr(typesafe), hi),
+        )
+
+    def join(
+        self, straddle: Straddle, lo: Expression, hi: Expression, typesafe: bool
+    ) -> Expression:
+        """Get the value of a straddled member from its low and high parts"""
+        return BinaryOperation(
+            BinaryOperation(
+                self.convert(straddle.member.typestr(typesafe), hi),
+                BinaryOperator.Shl,
+                straddle.lo_width_bits_name,
+            ),
+            BinaryOperator.BitOr,
+            lo,
+        )
+
+    @staticmethod
+    def assign(lhs: Expression, rhs: Expression) -> ExpressionStatement:
+        return ExpressionStatement(
+            Assignment(lhs=lhs, operator=AssignmentOperator.Assign, rhs=rhs)
+        )
+
+    def create_declaration(self, typesafe: bool = True) -> FunctionDefinition:
+        """Get the creation method for this record, taking every member in
+        declaration order"""
+        checks: list[Statement] = []
+        arguments: list[list[Expression]] = [[] for _ in self.words]
+        for m in self.members:
+            straddle = self.straddles.get(m.name)
+            if straddle is None:
+                arguments[self.word_of[m.name]].append(m.shadowed_name)
+                continue
+            checks.extend(self.fit_check(straddle, typesafe))
+            lo, hi = self.split(straddle, typesafe)
+            arguments[straddle.word].append(lo)
+            arguments[straddle.word + 1].append(hi)
+        return FunctionDefinition(
+            name=f"create{self.name}",
+            parameters=ParameterList(
+                *(self.parameter_declaration(m, typesafe) for m in self.members)
+            ),
+            return_parameters=ParameterList(self.self_declaration()),
+            state_mutability=StateMutability.Pure,
+            body=Block(
+                *checks,
+                *(
+                    self.assign(
+                        self.word_access(i),
+                        FunctionCall(
+                            expression=MemberAccess(w.lib_name, f"create{w.name}"),
+                            kind=FunctionCallKind.FunctionCall,
+                            arguments=arguments[i],
+                        ),
+                    )
+                    for i, w in enumerate(self.words)
+                ),
+            ),
+        )
+
+    def unpack_declaration(self, typesafe: bool = True) -> FunctionDefinition:
+        """Get the unpack declaration for this record; each word is read once"""
+        parts: list[Statement] = []
+        joins: list[Statement] = []
+        for straddle in self.straddles.values():
+            parts.extend(
+                VariableDeclarationStatement(
+                    assignments=[self.parameter_declaration(part, typesafe)],
+                    initial_value=None,
+                )
+                for part in (straddle.lo, straddle.hi)
+            )
+            joins.append(
+                self.assign(
+                    straddle.member.shadowed_name,
+                    self.join(
+                        straddle,
+                        straddle.lo.shadowed_name,
+                        straddle.hi.shadowed_name,
+                        typesafe,
+                    ),
+                )
+            )
+        unpacks = [
+            self.assign(
+                TupleExpression([r.member.shadowed_name for r in w.regions]),
+                self.call_word(i, f"unpack{w.name}"),
+            )
+            for i, w in enumerate(self.words)
+        ]
+        return FunctionDefinition(
+            name=f"unpack{self.name}",
+            parameters=ParameterList(self.self_declaration()),
+            return_parameters=ParameterList(
+                *(self.parameter_declaration(m, typesafe) for m in self.members)
+            ),
+            state_mutability=StateMutability.Pure,
+            body=Block(*parts, *unpacks, *joins),
+        )
+
+    def getter(self, m: Member, typesafe: bool = True) -> FunctionDefinition:
+        """Get the getter for a member, which reads only the word(s) holding it"""
+        straddle = self.straddles.get(m.name)
+        if straddle is None:
+            value: Expression = self.call_word(self.word_of[m.name], f"get{m.title}")
+        else:
+            value = self.join(
+                straddle,
+                self.call_word(straddle.word, f"get{straddle.lo.title}"),
+                self.call_word(straddle.word + 1, f"get{straddle.hi.title}"),
+                typesafe,
+            )
+        return FunctionDefinition(
+            name=f"get{m.title}",
+            parameters=ParameterList(self.self_declaration()),
+            return_parameters=ParameterList(self.parameter_declaration(m, typesafe)),
+            state_mutability=StateMutability.Pure,
+            body=Block(self.assign(m.shadowed_name, value)),
+        )
+
+    def setter(self, m: Member, typesafe: bool = True) -> FunctionDefinition:
+        """Get the setter for a member, which updates the record in place and writes
+        only the word(s) holding it"""
+        straddle = self.straddles.get(m.name)
+        if straddle is None:
+            index = self.word_of[m.name]
+            statements: list[Statement] = [
+                self.assign(
+                    self.word_access(index),
+                    self.call_word(index, f"set{m.title}", m.shadowed_name),
+                )
+            ]
+        else:
+            lo, hi = self.split(straddle, typesafe)
+            statements = [
+                *self.fit_check(straddle, typesafe),
+                self.assign(
+                    self.word_access(straddle.word),
+                    self.call_word(straddle.word, f"set{straddle.lo.title}", lo),
+                ),
+                self.assign(
+                    self.word_access(straddle.word + 1),
+                    self.call_word(straddle.word + 1, f"set{straddle.hi.title}", hi),
+                ),
+            ]
+        return FunctionDefinition(
+            name=f"set{m.title}",
+            parameters=ParameterList(
+                self.self_declaration(), self.parameter_declaration(m, typesafe)
+            ),
+            state_mutability=StateMutability.Pure,
+            body=Block(*statements),
+        )
+
+    def constant_pool(self) -> ConstantPool:
+        """Get the constants used to split and join straddled members"""
+        return ConstantPool(
+            v for s in self.straddles.values() for v in s.get_constant_declarations()
+        )
+
+    def library_declaration(
+        self,
+        typesafe: bool = True,
+        optimize: bool = False,
+        shared_constants: Optional[ConstantPool] = None,
+    ) -> ContractDefinition:
+        """Get the library declaration for this record; see
+        UserDefinedValueType.library_declaration"""
+        library = ContractDefinition(
+            *(
+                statement
+                for statement in self.constant_pool().statements()
+                if shared_constants is None
+                or statement.assignments[0].name.name not in shared_constants
+            ),
+            ErrorDefinition("UnsafeValue", ParameterList()),
+            self.create_declaration(typesafe=typesafe),
+            self.unpack_declaration(typesafe=typesafe),
+            *(self.getter(m, typesafe=typesafe) for m in self.members),
+            *(self.setter(m, typesafe=typesafe) for m in self.members),
+            name=self.lib_name.name,
+            kind=ContractKind.Library,
+        )
+        if optimize:
+            from sol_ast.optimize import fold_constants, prune_constants
+
+            fold_constants(library)
+            prune_constants(library)
+        return library
+
+    def render_file(self, typesafe: bool = True, optimize: bool = False) -> SourceUnit:
+        """Render the word UDVTs, the record struct and their libraries into one file;
+        width masks are declared once at file level"""
+        shared_constants = ConstantPool(
+            v
+            for w in self.words
+            for r in w.regions
+            for v in r.get_shared_constant_declarations()
+        )
+        shared_constants.extend(
+            v
+            for s in self.straddles.values()
+            for v in s.get_shared_constant_declarations()
+        )
+        with source_unit_ids():
+            libraries = [
+                w.library_declaration(
+                    typesafe=typesafe,
+                    optimize=optimize,
+                    shared_constants=shared_constants,
+                )
+                for w in self.words
+            ]
+            libraries.append(
+                self.library_declaration(
+                    typesafe=typesafe,
+                    optimize=optimize,
+                    shared_constants=shared_constants,
+                )
+            )
+            unit = SourceUnit(
+                PragmaDirective(["solidity", "^0.8.20"]),
+                *shared_constants.statements(),
+                *(
+                    declaration
+                    for w in self.words
+                    for declaration in (w.type_declaration, w.using_declaration)
+                ),
+                self.struct_declaration,
+                self.using_declaration,
+                *libraries,
+                license=License("MIT"),
+            )
+            if optimize:
+                from sol_ast.optimize import prune_constants
+
+                prune_constants(unit)
+            return unit
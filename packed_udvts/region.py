@@ -1,9 +1,10 @@
 from dataclasses import dataclass
-from typing import Iterable, Optional, cast
+from typing import Callable, Iterable, Optional, Sequence, cast
 
 
 from packed_udvts.member import Member
 from sol_ast.ast import (
+    ArrayTypeName,
     BinaryOperation,
     Block,
     ElementaryTypeName,
@@ -22,15 +23,28 @@ from sol_ast.ast import (
     YulAssignment,
     YulBlock,
     YulExpression,
+    YulExpressionStatement,
+    YulForLoop,
     YulStatement,
     YulVariableDeclaration,
+    yul_eq,
     yul_gt,
     yul_or,
     yul_and,
     YulIdentifier,
     yul_shl,
+    yul_sar,
     yul_shr,
     yul_signextend,
+    yul_add,
+    yul_calldataload,
+    yul_lt,
+    yul_mload,
+    yul_mstore,
+    yul_sload,
+    yul_sstore,
+    yul_tload,
+    yul_tstore,
     YulLiteral,
     yul_iszero,
     Expression,
@@ -38,9 +52,11 @@ from sol_ast.ast import (
 from sol_ast.enums import (
     BinaryOperator,
     FunctionCallKind,
+    InlineAssemblyFlag,
     LiteralKind,
     Mutability,
     StateMutability,
+    StorageLocation,
     Visibility,
 )
 
@@ -62,20 +78,25 @@ class Region:
         """
         # lol, lmao
         mask = int("1" * self.member.width_bits, 2)
-        return Literal(value=hex(mask), kind=LiteralKind.HexNumber)
+        return Literal.interned(hex(mask), LiteralKind.HexNumber)
 
     @property
     def end_mask_name(self) -> Identifier:
         """Get the name of the mask for this member, which will clear all bits above "width_bits"
         It should return a string
         """
-        return Identifier(f"_{self.member.width_bits}_BIT_END_MASK")
+        return Identifier.interned(f"_{self.member.width_bits}_BIT_END_MASK")
 
     @property
-    def not_mask(self, bytecode_minimal: bool = False) -> Expression:
+    def not_mask(self) -> Expression:
         """Get the 256-bit not-mask for this member; it should have 0 bits where the member is, and 1 bits everywhere else
         It should return a hex string starting with 0x and contain 64 hex characters"""
+        return self.not_mask_expression()
 
+    def not_mask_expression(self, bytecode_minimal: bool = False) -> Expression:
+        """Get the not-mask as a literal, or with bytecode_minimal as an expression
+        over the member's OFFSET and WIDTH_BITS constants (sol_ast.optimize folds it
+        back to a literal)"""
         if not bytecode_minimal:
             # lol, lmao
             mask = int(
@@ -85,12 +106,12 @@ class Region:
                 2,
             )
 
-            return Literal(value=hex(mask), kind=LiteralKind.HexNumber)
+            return Literal.interned(hex(mask), LiteralKind.HexNumber)
 
         if self.offset_bits:
             exp = BinaryOperation(
                 operator=BinaryOperator.Sub,
-                lhs=Literal(value="256", kind=LiteralKind.Number),
+                lhs=Literal.interned("256", LiteralKind.Number),
                 rhs=BinaryOperation(
                     operator=BinaryOperator.Add,
                     lhs=self.offset_bits_name,
@@ -100,19 +121,19 @@ class Region:
         else:
             exp = BinaryOperation(
                 operator=BinaryOperator.Sub,
-                lhs=Literal(value="256", kind=LiteralKind.Number),
+                lhs=Literal.interned("256", LiteralKind.Number),
                 rhs=self.width_bits_name,
             )
 
         top_bits_exp = BinaryOperation(
             operator=BinaryOperator.Shl,
-            lhs=Literal(value="1", kind=LiteralKind.Number),
+            lhs=Literal.interned("1", LiteralKind.Number),
             rhs=exp,
         )
         top_bits = BinaryOperation(
             operator=BinaryOperator.Sub,
             lhs=top_bits_exp,
-            rhs=Literal(value="1", kind=LiteralKind.Number),
+            rhs=Literal.interned("1", LiteralKind.Number),
         )
         if self.offset_bits:
             top_bits_shift = BinaryOperation(
@@ -130,10 +151,10 @@ class Region:
         if self.offset_bits:
             bottom_bits = BinaryOperation(
                 operator=BinaryOperator.Sub,
-                rhs=Literal(value="1", kind=LiteralKind.Number),
+                rhs=Literal.interned("1", LiteralKind.Number),
                 lhs=BinaryOperation(
                     operator=BinaryOperator.Shl,
-                    lhs=Literal("1", LiteralKind.Number),
+                    lhs=Literal.interned("1", LiteralKind.Number),
                     rhs=self.offset_bits_name,
                 ),
             )
@@ -145,79 +166,116 @@ class Region:
         else:
             return top
 
+    @property
+    def at_top(self) -> bool:
+        """Whether this member occupies the most significant bits of the word: shifting
+        it down needs no mask, and shifting it into place drops any excess bits"""
+        return self.offset_bits + self.member.width_bits == 256
+
     @property
     def width_bits(self) -> Literal:
         """Get the width of this member in bits"""
-        return Literal(value=str(self.member.width_bits), kind=LiteralKind.Number)
+        return Literal.interned(str(self.member.width_bits), LiteralKind.Number)
 
     @property
     def not_mask_name(self) -> Identifier:
         """Get the name of the 256-bit not-mask for this member; it should have 0 bits where the member is, and 1 bits everywhere else
         It should return a string
         """
-        return Identifier(f"{self.member.name.upper()}_NOT_MASK")
+        return Identifier.interned(f"{self.member.name.upper()}_NOT_MASK")
+
+    @staticmethod
+    def combined_not_mask_name(regions: Sequence["Region"]) -> Identifier:
+        """Get the name of the not-mask clearing every one of the given members"""
+        return Identifier.interned(
+            "_AND_".join(r.member.name.upper() for r in regions) + "_NOT_MASK"
+        )
+
+    @staticmethod
+    def combined_not_mask_declaration(
+        regions: Sequence["Region"],
+    ) -> VariableDeclaration:
+        """Get the constant declaration of the not-mask clearing every one of the given
+        members, so they can be updated with a single AND"""
+        mask = (1 << 256) - 1
+        for r in regions:
+            mask &= ~(((1 << r.member.width_bits) - 1) << r.offset_bits)
+        return VariableDeclaration(
+            mutability=Mutability.Constant,
+            type_name=ElementaryTypeName("uint256"),
+            name=Region.combined_not_mask_name(regions),
+            value=Literal.interned(hex(mask), LiteralKind.HexNumber),
+        )
 
     @property
     def offset_bits_name(self) -> Identifier:
         """Get the name of the offset for this member; it should return a string"""
-        return Identifier(f"{self.member.name.upper()}_OFFSET")
+        return Identifier.interned(f"{self.member.name.upper()}_OFFSET")
 
     @property
     def expansion_bits_name(self) -> Optional[Identifier]:
         """Get the name of the expansion bits for this member; it should return a string"""
         if self.member.num_expansion_bits is None:
             return None
-        return Identifier(f"{self.member.name.upper()}_EXPANSION_BITS")
+        return Identifier.interned(f"{self.member.name.upper()}_EXPANSION_BITS")
 
     @property
     def width_bits_name(self) -> Identifier:
         """Get the name of the width bits for this member; it should return a string"""
-        return Identifier(f"{self.member.name.upper()}_WIDTH_BITS")
-
-    def compact_sign(self, value: YulExpression) -> YulExpression:
-        """Compact the signed bit of this member"""
-        if not self.member.signed:
-            return value
-        # OR the masked value with the compacted signed bit
-        return yul_or(
-            yul_shl(
-                # if it is, shift it all the way to the left of the member. if it's 0, this does nothing
-                YulLiteral(str(self.member.width_bits - 1)),
-                # if the member is signed, the 256th bit is set
-                # this needs to be "compacted" down into the member's width
-                # test if it is greater than end mask, ie, signed
-                yul_gt(
-                    value,
-                    self.end_mask_name.to_yul_identifier(),
-                ),
-            ),
-            # mask the signed bit out of the member
-            yul_and(
-                value,
-                self.end_mask_name.to_yul_identifier(),
-            ),
-        )
+        return Identifier.interned(f"{self.member.name.upper()}_WIDTH_BITS")
 
     def compact_bits(self, value: YulExpression) -> YulExpression:
-        """Compact the expansion bits of this member"""
+        """Compact the expansion bits of this member; signed members shift
+        arithmetically"""
         if self.expansion_bits_name is None:
             return value
-        return yul_shr(
+        shift = yul_sar if self.member.signed else yul_shr
+        return shift(
             self.expansion_bits_name.to_yul_identifier(),
             value,
         )
 
+    @property
+    def compacted_name(self) -> YulIdentifier:
+        """Get the Yul name bound to this member's compacted value"""
+        return YulIdentifier.interned(f"{self.member.camel}Compacted")
+
+    def compacted_declaration(self) -> Optional[YulVariableDeclaration]:
+        """Get the let-binding computing the compacted value once per function; None
+        when the member has no expansion bits and the parameter is already compacted"""
+        if self.expansion_bits_name is None:
+            return None
+        return YulVariableDeclaration(
+            self.compacted_name,
+            value=self.compact_bits(self.member.shadowed_name.to_yul_identifier()),
+        )
+
+    def compacted_reference(self) -> YulExpression:
+        """Get the expression referring to the value bound by compacted_declaration()"""
+        if self.expansion_bits_name is None:
+            return self.member.shadowed_name.to_yul_identifier()
+        return self.compacted_name
+
+    def packed_bits(self, compacted: YulExpression) -> YulExpression:
+        """Get the bits stored for a compacted value, before shifting into place; signed
+        values are truncated to their two's complement width, unless shifting them to
+        the top of the word does so"""
+        if self.member.signed and not self.at_top:
+            return yul_and(compacted, self.end_mask_name.to_yul_identifier())
+        return compacted
+
+    def shift_into_place(self, value: YulExpression) -> YulExpression:
+        """Get the expression shifting value to this member's offset"""
+        if self.offset_bits:
+            return yul_shl(self.offset_bits_name.to_yul_identifier(), value)
+        return value
+
     @property
     def assembly_representation(self) -> YulExpression:
         """Get the assembly representation of this member"""
-        if self.member.signed:
-            return self.compact_sign(
-                self.compact_bits(self.member.shadowed_name.to_yul_identifier())
-            )
-        elif self.expansion_bits_name is not None:
-            return self.compact_bits(self.member.shadowed_name.to_yul_identifier())
-        else:
-            return self.member.shadowed_name.to_yul_identifier()
+        return self.packed_bits(
+            self.compact_bits(self.member.shadowed_name.to_yul_identifier())
+        )
 
     def get_shadowed_declaration(self, typesafe: bool = True) -> VariableDeclaration:
         """Get the shadowed declaration for this member"""
@@ -226,48 +284,106 @@ class Region:
         )
 
     def setter(self, udt_name: TypeName, typesafe: bool = True) -> FunctionDefinition:
-        """Get the function body for the setter for this member"""
-        value_expression = self.member.shadowed_name.to_yul_identifier()
-        if self.member.num_expansion_bits is not None:
-            assert self.expansion_bits_name is not None
-            value_expression = yul_shr(
-                self.expansion_bits_name.to_yul_identifier(),
-                value_expression,
-            )
-        if self.member.signed and self.member.width_bits != 256:
-            # mask signed values and use signextend later
-            value_expression = yul_and(
-                self.compact_sign(value_expression),
-                self.end_mask_name.to_yul_identifier(),
-            )
+        """Get the function body for the setter for this member. With typesafe, the
+        value is compacted once, then validated and written in one assembly block"""
+        updated = YulIdentifier.interned("updated")
+        statements = self._write_block(
+            YulIdentifier.interned("self"),
+            lambda value: YulAssignment(updated, value=value),
+            typesafe,
+        )
+        return self._setter_definition(
+            f"set{self.member.title}", udt_name, typesafe, statements
+        )
 
-        if self.offset_bits:
-            rhs = yul_shl(self.offset_bits_name.to_yul_identifier(), value_expression)
+    def _write_block(
+        self,
+        word: YulExpression,
+        write: Callable[[YulExpression], YulStatement],
+        typesafe: bool,
+    ) -> Block:
+        """Get the statements writing the parameter into word, and passing the updated
+        word to write, in one assembly block; with typesafe, the value is compacted
+        once and validated in the same block, before a single revert check"""
+        compacted = self.compacted_reference()
+        predicate = self.violation_predicate(compacted) if typesafe else None
+        if predicate is not None:
+            let_bindings = [x for x in [self.compacted_declaration()] if x is not None]
+            err_assignment = [
+                YulAssignment(YulIdentifier.interned("err"), value=predicate)
+            ]
         else:
-            rhs = value_expression
+            compacted = self.compact_bits(self.member.shadowed_name.to_yul_identifier())
+            let_bindings, err_assignment = [], []
+        masked = yul_and(word, self.not_mask_name.to_yul_identifier())
+        inline_assembly = InlineAssembly(
+            YulBlock(
+                *let_bindings,
+                *err_assignment,
+                write(
+                    yul_or(masked, self.shift_into_place(self.packed_bits(compacted)))
+                ),
+            )
+        )
+        if err_assignment:
+            return Block(
+                self.err_buf_declaration(), inline_assembly, self.assert_buffer()
+            )
+        return Block(inline_assembly)
+
+    def unsafe_setter(
+        self, udt_name: TypeName, typesafe: bool = True
+    ) -> FunctionDefinition:
+        """Get the setter for callers that guarantee the value fits: it takes the same
+        parameter types as the typesafe setter but writes the value unvalidated. The
+        checks still run when the library's DEBUG_ASSERTIONS is true"""
         masked_lhs = yul_and(
-            YulIdentifier("self"), self.not_mask_name.to_yul_identifier()
+            YulIdentifier.interned("self"), self.not_mask_name.to_yul_identifier()
         )
         updated_assignment = YulAssignment(
-            YulIdentifier("updated"), value=yul_or(masked_lhs, rhs)
+            YulIdentifier.interned("updated"),
+            value=yul_or(
+                masked_lhs, self.shift_into_place(self.assembly_representation)
+            ),
         )
-        inline_assembly = InlineAssembly(YulBlock(updated_assignment))
-        if typesafe:
-            statements = Block(*self.typesafe_require, inline_assembly)
-        else:
-            statements = Block(inline_assembly)
+        statements = Block(
+            *self.debug_only(self.typesafe_require),
+            InlineAssembly(YulBlock(updated_assignment)),
+        )
+        return self._setter_definition(
+            f"set{self.member.title}Unsafe", udt_name, typesafe, statements
+        )
+
+    @staticmethod
+    def debug_only(statements: Iterable[Statement]) -> list[Statement]:
+        """Wrap statements in `if (DEBUG_ASSERTIONS)`; the compiler drops the branch
+        when the constant is false"""
+        statements = list(statements)
+        if not statements:
+            return []
+        return [
+            IfStatement(Identifier.interned("DEBUG_ASSERTIONS"), Block(*statements))
+        ]
+
+    def _setter_definition(
+        self, name: str, udt_name: TypeName, typesafe: bool, body: Block
+    ) -> FunctionDefinition:
         return FunctionDefinition(
-            name=f"set{self.member.title}",
+            name=name,
             parameters=ParameterList(
-                VariableDeclaration(type_name=udt_name, name=Identifier("self")),
+                VariableDeclaration(
+                    type_name=udt_name, name=Identifier.interned("self")
+                ),
                 self.get_shadowed_declaration(typesafe),
             ),
             return_parameters=ParameterList(
-                VariableDeclaration(type_name=udt_name, name=Identifier("updated"))
+                VariableDeclaration(
+                    type_name=udt_name, name=Identifier.interned("updated")
+                )
             ),
             visibility=Visibility.Internal,
             state_mutability=StateMutability.Pure,
-            body=statements,
+            body=body,
         )
 
     @property
@@ -285,7 +401,7 @@ class Region:
         """Get the name of the mask for the bits that should be empty given the number of shift bits"""
         if not self.member.expansion_bits or self.member.bytesN:
             return None
-        return Identifier(f"{self.member.name.upper()}_EMPTY_MASK")
+        return Identifier.interned(f"{self.member.name.upper()}_EMPTY_MASK")
 
     def check_empty_region(self, value: YulExpression) -> Optional[YulExpression]:
         """Get the assembly for checking if the empty bits are empty"""
@@ -302,30 +418,47 @@ class Region:
             )
         )
 
-    def check_signed_fits(self, value: YulExpression) -> YulExpression:
-        """Get the assembly for checking if the bits are compacted without the sign bit"""
-        return yul_gt(value, self.end_mask_name.to_yul_identifier())
-
-    def compacted(self):
-        bit_compacted = self.compact_bits(self.member.shadowed_name.to_yul_identifier())
-        sign_compacted = self.compact_sign(bit_compacted)
-        return sign_compacted
+    def violation_predicate(self, compacted: YulExpression) -> Optional[YulExpression]:
+        """Get the Yul expression that is nonzero when the parameter does not fit this
+        member, given its compacted value: nonzero expansion bits, an unsigned value
+        wider than the member, or a signed value that does not sign-extend from the
+        member's width. None if every value of the parameter type fits"""
+        checks = []
+        empty_check = self.check_empty_region(
+            self.member.shadowed_name.to_yul_identifier()
+        )
+        if empty_check is not None:
+            checks.append(empty_check)
+        if self.member.width_bits != 256:
+            if self.member.signed:
+                # signed widths are whole bytes (see Member)
+                extended = yul_signextend(
+                    YulLiteral.interned(str(self.member.width_bits // 8 - 1)),
+                    compacted,
+                )
+                checks.append(yul_iszero(yul_eq(extended, compacted)))
+            else:
+                checks.append(yul_gt(compacted, self.end_mask_name.to_yul_identifier()))
+        if not checks:
+            return None
+        predicate = checks[0]
+        for check in checks[1:]:
+            predicate = yul_or(predicate, check)
+        return predicate
 
     @property
     def typesafe_require(self) -> Iterable[Statement]:
         """Get the require statement for this member"""
-        # TODO: very inefficient; optimize by reusing masked values
-        err_buf_declaration = self.err_buf_declaration()
         buffer_check = self.buffer_check()
-        error = Literal("Unsafe value", LiteralKind.String)
-        assertion = self.assert_buffer()
-        return [err_buf_declaration, buffer_check, assertion]
+        if buffer_check is None:
+            return []
+        return [self.err_buf_declaration(), buffer_check, self.assert_buffer()]
 
     def assert_buffer(self) -> Statement:
         return self.assertion(
-            Identifier("err"),
+            Identifier.interned("err"),
             FunctionCall(
-                Identifier("UnsafeValue"),
+                Identifier.interned("UnsafeValue"),
                 kind=FunctionCallKind.FunctionCall,
                 arguments=[],
             ),
@@ -338,76 +471,38 @@ class Region:
         return VariableDeclarationStatement(
             assignments=[
                 VariableDeclaration(
-                    type_name=ElementaryTypeName("bool"), name=Identifier("err")
+                    type_name=ElementaryTypeName("bool"),
+                    name=Identifier.interned("err"),
                 )
             ],
             initial_value=None,
         )
 
-    def buffer_check(self) -> Statement:
-        if self.member.bytesN is not None and self.expansion_bits_name:
-            return self.signed_check_err_predicate()
-        elif self.member.signed:
-            return self.signed_check_err_predicate()
-        elif self.expansion_bits_name:
-            return self.expanded_check_err_predicate()
-        else:
-            return self.standard_check_err_predicate()
-
-    def signed_check_err_predicate(self) -> Statement:
-        return InlineAssembly(YulBlock(*self.signed_check_assembly()))
-
-    def expanded_check_err_predicate(self) -> Statement:
-        err_name = YulIdentifier("err")
-        check = self.check_empty_region(self.member.shadowed_name.to_yul_identifier())
-        if check is None:
-            raise ValueError("Cannot check expansion of non-expanded member")
-        err_assign = YulAssignment(err_name, value=check)
-
-        return InlineAssembly(YulBlock(err_assign))
-
-    def standard_check_err_predicate(self) -> Statement:
-        err_name = YulIdentifier("err")
+    def buffer_check(self, accumulate: bool = False) -> Optional[Statement]:
+        """Get the assembly block setting err if the parameter does not fit; with
+        accumulate, err is OR'd with its previous value instead of overwritten"""
+        predicate = self.violation_predicate(self.compacted_reference())
+        if predicate is None:
+            return None
+        err = YulIdentifier.interned("err")
+        if accumulate:
+            predicate = yul_or(err, predicate)
+        declaration = self.compacted_declaration()
         return InlineAssembly(
             YulBlock(
-                YulAssignment(
-                    err_name,
-                    value=yul_gt(
-                        self.member.shadowed_name.to_yul_identifier(),
-                        self.not_mask_name.to_yul_identifier(),
-                    ),
-                )
+                *([declaration] if declaration is not None else []),
+                YulAssignment(err, value=predicate),
             )
         )
 
-    def signed_check_assembly(self) -> list[YulStatement]:
-        if not (self.member.signed or self.member.bytesN):
-            raise ValueError("Cannot check sign of unsigned member")
-
-        empty_check: Optional[YulExpression] = self.check_empty_region(
-            self.member.shadowed_name.to_yul_identifier()
-        )
-        compacted_val = self.compact_bits(self.member.shadowed_name.to_yul_identifier())
-        # TODO: figure out how to pass compacted value down the line to avoid recomputing
-        var = YulIdentifier("compacted")
-        declaration = YulVariableDeclaration(var, value=compacted_val)
-        sign_check = self.check_signed_fits(var)
-        err = YulIdentifier("err")
-
-        if empty_check is not None:
-            err_value = yul_or(empty_check, sign_check)
-        else:
-            err_value = sign_check
-        err_assignment = YulAssignment(err, value=err_value)
-
-        return [declaration, err_assignment]
-
     def getter(self, udt_name: TypeName, typesafe: bool = True) -> FunctionDefinition:
         """Get the function body for the getter for this member"""
         return FunctionDefinition(
             name=f"get{self.member.title}",
             parameters=ParameterList(
-                VariableDeclaration(type_name=udt_name, name=Identifier("self"))
+                VariableDeclaration(
+                    type_name=udt_name, name=Identifier.interned("self")
+                )
             ),
             return_parameters=ParameterList(
                 VariableDeclaration(
@@ -423,33 +518,206 @@ class Region:
         """Get the assembly for shifting and unmasking this member"""
         return InlineAssembly(YulBlock(self._shift_and_unmask_statement()))
 
-    def _shift_and_unmask_statement(self) -> YulStatement:
-        expression_to_mask: YulExpression
-        if self.offset_bits == 0:
-            expression_to_mask = YulIdentifier("self")
+    def _shift_and_unmask_statement(
+        self, word: Optional[YulExpression] = None
+    ) -> YulStatement:
+        """Get the assignment of this member's value, read from word (self if None),
+        to its shadowed name; word is evaluated once"""
+        return YulAssignment(
+            self.member.shadowed_name.to_yul_identifier(),
+            value=self.extract_bits(
+                YulIdentifier.interned("self") if word is None else word
+            ),
+        )
+
+    def extract_bits(self, word: YulExpression) -> YulExpression:
+        """Get the expression reading this member's value out of word"""
+        rhs: YulExpression
+        if self.offset_bits and self.at_top:
+            # nothing above the member: the shift alone isolates it, and an arithmetic
+            # shift also sign-extends it
+            shift = yul_sar if self.member.signed else yul_shr
+            rhs = shift(self.offset_bits_name.to_yul_identifier(), word)
         else:
-            expression_to_mask = yul_shr(
-                self.offset_bits_name.to_yul_identifier(), YulIdentifier("self")
+            if self.offset_bits:
+                word = yul_shr(self.offset_bits_name.to_yul_identifier(), word)
+            rhs = yul_and(word, self.end_mask_name.to_yul_identifier())
+        if self.member.signed and not self.at_top:
+            # extend from the member's own sign bit before expanding
+            rhs = yul_signextend(
+                YulLiteral.interned(str(self.member.width_bits // 8 - 1)), rhs
             )
-        rhs = yul_and(expression_to_mask, self.end_mask_name.to_yul_identifier())
         if self.member.num_expansion_bits:
             assert self.expansion_bits_name is not None
             rhs = yul_shl(self.expansion_bits_name.to_yul_identifier(), rhs)
-        if self.member.signed and self.member.width_bits != 256:
-            rhs = yul_signextend(YulLiteral(str(self.member.ceil_bytes - 1)), rhs)
-        return YulAssignment(self.member.shadowed_name.to_yul_identifier(), value=rhs)
+        return rhs
+
+    def loader(
+        self, typesafe: bool = True, transient: bool = False
+    ) -> FunctionDefinition:
+        """Get load{Member}(slot), which reads this member from a storage slot with
+        one sload, without the caller loading and wrapping the whole word; with
+        transient, tload{Member}(slot) reads it from transient storage"""
+        slot = Identifier.interned("slot")
+        load = yul_tload if transient else yul_sload
+        return FunctionDefinition(
+            name=f"{'tload' if transient else 'load'}{self.member.title}",
+            parameters=ParameterList(
+                VariableDeclaration(type_name=ElementaryTypeName("bytes32"), name=slot)
+            ),
+            return_parameters=ParameterList(
+                VariableDeclaration(
+                    type_name=self.member.typestr(typesafe),
+                    name=self.member.shadowed_name,
+                )
+            ),
+            state_mutability=StateMutability.View,
+            body=Block(
+                InlineAssembly(
+                    YulBlock(
+                        self._shift_and_unmask_statement(load(slot.to_yul_identifier()))
+                    )
+                )
+            ),
+        )
+
+    def storer(
+        self, typesafe: bool = True, transient: bool = False
+    ) -> FunctionDefinition:
+        """Get store{Member}(slot, value), which writes this member into a storage slot
+        with one sload and one sstore, leaving the other members in the slot as they
+        were; with typesafe, the value is validated as in the setter. With transient,
+        tstore{Member}(slot, value) does the same with tload and tstore"""
+        slot = Identifier.interned("slot")
+        load, store = (yul_tload, yul_tstore) if transient else (yul_sload, yul_sstore)
+        return FunctionDefinition(
+            name=f"{'tstore' if transient else 'store'}{self.member.title}",
+            parameters=ParameterList(
+                VariableDeclaration(type_name=ElementaryTypeName("bytes32"), name=slot),
+                self.get_shadowed_declaration(typesafe),
+            ),
+            visibility=Visibility.Internal,
+            body=self._write_block(
+                load(slot.to_yul_identifier()),
+                lambda value: YulExpressionStatement(
+                    store(slot.to_yul_identifier(), value)
+                ),
+                typesafe,
+            ),
+        )
+
+    def calldata_getter(self, typesafe: bool = True) -> FunctionDefinition:
+        """Get calldataGet{Member}(offset), which reads this member from the packed
+        word at a calldata offset, without ABI-decoding or unpacking the word"""
+        offset = Identifier.interned("offset")
+        return FunctionDefinition(
+            name=f"calldataGet{self.member.title}",
+            parameters=ParameterList(
+                VariableDeclaration(
+                    type_name=ElementaryTypeName("uint256"), name=offset
+                )
+            ),
+            return_parameters=ParameterList(
+                VariableDeclaration(
+                    type_name=self.member.typestr(typesafe),
+                    name=self.member.shadowed_name,
+                )
+            ),
+            state_mutability=StateMutability.Pure,
+            body=Block(
+                InlineAssembly(
+                    YulBlock(
+                        self._shift_and_unmask_statement(
+                            yul_calldataload(offset.to_yul_identifier())
+                        )
+                    )
+                )
+            ),
+        )
+
+    def calldata_array_getter(
+        self, udt_name: TypeName, typesafe: bool = True
+    ) -> FunctionDefinition:
+        """Get calldataGet{Member}Array(words), which reads this member from every
+        packed word of a calldata array into a new memory array, in one loop that
+        reads the words in place instead of copying them to memory first"""
+        words = Identifier.interned("words")
+        values = YulIdentifier.interned("values")
+        src = YulIdentifier.interned("src")
+        dst = YulIdentifier.interned("dst")
+        end = YulIdentifier.interned("end")
+        word_size = YulLiteral.interned("0x20")
+        free_memory_pointer = YulLiteral.interned("0x40")
+        length = YulIdentifier.interned("words.length")
+        offset = YulIdentifier.interned("words.offset")
+        return FunctionDefinition(
+            name=f"calldataGet{self.member.title}Array",
+            parameters=ParameterList(
+                VariableDeclaration(
+                    type_name=ArrayTypeName(udt_name),
+                    name=words,
+                    storage_location=StorageLocation.Calldata,
+                )
+            ),
+            return_parameters=ParameterList(
+                VariableDeclaration(
+                    type_name=ArrayTypeName(self.member.typestr(typesafe)),
+                    name=Identifier.interned("values"),
+                    storage_location=StorageLocation.Memory,
+                )
+            ),
+            state_mutability=StateMutability.Pure,
+            body=Block(
+                InlineAssembly(
+                    YulBlock(
+                        YulAssignment(values, value=yul_mload(free_memory_pointer)),
+                        YulExpressionStatement(yul_mstore(values, length)),
+                        YulVariableDeclaration(dst, value=yul_add(values, word_size)),
+                        YulVariableDeclaration(
+                            end,
+                            value=yul_add(
+                                offset, yul_shl(YulLiteral.interned("5"), length)
+                            ),
+                        ),
+                        YulForLoop(
+                            pre=YulBlock(YulVariableDeclaration(src, value=offset)),
+                            condition=yul_lt(src, end),
+                            post=YulBlock(
+                                YulAssignment(src, value=yul_add(src, word_size))
+                            ),
+                            body=YulBlock(
+                                YulExpressionStatement(
+                                    yul_mstore(
+                                        dst, self.extract_bits(yul_calldataload(src))
+                                    )
+                                ),
+                                YulAssignment(dst, value=yul_add(dst, word_size)),
+                            ),
+                        ),
+                        YulExpressionStatement(yul_mstore(free_memory_pointer, dst)),
+                    ),
+                    flags=[InlineAssemblyFlag.MemorySafe],
+                )
+            ),
+        )
+
+    def get_shared_constant_declarations(self) -> list[VariableDeclaration]:
+        """Get the constant declarations named after the member's width rather than its
+        name, which other regions of the same width declare identically"""
+        return [
+            VariableDeclaration(
+                mutability=Mutability.Constant,
+                type_name=ElementaryTypeName("uint256"),
+                name=self.end_mask_name,
+                value=self.end_mask,
+            )
+        ]
 
     def get_constant_declarations(self) -> list[VariableDeclaration]:
         """Get the constant declarations for this member"""
-        return [
+        return self.get_shared_constant_declarations() + [
             x
             for x in [
-                VariableDeclaration(
-                    mutability=Mutability.Constant,
-                    type_name=ElementaryTypeName("uint256"),
-                    name=self.end_mask_name,
-                    value=self.end_mask,
-                ),
                 VariableDeclaration(
                     mutability=Mutability.Constant,
                     type_name=ElementaryTypeName("uint256"),
@@ -460,7 +728,7 @@ class Region:
                     mutability=Mutability.Constant,
                     type_name=ElementaryTypeName("uint256"),
                     name=self.offset_bits_name,
-                    value=Literal(str(self.offset_bits)),
+                    value=Literal.interned(str(self.offset_bits)),
                 )
                 if self.offset_bits
                 else None,
@@ -468,7 +736,7 @@ class Region:
                     mutability=Mutability.Constant,
                     type_name=ElementaryTypeName("uint256"),
                     name=self.expansion_bits_name,
-                    value=Literal(str(self.member.num_expansion_bits)),
+                    value=Literal.interned(str(self.member.num_expansion_bits)),
                 )
                 if self.expansion_bits_name
                 else None,
@@ -1,31 +1,42 @@
 from itertools import chain
+from typing import Sequence
 from packed_udvts.udvt import UserDefinedValueType
 from packed_udvts.region import Region
 from packed_udvts.util import to_statements
 from sol_ast.ast import (
+    ArrayTypeName,
+    Assignment,
     Block,
     ContractDefinition,
+    ElementaryTypeName,
     FunctionCall,
     FunctionDefinition,
     Identifier,
     ImportDirective,
+    IndexAccess,
     InheritanceSpecifier,
     License,
     Literal,
     MemberAccess,
+    NewExpression,
     ParameterList,
     Expression,
     PragmaDirective,
     SourceUnit,
+    Statement,
     SymbolAlias,
     UserDefinedTypeName,
     VariableDeclaration,
     VariableDeclarationStatement,
+    source_unit_ids,
 )
 from sol_ast.enums import (
+    AssignmentOperator,
     ContractKind,
     FunctionCallKind,
     LiteralKind,
+    StateMutability,
+    StorageLocation,
     Visibility,
 )
 
@@ -87,19 +98,9 @@ class TestGen:
             arguments=[lhs, rhs, Literal(msg, kind=LiteralKind.String)],
         )
 
-    def fuzz_get_set_region(self, region: Region) -> FunctionDefinition:
-        updated_member_var_name = Identifier(f"updated{region.member.title}")
-        updated_declaration = VariableDeclaration(
-            region.member.safe_typestr, updated_member_var_name
-        )
-
-        # TODO: fuzz on member.width_bits, bound to 2**member.width_bits, then expand and cast to appropriate type
-        all_region_bounds = chain(
-            (r.member.get_bounds() for r in self.udvt.regions),
-            (region.member.get_bounds(updated_member_var_name),),
-        )
-
-        declaration = VariableDeclarationStatement(
+    def create_udvt(self) -> VariableDeclarationStatement:
+        """Declare the UDVT variable, created from the fuzzed member values"""
+        return VariableDeclarationStatement(
             assignments=[
                 VariableDeclaration(type_name=self.udvt.name, name=self.udvt.var_name)
             ],
@@ -113,6 +114,419 @@ class TestGen:
                 names=[r.member.shadowed_name for r in self.udvt.regions],
             ),
         )
+
+    def fuzz_create_unpack(self) -> FunctionDefinition:
+        """Test that unpack returns the values create was given. Its gas in
+        `forge snapshot` covers create and unpack for the whole layout"""
+        unpacked_names = [
+            Identifier(f"unpacked{r.member.title}") for r in self.udvt.regions
+        ]
+        unpack = VariableDeclarationStatement(
+            assignments=[
+                VariableDeclaration(r.member.safe_typestr, name)
+                for r, name in zip(self.udvt.regions, unpacked_names)
+            ],
+            initial_value=FunctionCall(
+                expression=MemberAccess(
+                    expression=self.udvt.var_name,
+                    member_name=f"unpack{self.udvt.name}",
+                ),
+                kind=FunctionCallKind.FunctionCall,
+            ),
+        )
+        asserts = (
+            self.assert_eq(
+                name, r.member.identifier, f"unpack failed for {r.member.name}"
+            )
+            for r, name in zip(self.udvt.regions, unpacked_names)
+        )
+        return FunctionDefinition(
+            f"testCreateUnpack{self.udvt.name}",
+            visibility=Visibility.Public,
+            parameters=ParameterList(
+                *(r.member.declaration for r in self.udvt.regions)
+            ),
+            body=Block(
+                *to_statements(
+                    *(r.member.get_bounds() for r in self.udvt.regions),
+                    self.create_udvt(),
+                    unpack,
+                    *asserts,
+                )
+            ),
+        )
+
+    def fuzz_fused_getter(self, member_names: Sequence[str]) -> FunctionDefinition:
+        """Test that a fused getter returns the same values as the members were
+        created with"""
+        regions = [self.udvt.region_named(n) for n in member_names]
+        getter = self.udvt.fused_getter(member_names)
+        fused_names = [Identifier(f"fused{r.member.title}") for r in regions]
+        read = VariableDeclarationStatement(
+            assignments=[
+                VariableDeclaration(r.member.safe_typestr, name)
+                for r, name in zip(regions, fused_names)
+            ],
+            initial_value=FunctionCall(
+                expression=MemberAccess(
+                    expression=self.udvt.var_name, member_name=getter.name
+                ),
+                kind=FunctionCallKind.FunctionCall,
+            ),
+        )
+        asserts = (
+            self.assert_eq(
+                name,
+                r.member.identifier,
+                f"fused getter {getter.name} failed for {r.member.name}",
+            )
+            for r, name in zip(regions, fused_names)
+        )
+        return FunctionDefinition(
+            f"testFused{getter.name[0].upper()}{getter.name[1:]}",
+            visibility=Visibility.Public,
+            parameters=ParameterList(
+                *(r.member.declaration for r in self.udvt.regions)
+            ),
+            body=Block(
+                *to_statements(
+                    *(r.member.get_bounds() for r in self.udvt.regions),
+                    self.create_udvt(),
+                    read,
+                    *asserts,
+                )
+            ),
+        )
+
+    def fuzz_fused_setter(self, member_names: Sequence[str]) -> FunctionDefinition:
+        """Test that a fused setter updates its members and leaves the others as
+        they were created"""
+        regions = [self.udvt.region_named(n) for n in member_names]
+        setter = self.udvt.fused_setter(member_names)
+        updated_names = {
+            r.member.name: Identifier(f"updated{r.member.title}") for r in regions
+        }
+        update = VariableDeclarationStatement(
+            assignments=[
+                VariableDeclaration(self.udvt.name, name=self.updated_udvt_var_name())
+            ],
+            initial_value=FunctionCall(
+                expression=MemberAccess(
+                    expression=self.udvt.var_name, member_name=setter.name
+                ),
+                arguments=[updated_names[r.member.name] for r in regions],
+                kind=FunctionCallKind.FunctionCall,
+            ),
+        )
+        asserts = (
+            self.assert_eq(
+                self.call_get(self.updated_udvt_var_name(), r),
+                updated_names.get(r.member.name, r.member.identifier),
+                f"getter for {r.member.name} failed after {setter.name}",
+            )
+            for r in self.udvt.regions
+        )
+        return FunctionDefinition(
+            f"testFused{setter.name[0].upper()}{setter.name[1:]}",
+            visibility=Visibility.Public,
+            parameters=ParameterList(
+                *(r.member.declaration for r in self.udvt.regions),
+                *(
+                    VariableDeclaration(
+                        r.member.safe_typestr, updated_names[r.member.name]
+                    )
+                    for r in regions
+                ),
+            ),
+            body=Block(
+                *to_statements(
+                    *(r.member.get_bounds() for r in self.udvt.regions),
+                    *(
+                        r.member.get_bounds(updated_names[r.member.name])
+                        for r in regions
+                    ),
+                    self.create_udvt(),
+                    update,
+                    *asserts,
+                )
+            ),
+        )
+
+    def fuzz_store_load(self, transient: bool = False) -> FunctionDefinition:
+        """Test that storing each member into an empty slot, one after the other,
+        leaves every member readable from the slot, singly and unpacked. The storage
+        and transient (tstore/tload) tests do the same work, so their gas in
+        `forge snapshot` compares the two locations"""
+        lib = Identifier(self.udvt.lib_name.name)
+        slot = Identifier("slot")
+        load, store = ("tload", "tstore") if transient else ("load", "store")
+
+        def call(name: str, *arguments: Expression) -> FunctionCall:
+            return FunctionCall(
+                expression=MemberAccess(expression=lib, member_name=name),
+                arguments=list(arguments),
+                kind=FunctionCallKind.FunctionCall,
+            )
+
+        slot_declaration = VariableDeclarationStatement(
+            assignments=[VariableDeclaration(ElementaryTypeName("bytes32"), slot)],
+            initial_value=FunctionCall(
+                expression=Identifier("keccak256"),
+                arguments=[Literal(f"{self.udvt.name}.slot", kind=LiteralKind.String)],
+                kind=FunctionCallKind.FunctionCall,
+            ),
+        )
+        loaded_names = [
+            Identifier(f"loaded{r.member.title}") for r in self.udvt.regions
+        ]
+        load_unpacked = VariableDeclarationStatement(
+            assignments=[
+                VariableDeclaration(r.member.safe_typestr, name)
+                for r, name in zip(self.udvt.regions, loaded_names)
+            ],
+            initial_value=call(f"{load}Unpacked{self.udvt.name}", slot),
+        )
+        asserts = chain(
+            (
+                self.assert_eq(
+                    call(f"{load}{r.member.title}", slot),
+                    r.member.identifier,
+                    f"{load}{r.member.title} failed",
+                )
+                for r in self.udvt.regions
+            ),
+            (
+                self.assert_eq(
+                    name,
+                    r.member.identifier,
+                    f"{load}Unpacked{self.udvt.name} failed for {r.member.name}",
+                )
+                for r, name in zip(self.udvt.regions, loaded_names)
+            ),
+        )
+        return FunctionDefinition(
+            f"test{'Transient' if transient else ''}StoreLoad{self.udvt.name}",
+            visibility=Visibility.Public,
+            parameters=ParameterList(
+                *(r.member.declaration for r in self.udvt.regions)
+            ),
+            body=Block(
+                *to_statements(
+                    *(r.member.get_bounds() for r in self.udvt.regions),
+                    slot_declaration,
+                    *(
+                        call(f"{store}{r.member.title}", slot, r.member.identifier)
+                        for r in self.udvt.regions
+                    ),
+                    load_unpacked,
+                    *asserts,
+                )
+            ),
+        )
+
+    def calldata_reader(self, region: Region) -> FunctionDefinition:
+        """Get the external function the calldata test calls on the test contract
+        itself, so that the library reads words that really are in calldata. The
+        first word is at offset 0x44, after the selector and the array's offset and
+        length"""
+        lib = Identifier(self.udvt.lib_name.name)
+        words = Identifier("words")
+        single, values = Identifier("single"), Identifier("values")
+
+        def assign(lhs: Identifier, name: str, argument: Expression) -> Assignment:
+            return Assignment(
+                lhs,
+                AssignmentOperator.Assign,
+                FunctionCall(
+                    expression=MemberAccess(expression=lib, member_name=name),
+                    arguments=[argument],
+                    kind=FunctionCallKind.FunctionCall,
+                ),
+            )
+
+        return FunctionDefinition(
+            f"readCalldata{region.member.title}",
+            visibility=Visibility.External,
+            state_mutability=StateMutability.Pure,
+            parameters=ParameterList(
+                VariableDeclaration(
+                    ArrayTypeName(self.udvt.name),
+                    words,
+                    storage_location=StorageLocation.Calldata,
+                )
+            ),
+            return_parameters=ParameterList(
+                VariableDeclaration(region.member.safe_typestr, single),
+                VariableDeclaration(
+                    ArrayTypeName(region.member.safe_typestr),
+                    values,
+                    storage_location=StorageLocation.Memory,
+                ),
+            ),
+            body=Block(
+                *to_statements(
+                    assign(
+                        single,
+                        f"calldataGet{region.member.title}",
+                        Literal("0x44", kind=LiteralKind.HexNumber),
+                    ),
+                    assign(values, f"calldataGet{region.member.title}Array", words),
+                )
+            ),
+        )
+
+    def fuzz_calldata_get(self) -> FunctionDefinition:
+        """Test that the calldata accessors read the members the words were created
+        with, through calldata_reader for each member"""
+        words = Identifier("words")
+        word_count = 2
+        words_declaration = VariableDeclarationStatement(
+            assignments=[
+                VariableDeclaration(
+                    ArrayTypeName(self.udvt.name),
+                    words,
+                    storage_location=StorageLocation.Memory,
+                )
+            ],
+            initial_value=FunctionCall(
+                expression=NewExpression(ArrayTypeName(self.udvt.name)),
+                arguments=[Literal(str(word_count))],
+                kind=FunctionCallKind.FunctionCall,
+            ),
+        )
+        fill = (
+            Assignment(
+                IndexAccess(words, Literal(str(i))),
+                AssignmentOperator.Assign,
+                self.udvt.var_name,
+            )
+            for i in range(word_count)
+        )
+        reads: list[Statement] = []
+        for r in self.udvt.regions:
+            single = Identifier(f"calldata{r.member.title}")
+            values = Identifier(f"calldata{r.member.title}Array")
+            reads.append(
+                VariableDeclarationStatement(
+                    assignments=[
+                        VariableDeclaration(r.member.safe_typestr, single),
+                        VariableDeclaration(
+                            ArrayTypeName(r.member.safe_typestr),
+                            values,
+                            storage_location=StorageLocation.Memory,
+                        ),
+                    ],
+                    initial_value=FunctionCall(
+                        expression=MemberAccess(
+                            expression=Identifier("this"),
+                            member_name=f"readCalldata{r.member.title}",
+                        ),
+                        arguments=[words],
+                        kind=FunctionCallKind.FunctionCall,
+                    ),
+                )
+            )
+            reads.extend(
+                to_statements(
+                    self.assert_eq(
+                        single,
+                        r.member.identifier,
+                        f"calldataGet{r.member.title} failed",
+                    ),
+                    *(
+                        self.assert_eq(
+                            IndexAccess(values, Literal(str(i))),
+                            r.member.identifier,
+                            f"calldataGet{r.member.title}Array failed",
+                        )
+                        for i in range(word_count)
+                    ),
+                )
+            )
+        return FunctionDefinition(
+            f"testCalldataGet{self.udvt.name}",
+            visibility=Visibility.Public,
+            parameters=ParameterList(
+                *(r.member.declaration for r in self.udvt.regions)
+            ),
+            body=Block(
+                *to_statements(
+                    *(r.member.get_bounds() for r in self.udvt.regions),
+                    self.create_udvt(),
+                    words_declaration,
+                    *fill,
+                ),
+                *reads,
+            ),
+        )
+
+    def fuzz_packed_array(self) -> FunctionDefinition:
+        """Test the dynamic-index accessors of a packed array: push two elements, set
+        the first, then pop the second"""
+        assert self.udvt.array is not None, "Only packed arrays have get/set/push/pop"
+        element = self.udvt.array.element.member
+        # not var_name: for arrays of members it can equal the (lowercase) type name
+        array = Identifier("packedArray")
+        first, second = Identifier("first"), Identifier("second")
+
+        def call(name: str, *arguments: Expression) -> FunctionCall:
+            return FunctionCall(
+                expression=MemberAccess(expression=array, member_name=name),
+                arguments=list(arguments),
+                kind=FunctionCallKind.FunctionCall,
+            )
+
+        def update(name: str, *arguments: Expression) -> Assignment:
+            return Assignment(array, AssignmentOperator.Assign, call(name, *arguments))
+
+        def index(i: int) -> Literal:
+            return Literal(str(i))
+
+        return FunctionDefinition(
+            f"testPackedArray{self.udvt.name}",
+            visibility=Visibility.Public,
+            parameters=ParameterList(
+                VariableDeclaration(element.safe_typestr, first),
+                VariableDeclaration(element.safe_typestr, second),
+            ),
+            body=Block(
+                *to_statements(
+                    element.get_bounds(first),
+                    element.get_bounds(second),
+                    VariableDeclarationStatement(
+                        assignments=[VariableDeclaration(self.udvt.name, array)],
+                        initial_value=None,
+                    ),
+                    update("push", first),
+                    update("push", second),
+                    self.assert_eq(
+                        call("length"), index(2), "length failed after push"
+                    ),
+                    self.assert_eq(call("get", index(0)), first, "get failed for 0"),
+                    self.assert_eq(call("get", index(1)), second, "get failed for 1"),
+                    update("set", index(0), second),
+                    self.assert_eq(call("get", index(0)), second, "set failed for 0"),
+                    self.assert_eq(call("get", index(1)), second, "set changed 1"),
+                    update("pop"),
+                    self.assert_eq(call("length"), index(1), "length failed after pop"),
+                    self.assert_eq(call("get", index(0)), second, "pop changed 0"),
+                )
+            ),
+        )
+
+    def fuzz_get_set_region(self, region: Region) -> FunctionDefinition:
+        updated_member_var_name = Identifier(f"updated{region.member.title}")
+        updated_declaration = VariableDeclaration(
+            region.member.safe_typestr, updated_member_var_name
+        )
+
+        # TODO: fuzz on member.width_bits, bound to 2**member.width_bits, then expand and cast to appropriate type
+        all_region_bounds = chain(
+            (r.member.get_bounds() for r in self.udvt.regions),
+            (region.member.get_bounds(updated_member_var_name),),
+        )
+
+        declaration = self.create_udvt()
         initial_getter_asserts = (
             self.assert_eq(
                 self.call_get(self.udvt.var_name, r),
@@ -163,8 +577,41 @@ class TestGen:
         )
 
     def generate(self) -> SourceUnit:
-        functions = (self.fuzz_get_set_region(r) for r in self.udvt.regions)
-        pragma = PragmaDirective(literals=["solidity", "^0.8.20"])
+        with source_unit_ids():
+            return self._generate()
+
+    def _generate(self) -> SourceUnit:
+        array = self.udvt.array
+        static = self.udvt.static_accessors
+        functions = chain(
+            (self.fuzz_get_set_region(r) for r in self.udvt.regions if static),
+            (self.fuzz_create_unpack(),) if static else (),
+            (self.fuzz_fused_getter(g) for g in self.udvt.fused_getters),
+            (self.fuzz_fused_setter(g) for g in self.udvt.fused_setters),
+            (self.fuzz_store_load(),) if self.udvt.storage_accessors else (),
+            (
+                (self.fuzz_store_load(transient=True),)
+                if self.udvt.transient_accessors
+                else ()
+            ),
+            (
+                (
+                    self.fuzz_calldata_get(),
+                    *(self.calldata_reader(r) for r in self.udvt.regions),
+                )
+                if self.udvt.calldata_accessors
+                else ()
+            ),
+            # elements of a custom type have no fuzz bounds (see Member.get_bounds)
+            (
+                (self.fuzz_packed_array(),)
+                if array is not None
+                and array.capacity > 1
+                and array.element.member.custom_typestr is None
+                else ()
+            ),
+        )
+        pragma = PragmaDirective(literals=["solidity", self.udvt.solidity_version])
 
         test_import = ImportDirective(
             absolute_path=f"forge-std/Test.sol",
@@ -1,11 +1,9 @@
-from itertools import chain
-from tkinter import Variable
-
+from packed_udvts.array import PackedArray
+from packed_udvts.constant_pool import ConstantPool
 from packed_udvts.member import Member
 from packed_udvts.region import Region
-from typing import Iterable, Union, Literal
+from typing import Iterable, Mapping, Sequence, Union, Literal
 from dataclasses import dataclass
-from math import ceil, log2
 from typing import Optional
 
 from sol_ast.ast import (
@@ -18,9 +16,11 @@ from sol_ast.ast import (
     Identifier,
     InlineAssembly,
     License,
+    Literal as LiteralNode,
     ParameterList,
     PragmaDirective,
     SourceUnit,
+    Statement,
     UserDefinedTypeName,
     UserDefinedValueTypeDefinition,
     UsingForDirective,
@@ -30,10 +30,21 @@ from sol_ast.ast import (
     YulBlock,
     YulExpression,
     YulIdentifier,
+    YulStatement,
+    YulVariableDeclaration,
+    yul_and,
     yul_or,
-    yul_shl,
+    yul_sload,
+    yul_tload,
+    source_unit_ids,
 )
-from sol_ast.enums import ContractKind, StateMutability
+from sol_ast.enums import ContractKind, LiteralKind, Mutability, StateMutability
+
+
+def _version(pragma: str) -> tuple[int, ...]:
+    """Get the version a caret pragma such as ^0.8.20 names, for comparison"""
+    return tuple(int(part) for part in pragma.lstrip("^").split("."))
+
 
 # for packed UDVTs, only allow bytes32 and unsigned integers
 # bytesN are left-aligned, so right-aligned uints are preferable
@@ -79,47 +90,142 @@ class UserDefinedValueType:
     name: UserDefinedTypeName
     regions: list[Region]
     value_type: ElementaryTypeName
+    # groups of member names read together, each given a get{A}And{B}... getter
+    fused_getters: list[tuple[str, ...]]
+    # groups of member names written together, each given a set{A}And{B}... setter
+    fused_setters: list[tuple[str, ...]]
+    # whether to generate load{Member}/store{Member}/loadUnpacked{Name} on storage slots
+    storage_accessors: bool
+    # whether to generate the same accessors on transient storage slots, as tload{Member}...
+    transient_accessors: bool
+    # whether to generate calldataGet{Member}(offset) and calldataGet{Member}Array(words)
+    calldata_accessors: bool
+    # for arrays made by packed_array_of: the layout get/set/push/pop/length work on
+    array: Optional[PackedArray]
+    # whether to generate create, unpack and a getter and setter per member
+    static_accessors: bool
 
     def __init__(
         self,
         name: str,
         regions: list[Region],
         value_type: VALID_LITERAL_VALUE_TYPES,
+        fused_getters: Iterable[Sequence[str]] = (),
+        fused_setters: Iterable[Sequence[str]] = (),
+        storage_accessors: bool = False,
+        transient_accessors: bool = False,
+        calldata_accessors: bool = False,
+        array: Optional[PackedArray] = None,
+        static_accessors: bool = True,
     ):
         assert len(regions) > 0, "UDVTs must have at least one region"
         assert value_type in ["uint256", "bytes32"], "UDVTs must be uint256 or bytes32"
         self.name = UserDefinedTypeName(name=name)
         self.regions = regions
         self.value_type = ElementaryTypeName(value_type)
+        self.fused_getters = [tuple(group) for group in fused_getters]
+        self.fused_setters = [tuple(group) for group in fused_setters]
+        self.storage_accessors = storage_accessors
+        self.transient_accessors = transient_accessors
+        self.calldata_accessors = calldata_accessors
+        self.array = array
+        self.static_accessors = static_accessors
+        assert static_accessors or (
+            array is not None
+            and not (self.fused_getters or self.fused_setters)
+            and not (storage_accessors or transient_accessors or calldata_accessors)
+        ), "Only arrays without fused or location accessors can omit static accessors"
+        for group in self.fused_getters + self.fused_setters:
+            assert len(group) > 1, "Fused accessors must cover at least two members"
+            assert len(set(group)) == len(group), f"Duplicate members in {group}"
+            for member_name in group:
+                self.region_named(member_name)
 
     @staticmethod
     def from_members(
         name: str,
         members: list[Member],
         value_type: VALID_LITERAL_VALUE_TYPES,
+        optimize_for: Optional[Mapping[str, float]] = None,
+        fused_getters: Iterable[Sequence[str]] = (),
+        fused_setters: Iterable[Sequence[str]] = (),
+        storage_accessors: bool = False,
+        transient_accessors: bool = False,
+        calldata_accessors: bool = False,
     ):
-        regions = []
+        """Pack members into regions in declaration order. optimize_for maps member
+        names to how often they are read: the most-read member is placed at offset 0
+        (read with a mask only) and the next at the top of the word (a shift only).
+        Regions stay in declaration order, so create and unpack keep their signatures.
+        fused_getters and fused_setters list groups of members to generate combined
+        getters and setters for; storage_accessors adds functions reading and writing
+        members directly in a storage slot, and transient_accessors the same for
+        transient storage (which needs Solidity 0.8.24); calldata_accessors adds
+        functions reading members from packed words in calldata
+        """
+        offsets = UserDefinedValueType.layout(members, optimize_for or {})
+        regions = [
+            Region(member=m, offset_bits=offset) for m, offset in zip(members, offsets)
+        ]
+        return UserDefinedValueType(
+            name=name,
+            regions=regions,
+            value_type=value_type,
+            fused_getters=fused_getters,
+            fused_setters=fused_setters,
+            storage_accessors=storage_accessors,
+            transient_accessors=transient_accessors,
+            calldata_accessors=calldata_accessors,
+        )
+
+    @staticmethod
+    def layout(members: list[Member], weights: Mapping[str, float]) -> list[int]:
+        """Get the offset of each member, packing them contiguously from offset 0 in
+        declaration order after moving the two most-read members to the ends"""
+        names = {m.name for m in members}
+        unknown = [n for n in weights if n not in names]
+        assert not unknown, f"Cannot optimize for unknown members {unknown}"
+        total = sum(m.width_bits for m in members)
+        assert total <= 256, "Too many bits to pack into a single UDVT"
+        # stable sort: equal weights keep declaration order
+        hot = sorted(
+            (m for m in members if weights.get(m.name, 0) > 0),
+            key=lambda m: -weights[m.name],
+        )[:2]
+        bottom = hot[0] if hot else None
+        top = hot[1] if len(hot) > 1 else None
+        hot_names = {m.name for m in hot}
+        offsets: dict[str, int] = {}
         offset = 0
-        for m in members:
-            regions.append(Region(member=m, offset_bits=offset))
-            offset += m.width_bits
-        assert offset <= 256, "Too many bits to pack into a single UDVT"
-        return UserDefinedValueType(name=name, regions=regions, value_type=value_type)
+        for m in [bottom, *(m for m in members if m.name not in hot_names)]:
+            if m is not None:
+                offsets[m.name] = offset
+                offset += m.width_bits
+        if top is not None:
+            offsets[top.name] = 256 - top.width_bits
+        return [offsets[m.name] for m in members]
 
     @staticmethod
     def packed_array_of(
-        u: Union["UserDefinedValueType", Member], max_length: Optional[int] = None
+        u: Union["UserDefinedValueType", Member],
+        max_length: Optional[int] = None,
+        static_accessors: bool = True,
     ) -> "UserDefinedValueType":
+        """Get a UDVT packing a length and as many elements of u's width as fit (at
+        most max_length). Its library has get(i), set(i, value), push, pop and length,
+        which compute an element's offset at runtime; without static_accessors, the
+        getter and setter per index, create and unpack are left out"""
         # get the total number that can be packed into 256 bits
         number_to_pack = max_length or 256 // u.width_bits
         # get the number of remaining bits after packing
         remaining_bits = 256 - (u.width_bits * number_to_pack)
         # ensure there are enough remaining bits to pack the length; calculate the number of bits needed to pack the length
-        length_width_bits = ceil(log2(number_to_pack))
+        # (lengths run from 0 to number_to_pack inclusive)
+        length_width_bits = number_to_pack.bit_length()
         # decrement number_to_pack until length can fit into remaining bits
         while remaining_bits < length_width_bits:
             number_to_pack -= 1
-            length_width_bits = ceil(log2(number_to_pack))
+            length_width_bits = number_to_pack.bit_length()
             remaining_bits = 256 - (u.width_bits * number_to_pack)
 
         # create first member of array UDVT, which is the length
@@ -138,9 +244,26 @@ class UserDefinedValueType:
             ]
         )
         # create the array UDVT
-        return UserDefinedValueType.from_members(
+        layout = UserDefinedValueType.from_members(
             name=f"{u.name}Array", members=members, value_type="uint256"
         )
+        length, first = layout.regions[:2]
+        element = Member(
+            name="element",
+            width_bits=u.width_bits,
+            custom_typestr=first.member.custom_typestr,
+        )
+        return UserDefinedValueType(
+            name=f"{u.name}Array",
+            regions=layout.regions,
+            value_type="uint256",
+            array=PackedArray(
+                length=length,
+                element=Region(member=element, offset_bits=first.offset_bits),
+                capacity=number_to_pack,
+            ),
+            static_accessors=static_accessors,
+        )
 
     @property
     def width_bits(self):
@@ -169,54 +292,108 @@ class UserDefinedValueType:
         )
 
     def create_declaration(self, typesafe: bool = True) -> FunctionDefinition:
-        """Get the creation method for this UDVT"""
-        initial_assigment = YulAssignment(
-            YulIdentifier("self"), value=self.regions[0].assembly_representation
+        """Get the creation method for this UDVT. Every member is validated and packed
+        in one assembly block: each compacted value is computed once, and the
+        violations of all members are OR'd into err before a single revert check"""
+        let_bindings, predicate, values = self.packed_values(self.regions, True)
+        self_ = YulIdentifier.interned("self")
+        packing = [YulAssignment(self_, value=values[0])]
+        packing.extend(
+            YulAssignment(self_, value=yul_or(self_, value)) for value in values[1:]
         )
-        other_regions = []
-        for r in self.regions[1:]:
-            expression_to_shl_then_or: YulExpression = r.assembly_representation
-
-            other_regions.append(
-                YulAssignment(
-                    YulIdentifier("self"),
-                    value=yul_or(
-                        YulIdentifier("self"),
-                        yul_shl(
-                            r.offset_bits_name.to_yul_identifier(),
-                            expression_to_shl_then_or,
-                        ),
-                    ),
-                )
+        err_assignment = (
+            [YulAssignment(YulIdentifier.interned("err"), value=predicate)]
+            if predicate is not None
+            else []
+        )
+        inline_assembly = InlineAssembly(
+            YulBlock(*let_bindings, *err_assignment, *packing)
+        )
+        if err_assignment:
+            body = Block(
+                self.regions[0].err_buf_declaration(),
+                inline_assembly,
+                self.regions[0].assert_buffer(),
             )
+        else:
+            body = Block(inline_assembly)
+        return self._create_definition(f"create{self.name}", typesafe, body)
+
+    def create_unchecked_declaration(self, typesafe: bool = True) -> FunctionDefinition:
+        """Get the creation method for callers that guarantee every value fits: it takes
+        the same parameter types as create but packs the values unvalidated. The checks
+        still run when the library's DEBUG_ASSERTIONS is true"""
+        let_bindings, predicate, _ = self.packed_values(self.regions, True)
+        checks: list[Statement] = []
+        if predicate is not None:
+            checks = [
+                self.regions[0].err_buf_declaration(),
+                InlineAssembly(
+                    YulBlock(
+                        *let_bindings,
+                        YulAssignment(YulIdentifier.interned("err"), value=predicate),
+                    )
+                ),
+                self.regions[0].assert_buffer(),
+            ]
+        _, _, values = self.packed_values(self.regions, False)
+        self_ = YulIdentifier.interned("self")
+        packing = [YulAssignment(self_, value=values[0])]
+        packing.extend(
+            YulAssignment(self_, value=yul_or(self_, value)) for value in values[1:]
+        )
+        body = Block(*Region.debug_only(checks), InlineAssembly(YulBlock(*packing)))
+        return self._create_definition(f"create{self.name}Unchecked", typesafe, body)
 
-        buffer_declaration = self.regions[0].err_buf_declaration()
-        checks = (r.buffer_check() for r in self.regions)
-        assertion = self.regions[0].assert_buffer()
+    def _create_definition(
+        self, name: str, typesafe: bool, body: Block
+    ) -> FunctionDefinition:
         return FunctionDefinition(
-            name=f"create{self.name}",
+            name=name,
             parameters=ParameterList(
                 *(m.get_shadowed_declaration(typesafe=typesafe) for m in self.regions)
             ),
             return_parameters=ParameterList(
-                VariableDeclaration(name=Identifier("self"), type_name=self.name)
+                VariableDeclaration(
+                    name=Identifier.interned("self"), type_name=self.name
+                )
             ),
             state_mutability=StateMutability.Pure,
-            body=Block(
-                buffer_declaration,
-                *checks,
-                assertion,
-                InlineAssembly(YulBlock(initial_assigment, *other_regions)),
-            ),
+            body=body,
         )
 
+    @staticmethod
+    def packed_values(
+        regions: Sequence[Region], validate: bool
+    ) -> tuple[list[YulStatement], Optional[YulExpression], list[YulExpression]]:
+        """Get what writing several members in one assembly block needs: the
+        let-bindings of their compacted values, the predicate that is nonzero if any
+        value does not fit (None without validate, or if every value fits), and each
+        member's bits shifted into place"""
+        let_bindings: list[YulStatement] = []
+        predicate: Optional[YulExpression] = None
+        values: list[YulExpression] = []
+        for r in regions:
+            compacted = r.compact_bits(r.member.shadowed_name.to_yul_identifier())
+            check = r.violation_predicate(r.compacted_reference()) if validate else None
+            if check is not None:
+                declaration = r.compacted_declaration()
+                if declaration is not None:
+                    let_bindings.append(declaration)
+                compacted = r.compacted_reference()
+                predicate = check if predicate is None else yul_or(predicate, check)
+            values.append(r.shift_into_place(r.packed_bits(compacted)))
+        return let_bindings, predicate, values
+
     def unpack_declaration(self, typesafe: bool = True) -> FunctionDefinition:
         """Get the unpack declaration for this UDVT
         TODO: investigate the effect ordering of return values has on bytecode"""
         return FunctionDefinition(
             name=f"unpack{self.name}",
             parameters=ParameterList(
-                VariableDeclaration(name=Identifier("self"), type_name=self.name)
+                VariableDeclaration(
+                    name=Identifier.interned("self"), type_name=self.name
+                )
             ),
             return_parameters=ParameterList(
                 *(m.get_shadowed_declaration(typesafe=typesafe) for m in self.regions)
@@ -229,37 +406,329 @@ class UserDefinedValueType:
             ),
         )
 
-    def library_declaration(self, typesafe: bool = True) -> ContractDefinition:
-        """Get the library declaration for this UDVT"""
-        constants_declarations: Iterable[VariableDeclarationStatement] = chain(
-            (
-                VariableDeclarationStatement(assignments=[v], initial_value=None)
-                for r in self.regions
-                for v in r.get_constant_declarations()
+    def load_unpacked_declaration(
+        self, typesafe: bool = True, transient: bool = False
+    ) -> FunctionDefinition:
+        """Get loadUnpacked{Name}(slot), which reads every member from a storage slot
+        with a single sload; with transient, tloadUnpacked{Name}(slot) reads them from
+        transient storage"""
+        slot = Identifier.interned("slot")
+        word = YulIdentifier.interned("word")
+        load = yul_tload if transient else yul_sload
+        return FunctionDefinition(
+            name=f"{'tload' if transient else 'load'}Unpacked{self.name}",
+            parameters=ParameterList(
+                VariableDeclaration(type_name=ElementaryTypeName("bytes32"), name=slot)
+            ),
+            return_parameters=ParameterList(
+                *(m.get_shadowed_declaration(typesafe=typesafe) for m in self.regions)
+            ),
+            state_mutability=StateMutability.View,
+            body=Block(
+                InlineAssembly(
+                    YulBlock(
+                        YulVariableDeclaration(
+                            word, value=load(slot.to_yul_identifier())
+                        ),
+                        *(r._shift_and_unmask_statement(word) for r in self.regions),
+                    )
+                )
+            ),
+        )
+
+    def region_named(self, member_name: str) -> Region:
+        """Get the region of the member with the given name"""
+        for r in self.regions:
+            if r.member.name == member_name:
+                return r
+        raise ValueError(f"{self.name} has no member named {member_name}")
+
+    def fused_getter(
+        self, member_names: Sequence[str], typesafe: bool = True
+    ) -> FunctionDefinition:
+        """Get the getter returning several members, in the given order, from one
+        assembly block"""
+        regions = [self.region_named(n) for n in member_names]
+        return FunctionDefinition(
+            name="get" + "And".join(r.member.title for r in regions),
+            parameters=ParameterList(
+                VariableDeclaration(
+                    name=Identifier.interned("self"), type_name=self.name
+                )
+            ),
+            return_parameters=ParameterList(
+                *(r.get_shadowed_declaration(typesafe=typesafe) for r in regions)
+            ),
+            state_mutability=StateMutability.Pure,
+            body=Block(
+                InlineAssembly(
+                    YulBlock(*(r._shift_and_unmask_statement() for r in regions))
+                )
+            ),
+        )
+
+    def fused_setter(
+        self, member_names: Sequence[str], typesafe: bool = True
+    ) -> FunctionDefinition:
+        """Get the setter updating several members at once: their bits are cleared
+        with one combined not-mask, and with typesafe every value is validated before
+        a single revert check"""
+        regions = [self.region_named(n) for n in member_names]
+        let_bindings, predicate, values = self.packed_values(regions, typesafe)
+        updated: YulExpression = yul_and(
+            YulIdentifier.interned("self"),
+            Region.combined_not_mask_name(regions).to_yul_identifier(),
+        )
+        for value in values:
+            updated = yul_or(updated, value)
+        err_assignment = (
+            [YulAssignment(YulIdentifier.interned("err"), value=predicate)]
+            if predicate is not None
+            else []
+        )
+        inline_assembly = InlineAssembly(
+            YulBlock(
+                *let_bindings,
+                *err_assignment,
+                YulAssignment(YulIdentifier.interned("updated"), value=updated),
             )
         )
+        if err_assignment:
+            body = Block(
+                regions[0].err_buf_declaration(),
+                inline_assembly,
+                regions[0].assert_buffer(),
+            )
+        else:
+            body = Block(inline_assembly)
+        return FunctionDefinition(
+            name="set" + "And".join(r.member.title for r in regions),
+            parameters=ParameterList(
+                VariableDeclaration(
+                    name=Identifier.interned("self"), type_name=self.name
+                ),
+                *(r.get_shadowed_declaration(typesafe=typesafe) for r in regions),
+            ),
+            return_parameters=ParameterList(
+                VariableDeclaration(
+                    name=Identifier.interned("updated"), type_name=self.name
+                )
+            ),
+            state_mutability=StateMutability.Pure,
+            body=body,
+        )
+
+    def constant_pool(self) -> ConstantPool:
+        """Get the constants of all regions, each distinct name declared once, and the
+        combined not-masks of the fused setters. Without static accessors, only the
+        constants of the array's length and elements are declared"""
+        regions = self.regions if self.static_accessors else []
+        pool = ConstantPool(v for r in regions for v in r.get_constant_declarations())
+        if self.array is not None:
+            pool.extend(self.array.length.get_constant_declarations())
+            pool.extend(self.array.get_constant_declarations())
+        pool.extend(
+            Region.combined_not_mask_declaration([self.region_named(n) for n in group])
+            for group in self.fused_setters
+        )
+        return pool
 
-        return ContractDefinition(
+    def library_declaration(
+        self,
+        typesafe: bool = True,
+        optimize: bool = False,
+        shared_constants: Optional[ConstantPool] = None,
+        unchecked: bool = False,
+        debug_assertions: bool = False,
+    ) -> ContractDefinition:
+        """Get the library declaration for this UDVT; with optimize, constant
+        expressions in the generated code are folded and constants that no generated
+        function uses are left out (see sol_ast.optimize). Constants in
+        shared_constants are declared elsewhere in the file and not repeated. With
+        unchecked, create{Name}Unchecked and a set{Member}Unsafe per member are
+        generated alongside the checked functions; debug_assertions sets the
+        library's DEBUG_ASSERTIONS, which makes them validate their inputs too"""
+        constants_declarations: Iterable[VariableDeclarationStatement] = (
+            statement
+            for statement in self.constant_pool().statements()
+            if shared_constants is None
+            or statement.assignments[0].name.name not in shared_constants
+        )
+
+        # without static accessors, create, unpack and the per-member functions
+        # are left out
+        regions = self.regions if self.static_accessors else []
+        create, unpack = [], []
+        if self.static_accessors:
+            create = [self.create_declaration(typesafe=typesafe)]
+            unpack = [self.unpack_declaration(typesafe=typesafe)]
+        array_declarations: list[Union[ErrorDefinition, FunctionDefinition]] = []
+        if self.array is not None:
+            array_declarations = [
+                self.array.error_definition(),
+                *self.array.declarations(udt_name=self.name, typesafe=typesafe),
+            ]
+        debug_declaration, create_unchecked, unsafe_setters = [], [], []
+        if unchecked and self.static_accessors:
+            debug_declaration = [self.debug_assertions_declaration(debug_assertions)]
+            create_unchecked = [self.create_unchecked_declaration(typesafe=typesafe)]
+            unsafe_setters = [
+                r.unsafe_setter(udt_name=self.name, typesafe=typesafe)
+                for r in self.regions
+            ]
+        library = ContractDefinition(
             *constants_declarations,
+            *debug_declaration,
             ErrorDefinition("UnsafeValue", ParameterList()),
-            self.create_declaration(typesafe=typesafe),
-            self.unpack_declaration(typesafe=typesafe),
-            *(r.getter(udt_name=self.name, typesafe=typesafe) for r in self.regions),
-            *(r.setter(udt_name=self.name, typesafe=typesafe) for r in self.regions),
+            *create,
+            *create_unchecked,
+            *unpack,
+            *(r.getter(udt_name=self.name, typesafe=typesafe) for r in regions),
+            *(self.fused_getter(g, typesafe=typesafe) for g in self.fused_getters),
+            *(r.setter(udt_name=self.name, typesafe=typesafe) for r in regions),
+            *unsafe_setters,
+            *(self.fused_setter(g, typesafe=typesafe) for g in self.fused_setters),
+            *self.storage_accessor_declarations(typesafe=typesafe),
+            *self.calldata_accessor_declarations(typesafe=typesafe),
+            *array_declarations,
             name=self.lib_name.name,
             kind=ContractKind.Library,
         )
+        if optimize:
+            # imported on demand to keep the optimizer out of the default import path
+            from sol_ast.optimize import fold_constants, prune_constants
+
+            fold_constants(library)
+            prune_constants(library)
+        return library
+
+    def storage_accessor_declarations(
+        self, typesafe: bool = True
+    ) -> list[FunctionDefinition]:
+        """Get the storage and transient-storage slot accessors this UDVT has"""
+        declarations: list[FunctionDefinition] = []
+        for transient, enabled in (
+            (False, self.storage_accessors),
+            (True, self.transient_accessors),
+        ):
+            if not enabled:
+                continue
+            declarations.append(
+                self.load_unpacked_declaration(typesafe=typesafe, transient=transient)
+            )
+            declarations.extend(
+                r.loader(typesafe=typesafe, transient=transient) for r in self.regions
+            )
+            declarations.extend(
+                r.storer(typesafe=typesafe, transient=transient) for r in self.regions
+            )
+        return declarations
 
-    def render_file(self, typesafe: bool = True) -> SourceUnit:
-        """Render the file for this UDVT"""
-        return SourceUnit(
-            PragmaDirective(["solidity", "^0.8.20"]),
-            self.type_declaration,
-            self.using_declaration,
-            self.library_declaration(typesafe=typesafe),
-            license=License("MIT"),
+    def calldata_accessor_declarations(
+        self, typesafe: bool = True
+    ) -> list[FunctionDefinition]:
+        """Get the calldata accessors, if this UDVT has them"""
+        if not self.calldata_accessors:
+            return []
+        return [
+            *(r.calldata_getter(typesafe=typesafe) for r in self.regions),
+            *(
+                r.calldata_array_getter(udt_name=self.name, typesafe=typesafe)
+                for r in self.regions
+            ),
+        ]
+
+    @property
+    def solidity_version(self) -> str:
+        """Get the version pragma the generated library needs: tload and tstore are
+        only available from 0.8.24"""
+        return "^0.8.24" if self.transient_accessors else "^0.8.20"
+
+    @staticmethod
+    def debug_assertions_declaration(enabled: bool) -> VariableDeclarationStatement:
+        """Get the DEBUG_ASSERTIONS constant the unchecked functions test before
+        validating their inputs"""
+        return VariableDeclarationStatement(
+            assignments=[
+                VariableDeclaration(
+                    mutability=Mutability.Constant,
+                    type_name=ElementaryTypeName("bool"),
+                    name=Identifier.interned("DEBUG_ASSERTIONS"),
+                    value=LiteralNode("true" if enabled else "false", LiteralKind.Bool),
+                )
+            ],
+            initial_value=None,
         )
 
+    def render_file(
+        self,
+        typesafe: bool = True,
+        optimize: bool = False,
+        unchecked: bool = False,
+        debug_assertions: bool = False,
+    ) -> SourceUnit:
+        """Render the file for this UDVT; node ids are numbered from 1 within the file"""
+        with source_unit_ids():
+            return SourceUnit(
+                PragmaDirective(["solidity", self.solidity_version]),
+                self.type_declaration,
+                self.using_declaration,
+                self.library_declaration(
+                    typesafe=typesafe,
+                    optimize=optimize,
+                    unchecked=unchecked,
+                    debug_assertions=debug_assertions,
+                ),
+                license=License("MIT"),
+            )
+
+    @staticmethod
+    def render_combined_file(
+        udvts: Iterable["UserDefinedValueType"],
+        typesafe: bool = True,
+        optimize: bool = False,
+        unchecked: bool = False,
+        debug_assertions: bool = False,
+    ) -> SourceUnit:
+        """Render several UDVTs into one file. The width masks they have in common are
+        declared once as file-level constants instead of inside every library"""
+        udvts = list(udvts)
+        shared_constants = ConstantPool(
+            v
+            for u in udvts
+            for r in u.regions
+            for v in r.get_shared_constant_declarations()
+        )
+        with source_unit_ids():
+            libraries = [
+                u.library_declaration(
+                    typesafe=typesafe,
+                    optimize=optimize,
+                    shared_constants=shared_constants,
+                    unchecked=unchecked,
+                    debug_assertions=debug_assertions,
+                )
+                for u in udvts
+            ]
+            unit = SourceUnit(
+                PragmaDirective(
+                    ["solidity", max((u.solidity_version for u in udvts), key=_version)]
+                ),
+                *shared_constants.statements(),
+                *(
+                    declaration
+                    for u in udvts
+                    for declaration in (u.type_declaration, u.using_declaration)
+                ),
+                *libraries,
+                license=License("MIT"),
+            )
+            if optimize:
+                from sol_ast.optimize import prune_constants
+
+                prune_constants(unit)
+            return unit
+
     @property
     def var_name(self) -> Identifier:
         """Get the name of the variable for this UDVT"""
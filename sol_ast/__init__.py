@@ -0,0 +1,15 @@
+"""Solidity/Yul AST. Submodules are loaded on first attribute access (`sol_ast.optimize`),
+so importing the package alone stays cheap."""
+from importlib import import_module
+
+_SUBMODULES = ("ast", "enums", "hashing", "optimize", "utils", "visitor")
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_SUBMODULES])
@@ -1,14 +1,19 @@
-from itertools import chain
+# annotations are only read for their names (see annotation_slots), so keep them unevaluated
+from __future__ import annotations
+
+from itertools import chain, count
 from typing import (
     Optional,
     Union,
     TypeAlias,
     Literal as StringLiteral,
     Callable,
+    Iterator,
     Sequence,
+    TextIO,
 )
-from random import randint
 from abc import ABC, abstractmethod
+from weakref import WeakValueDictionary
 
 from sol_ast.enums import (
     Visibility,
@@ -27,7 +32,7 @@ from sol_ast.enums import (
     ModifierInvocationKind,
     ContractKind,
 )
-from sol_ast.utils import line_join, wrap_block, NodeDictChecker, StatementChecker
+from sol_ast.utils import iter_block, NodeDictChecker, StatementChecker
 from functools import partial
 
 
@@ -164,7 +169,88 @@ class AstId(int):
     pass
 
 
+class IdAllocator(ABC):
+    """Source of AstIds for new nodes. Entering an allocator as a context manager makes it the
+    active one until the block exits, e.g. to number one SourceUnit from 1.
+    """
+
+    # lazy allocators leave new nodes without an id until it is first read
+    lazy: bool = False
+    # leaves shared through AstNode.interned() while this allocator is active, keyed by class
+    # and constructor arguments; weak, so a leaf is only shared while some tree still uses it
+    interned: "WeakValueDictionary[tuple, AstNode]"
+
+    def __init__(self):
+        self.interned = WeakValueDictionary()
+
+    @abstractmethod
+    def allocate(self) -> AstId:
+        raise NotImplementedError()
+
+    def for_source_unit(self) -> "IdAllocator":
+        """An allocator of the same kind for numbering a single SourceUnit"""
+        return type(self)()
+
+    def __enter__(self) -> "IdAllocator":
+        _allocators.append(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _allocators.remove(self)
+
+
+class SequentialIdAllocator(IdAllocator):
+    """Monotonic ids starting at `start`; the same construction order always yields the same ids"""
+
+    def __init__(self, start: int = 1):
+        super().__init__()
+        self._ids = count(start)
+
+    def allocate(self) -> AstId:
+        return AstId(next(self._ids))
+
+
+class LazyIdAllocator(SequentialIdAllocator):
+    """Sequential ids, assigned only when a node's id is first read"""
+
+    lazy = True
+
+
+class RandomIdAllocator(IdAllocator):
+    """Random 64-bit ids; the original scheme, which may collide and differs between runs"""
+
+    def __init__(self):
+        super().__init__()
+        # imported on first use so that importing sol_ast does not load random
+        from random import randint
+
+        self._randint = randint
+
+    def allocate(self) -> AstId:
+        return AstId(self._randint(0, 2**64))
+
+    def for_source_unit(self) -> IdAllocator:
+        return self
+
+
+# stack of active allocators; the bottom one is the process-wide default
+_allocators: list[IdAllocator] = [SequentialIdAllocator()]
+
+
+def new_ast_id() -> AstId:
+    """Allocate an id from the active allocator"""
+    return _allocators[-1].allocate()
+
+
+def source_unit_ids() -> IdAllocator:
+    """A fresh allocator, of the active allocator's kind, for building one SourceUnit:
+    `with source_unit_ids(): ...`
+    """
+    return _allocators[-1].for_source_unit()
+
+
 class SourceLocation:
+    __slots__ = ("start", "length", "index")
     start: Optional[int]
     length: Optional[int]
     index: Optional[int]
@@ -177,15 +263,88 @@ class SourceLocation:
         self.index = index
 
 
+class NodeIndex:
+    """Opt-in lookup of nodes by id. Nodes constructed while an index is active (see
+    `with NodeIndex() as index:`) are registered in it; the index only holds weak references,
+    so it never keeps a node alive on its own. Registering a node reads its id, so nodes built
+    under a LazyIdAllocator get their ids assigned immediately.
+    """
+
+    nodes: "WeakValueDictionary[int, AstNode]"
+
+    def __init__(self):
+        self.nodes = WeakValueDictionary()
+
+    def __enter__(self) -> "NodeIndex":
+        _active_indexes.append(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _active_indexes.remove(self)
+
+    def add(self, node: "AstNode") -> None:
+        self.nodes[node.id] = node
+
+    def get(self, id: int) -> Optional["AstNode"]:
+        return self.nodes.get(id)
+
+    def __getitem__(self, id: int) -> "AstNode":
+        return self.nodes[id]
+
+    def __contains__(self, id: int) -> bool:
+        return id in self.nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+# indexes currently collecting newly constructed nodes; empty unless a NodeIndex is in use
+_active_indexes: list[NodeIndex] = []
+
+_interning_enabled = True
+
+
+def set_interning(enabled: bool) -> bool:
+    """Turn leaf interning on or off; returns the previous setting"""
+    global _interning_enabled
+    previous, _interning_enabled = _interning_enabled, enabled
+    return previous
+
+
 class AstNode(metaclass=NodeDictChecker):
-    id: AstId
+    _id: Optional[AstId]
     src: Optional[SourceLocation]
     parent: Optional["AstNode"]
-    d: dict[int, "AstNode"] = {}
+    # Merkle digest cached by sol_ast.hashing; unset until first computed
+    _structural_hash: Optional[bytes]
 
     def __init__(self):
-        self.id = AstId(randint(0, 2**64))
-        self.d[self.id] = self
+        allocator = _allocators[-1]
+        self._id = None if allocator.lazy else allocator.allocate()
+        for index in _active_indexes:
+            index.add(self)
+
+    @property
+    def id(self) -> AstId:
+        if self._id is None:
+            self._id = new_ast_id()
+        return self._id
+
+    @classmethod
+    def interned(cls, *args):
+        """A shared instance of this node for the given constructor arguments. Only use it for
+        leaves that are never mutated (identifiers and literals): every use of a shared node
+        has the same id and parent. Sharing is scoped to the active IdAllocator, so a unit built
+        under its own allocator never reuses leaves (and ids) from another unit.
+        """
+        if not _interning_enabled:
+            return cls(*args)
+        table = _allocators[-1].interned
+        key = (cls, *args)
+        node = table.get(key)
+        if node is None:
+            node = table[key] = cls(*args)
+        return node
 
     def accept(self, node: "AstNode") -> None:
         self.parent = node
@@ -194,6 +353,18 @@ class AstNode(metaclass=NodeDictChecker):
     def fmt(self) -> str:
         raise NotImplementedError()
 
+    def iter_chunks(self) -> Iterator[str]:
+        """Yield the rendered text in fragments. Nodes with children override this to stream
+        them without building intermediate strings, and implement fmt() by joining it
+        """
+        yield self.fmt()
+
+    def write(self, sink: Union[TextIO, list[str]]) -> None:
+        """Stream the rendered text into a file object or a list buffer"""
+        emit = sink.append if isinstance(sink, list) else sink.write
+        for chunk in self.iter_chunks():
+            emit(chunk)
+
     def __str__(self) -> str:
         return self.fmt()
 
@@ -204,6 +375,7 @@ class AstNode(metaclass=NodeDictChecker):
 class TypeDescriptions:
     """TODO: idk what that is"""
 
+    __slots__ = ("type_identifier", "type_string")
     type_identifier: Optional[str]
     type_string: Optional[str]
 
@@ -242,7 +414,7 @@ class Identifier(AstNode):
         self.argument_types = argument_types
 
     def to_yul_identifier(self) -> "YulIdentifier":
-        return YulIdentifier(self.name)
+        return YulIdentifier.interned(self.name)
 
     def to_identifier_path(self) -> "IdentifierPath":
         return IdentifierPath(self.name)
@@ -267,6 +439,7 @@ class SymbolAlias(AstNode):
         local: Optional[str] = None,
         name_location: Optional[SourceLocation] = None,
     ):
+        super().__init__()
         self.foreign = foreign
         self.local = local
         self.name_location = name_location
@@ -312,8 +485,8 @@ class ImportDirective(AstNode):
         self.absolute_path = absolute_path
         self.file = file
         self.name_location = name_location
-        self.scope = scope or AstId(randint(0, 2**64))
-        self.source_unit = source_unit or AstId(randint(0, 2**64))
+        self.scope = scope or new_ast_id()
+        self.source_unit = source_unit or new_ast_id()
         self.symbol_aliases = symbol_aliases
         self.unit_alias = unit_alias
 
@@ -339,10 +512,11 @@ class IdentifierPath(AstNode):
         return self.name
 
 
-class FunctionIdentifierPath:
+class FunctionIdentifierPath(AstNode):
     function: IdentifierPath
 
     def __init__(self, function: IdentifierPath):
+        super().__init__()
         self.function = function
 
     def fmt(self) -> str:
@@ -474,6 +648,7 @@ class FunctionCallOption(AstNode):
     value: "Expression"
 
     def __init__(self, name: str, value: "Expression"):
+        super().__init__()
         self.name = name
         self.value = value
 
@@ -489,6 +664,8 @@ class FunctionCall(ExprNode):
     options: list[FunctionCallOption]
     type_descriptions: Optional[TypeDescriptions]
     try_call: bool
+    # visited in source order: callee first
+    _fields = ("expression", "options", "names", "arguments")
 
     def __init__(
         self,
@@ -553,7 +730,10 @@ class IndexAccess(ExprNode):
         self.index_expression = index_expression
 
     def fmt(self) -> str:
-        return f"({self.base_expression.fmt()})[{self.index_expression.fmt()}]"
+        base = self.base_expression.fmt()
+        if not isinstance(self.base_expression, (Identifier, IndexAccess, MemberAccess)):
+            base = f"({base})"
+        return f"{base}[{self.index_expression.fmt()}]"
 
 
 class IndexRangeAccess(ExprNode):
@@ -649,6 +829,13 @@ class Literal(ExprNode):
 class NewExpression(ExprNode):
     type_name: "TypeName"
 
+    def __init__(self, type_name: "TypeName"):
+        super().__init__()
+        self.type_name = type_name
+
+    def fmt(self) -> str:
+        return f"new {self.type_name.fmt()}"
+
 
 class TupleExpression(ExprNode):
     components: list["Expression"]
@@ -784,7 +971,7 @@ class VariableDeclaration(AstNode):
         return " ".join(c for c in components if c)
 
 
-class ParameterList:
+class ParameterList(AstNode):
     parameters: list[VariableDeclaration]
 
     def __init__(self, *parameters: VariableDeclaration):
@@ -868,10 +1055,19 @@ class License(Literal):
 
 
 class SourceUnit(AstNode):
+    """A whole Solidity file. Rendering never modifies the unit. A frozen unit (see freeze())
+    memoizes its rendered text; replacing its nodes or license, or calling append(), drops the
+    cached text. Children edited in place are not tracked: call invalidate() after doing so.
+    """
+
     absolute_path: Optional[str]
     exported_symbols: dict[str, list[AstId]]
-    license: Optional[License]
-    nodes: list["SourceUnitPart"]
+    frozen: bool
+    _license: Optional[License]
+    _nodes: Sequence["SourceUnitPart"]
+    _rendered: Optional[str]
+    # child fields for sol_ast.visitor: the public properties, not their backing slots
+    _fields = ("license", "nodes")
 
     def __init__(
         self,
@@ -883,13 +1079,62 @@ class SourceUnit(AstNode):
         super().__init__()
         self.absolute_path = absolute_path
         self.exported_symbols = exported_symbols
-        self.license = license
-        self.nodes = list(nodes)
+        self.frozen = False
+        self._rendered = None
+        self._license = license
+        self._nodes = list(nodes)
+
+    @property
+    def license(self) -> Optional[License]:
+        return self._license
+
+    @license.setter
+    def license(self, license: Optional[License]) -> None:
+        self._license = license
+        self.invalidate()
+
+    @property
+    def nodes(self) -> Sequence["SourceUnitPart"]:
+        """The top-level nodes; a tuple once the unit is frozen"""
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes: Sequence["SourceUnitPart"]) -> None:
+        self._nodes = tuple(nodes) if self.frozen else list(nodes)
+        self.invalidate()
+
+    def append(self, *nodes: "SourceUnitPart") -> None:
+        self.nodes = [*self._nodes, *nodes]
+
+    def freeze(self) -> "SourceUnit":
+        """Make the node list immutable and memoize rendering from now on"""
+        self.frozen = True
+        self._nodes = tuple(self._nodes)
+        return self
+
+    def invalidate(self) -> None:
+        """Drop the memoized rendering"""
+        self._rendered = None
 
     def fmt(self) -> str:
-        if self.license:
-            self.nodes = [self.license] + self.nodes
-        return "\n".join(node.fmt() for node in self.nodes)
+        if not self.frozen:
+            return "".join(self._render_chunks())
+        if self._rendered is None:
+            self._rendered = "".join(self._render_chunks())
+        return self._rendered
+
+    def iter_chunks(self) -> Iterator[str]:
+        if self.frozen:
+            yield self.fmt()
+        else:
+            yield from self._render_chunks()
+
+    def _render_chunks(self) -> Iterator[str]:
+        nodes = chain([self._license], self._nodes) if self._license else self._nodes
+        for i, node in enumerate(nodes):
+            if i:
+                yield "\n"
+            yield from node.iter_chunks()
 
 
 class EnumValue(AstNode):
@@ -929,6 +1174,7 @@ class ErrorDefinition(Statement):
     parameters: ParameterList
 
     def __init__(self, name: str, parameters: ParameterList):
+        super().__init__()
         self.name = name
         self.parameters = parameters
 
@@ -952,9 +1198,10 @@ class Block(Statement):
         self.statements = list(statements)
 
     def fmt(self) -> str:
-        return "\n".join(
-            chain("{", (statement.fmt() for statement in self.statements), "}")
-        )
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
+        return iter_block(self.statements, semicolon=False)
 
 
 class Break(LineStatement):
@@ -1059,6 +1306,9 @@ class VariableDeclarationStatement(LineStatement):
 
     def fmt(self) -> str:
         lhs = ", ".join(a.fmt() for a in self.assignments)
+        if len(self.assignments) > 1:
+            # tuple destructuring
+            lhs = f"({lhs})"
         rhs = ""
         if self.initial_value is not None:
             rhs = f" = ({self.initial_value.fmt()})"
@@ -1076,31 +1326,41 @@ class IfStatement(Statement):
         true_body: BlockType,
         false_body: Optional[BlockType] = None,
     ):
+        super().__init__()
         self.condition = condition
         self.true_body = true_body
         self.false_body = false_body
 
     def fmt(self) -> str:
-        if self.false_body is None:
-            return f"if ({self.condition.fmt()})\n{self.true_body.fmt()}"
-        else:
-            return f"if ({self.condition.fmt()})\n{self.true_body.fmt()}\nelse\n{self.false_body.fmt()}"
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
+        yield f"if ({self.condition.fmt()})\n"
+        yield from self.true_body.iter_chunks()
+        if self.false_body is not None:
+            yield "\nelse\n"
+            yield from self.false_body.iter_chunks()
 
 
 class YulBlock(Statement):
     statements: Sequence["YulStatement"]
 
     def __init__(self, *statements: "YulStatement"):
+        super().__init__()
         self.statements = statements
 
     def fmt(self) -> str:
-        return line_join(wrap_block(self.statements, semicolon=False))
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
+        return iter_block(self.statements, semicolon=False)
 
 
 class YulIdentifier(AstNode):
     name: str
 
     def __init__(self, name: str):
+        super().__init__()
         self.name = name
 
     def fmt(self) -> str:
@@ -1194,7 +1454,15 @@ class YulForLoop(YulStatement):
         self.pre = pre
 
     def fmt(self) -> str:
-        return f"for {{{self.pre.fmt()}}} {self.condition.fmt()} {{{self.post.fmt()}}} {{{self.body.fmt()}}}"
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
+        yield "for "
+        yield from self.pre.iter_chunks()
+        yield f" {self.condition.fmt()} "
+        yield from self.post.iter_chunks()
+        yield " "
+        yield from self.body.iter_chunks()
 
 
 # class YulTypedName(AstNode):
@@ -1243,7 +1511,11 @@ class YulIf(YulStatement):
         self.body = body
 
     def fmt(self) -> str:
-        return f"if {self.condition.fmt()} {self.body.fmt()}"
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
+        yield f"if {self.condition.fmt()} "
+        yield from self.body.iter_chunks()
 
 
 class YulCase(AstNode):
@@ -1272,8 +1544,10 @@ class YulVariableDeclaration(YulAssignment):
 class YulFunctionCall(AstNode):
     arguments: list["YulExpression"]
     function_name: YulIdentifier
+    _fields = ("function_name", "arguments")
 
     def __init__(self, name: YulIdentifier, arguments: list["YulExpression"] = []):
+        super().__init__()
         self.function_name = name
         self.arguments = arguments
 
@@ -1307,39 +1581,41 @@ def yul_binary(
     return YulFunctionCall(arguments=[arg1, arg2], name=name)
 
 
-yul_add = partial(yul_binary, YulIdentifier("add"))
-yul_sub = partial(yul_binary, YulIdentifier("sub"))
-yul_mul = partial(yul_binary, YulIdentifier("mul"))
-yul_div = partial(yul_binary, YulIdentifier("div"))
-yul_sdiv = partial(yul_binary, YulIdentifier("sdiv"))
-yul_mod = partial(yul_binary, YulIdentifier("mod"))
-yul_smod = partial(yul_binary, YulIdentifier("smod"))
-yul_exp = partial(yul_binary, YulIdentifier("exp"))
-yul_not = partial(yul_unary, YulIdentifier("not"))
-yul_iszero = partial(yul_unary, YulIdentifier("iszero"))
-yul_eq = partial(yul_binary, YulIdentifier("eq"))
-yul_lt = partial(yul_binary, YulIdentifier("lt"))
-yul_gt = partial(yul_binary, YulIdentifier("gt"))
-yul_slt = partial(yul_binary, YulIdentifier("slt"))
-yul_sgt = partial(yul_binary, YulIdentifier("sgt"))
-yul_and = partial(yul_binary, YulIdentifier("and"))
-yul_or = partial(yul_binary, YulIdentifier("or"))
-yul_xor = partial(yul_binary, YulIdentifier("xor"))
-yul_shl = partial(yul_binary, YulIdentifier("shl"))
-yul_shr = partial(yul_binary, YulIdentifier("shr"))
-yul_sar = partial(yul_binary, YulIdentifier("sar"))
-yul_pop = partial(yul_unary, YulIdentifier("pop"))
-yul_mload = partial(yul_unary, YulIdentifier("mload"))
-yul_mstore = partial(yul_binary, YulIdentifier("mstore"))
-yul_mstore8 = partial(yul_binary, YulIdentifier("mstore8"))
-yul_sload = partial(yul_unary, YulIdentifier("sload"))
-yul_sstore = partial(yul_binary, YulIdentifier("sstore"))
-yul_address = partial(yul_nullary, YulIdentifier("address"))
-yul_balance = partial(yul_unary, YulIdentifier("balance"))
-yul_callvalue = partial(yul_nullary, YulIdentifier("callvalue"))
-yul_calldataload = partial(yul_unary, YulIdentifier("calldataload"))
-yul_calldatasize = partial(yul_nullary, YulIdentifier("calldatasize"))
-yul_signextend = partial(yul_binary, YulIdentifier("signextend"))
+yul_add = partial(yul_binary, YulIdentifier.interned("add"))
+yul_sub = partial(yul_binary, YulIdentifier.interned("sub"))
+yul_mul = partial(yul_binary, YulIdentifier.interned("mul"))
+yul_div = partial(yul_binary, YulIdentifier.interned("div"))
+yul_sdiv = partial(yul_binary, YulIdentifier.interned("sdiv"))
+yul_mod = partial(yul_binary, YulIdentifier.interned("mod"))
+yul_smod = partial(yul_binary, YulIdentifier.interned("smod"))
+yul_exp = partial(yul_binary, YulIdentifier.interned("exp"))
+yul_not = partial(yul_unary, YulIdentifier.interned("not"))
+yul_iszero = partial(yul_unary, YulIdentifier.interned("iszero"))
+yul_eq = partial(yul_binary, YulIdentifier.interned("eq"))
+yul_lt = partial(yul_binary, YulIdentifier.interned("lt"))
+yul_gt = partial(yul_binary, YulIdentifier.interned("gt"))
+yul_slt = partial(yul_binary, YulIdentifier.interned("slt"))
+yul_sgt = partial(yul_binary, YulIdentifier.interned("sgt"))
+yul_and = partial(yul_binary, YulIdentifier.interned("and"))
+yul_or = partial(yul_binary, YulIdentifier.interned("or"))
+yul_xor = partial(yul_binary, YulIdentifier.interned("xor"))
+yul_shl = partial(yul_binary, YulIdentifier.interned("shl"))
+yul_shr = partial(yul_binary, YulIdentifier.interned("shr"))
+yul_sar = partial(yul_binary, YulIdentifier.interned("sar"))
+yul_pop = partial(yul_unary, YulIdentifier.interned("pop"))
+yul_mload = partial(yul_unary, YulIdentifier.interned("mload"))
+yul_mstore = partial(yul_binary, YulIdentifier.interned("mstore"))
+yul_mstore8 = partial(yul_binary, YulIdentifier.interned("mstore8"))
+yul_sload = partial(yul_unary, YulIdentifier.interned("sload"))
+yul_sstore = partial(yul_binary, YulIdentifier.interned("sstore"))
+yul_tload = partial(yul_unary, YulIdentifier.interned("tload"))
+yul_tstore = partial(yul_binary, YulIdentifier.interned("tstore"))
+yul_address = partial(yul_nullary, YulIdentifier.interned("address"))
+yul_balance = partial(yul_unary, YulIdentifier.interned("balance"))
+yul_callvalue = partial(yul_nullary, YulIdentifier.interned("callvalue"))
+yul_calldataload = partial(yul_unary, YulIdentifier.interned("calldataload"))
+yul_calldatasize = partial(yul_nullary, YulIdentifier.interned("calldatasize"))
+yul_signextend = partial(yul_binary, YulIdentifier.interned("signextend"))
 
 
 class ExternalInlineAssemblyReference(AstNode):
@@ -1368,10 +1644,14 @@ class InlineAssembly(Statement):
         self.flags = flags
 
     def fmt(self) -> str:
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
         flag_str = (
             f'("memory-safe") ' if InlineAssemblyFlag.MemorySafe in self.flags else ""
         )
-        return f"assembly {flag_str}{self.ast.fmt()}"
+        yield f"assembly {flag_str}"
+        yield from self.ast.iter_chunks()
 
 
 class PlaceholderStatement(LineStatement):
@@ -1388,6 +1668,7 @@ class RevertStatement(LineStatement):
     error_call: FunctionCall
 
     def __init__(self, error_call: FunctionCall):
+        super().__init__()
         self.error_call = error_call
 
     def fmt(self) -> str:
@@ -1406,8 +1687,9 @@ class TryStatement(Statement):
 
 
 class UncheckedBlock(Block):
-    def fmt(self) -> str:
-        return f"unchecked {super().fmt()}"
+    def iter_chunks(self) -> Iterator[str]:
+        yield "unchecked "
+        yield from super().iter_chunks()
 
 
 class WhileStatement(Statement):
@@ -1429,6 +1711,7 @@ class ModifierInvocation(AstNode):
     modifier_name: IdentifierOrIdentifierPath
 
     def __init__(self, name: IdentifierOrIdentifierPath, arguments: list[Expression]):
+        super().__init__()
         self.modifier_name = name
         self.arguments = arguments
         self.kind = (
@@ -1489,6 +1772,7 @@ class FunctionDefinition(AstNode):
         is_payable: bool = False,
         kind: Optional[FunctionKind] = None,
     ):
+        super().__init__()
         self.name = name
         self.parameters = parameters or ParameterList()
         self.return_parameters = return_parameters or ParameterList()
@@ -1501,7 +1785,7 @@ class FunctionDefinition(AstNode):
         self.modifiers = modifiers
         self.overrides = overrides
         self.visibility = visibility
-        self.scope = scope or AstId(randint(0, 2**32))
+        self.scope = scope or new_ast_id()
         self._kind = kind
         self._state_mutability = state_mutability
         self.is_virtual = is_virtual
@@ -1528,6 +1812,9 @@ class FunctionDefinition(AstNode):
         return StateMutability.Nonpayable
 
     def fmt(self) -> str:
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
         if self.kind == FunctionKind.Constructor:
             raise NotImplemented()
         elif self.kind == FunctionKind.Fallback:
@@ -1543,11 +1830,11 @@ class FunctionDefinition(AstNode):
             name += f"override {self.overrides.fmt()}"
         if self.return_parameters.parameters:
             name += f" returns {self.return_parameters.fmt()}"
+        yield f"{name} "
         if self.body:
-            body = self.body.fmt()
+            yield from self.body.iter_chunks()
         else:
-            body = ";"
-        return f"{name} {body}"
+            yield ";"
 
 
 class StructDefinition(AstNode):
@@ -1558,6 +1845,33 @@ class StructDefinition(AstNode):
     scope: AstId
     visibility: Visibility
 
+    def __init__(
+        self,
+        name: str,
+        members: list[VariableDeclaration],
+        name_location: Optional[SourceLocation] = None,
+        canonical_name: Optional[str] = None,
+        scope: Optional[AstId] = None,
+        visibility: Visibility = Visibility.Public,
+    ):
+        super().__init__()
+        self.name = name
+        self.members = members
+        self.name_location = name_location
+        self.canonical_name = canonical_name or name
+        self.scope = scope or new_ast_id()
+        self.visibility = visibility
+
+    def user_defined_type_name(self):
+        return UserDefinedTypeName(self.name, referenced_declaration=self.id)
+
+    def fmt(self) -> str:
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
+        yield f"struct {self.name} "
+        yield from iter_block(self.members, semicolon=True)
+
 
 class UserDefinedValueTypeDefinition(Statement):
     name: str
@@ -1640,21 +1954,27 @@ class ContractDefinition(AstNode):
         self.documentation = documentation
         self.fully_implemented = fully_implemented
         self.nodes = list(nodes)
-        self.scope = scope or AstId(randint(0, 2**64))
+        self.scope = scope or new_ast_id()
         self.used_errors = used_errors
         self.used_events = used_events
         self.internal_function_ids = internal_function_ids or {}
 
     def fmt(self) -> str:
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
         prefix = "abstract " if self.is_abstract else ""
-        body = "{\n" + "\n".join(node.fmt() for node in self.nodes) + "\n}"
         inheritance = (
             f'is {", ".join(base.fmt() for base in self.base_contracts)}'
             if self.base_contracts
             else ""
         )
-
-        return f"{prefix}{self.kind.value} {self.name} {inheritance} {body}"
+        yield f"{prefix}{self.kind.value} {self.name} {inheritance} {{\n"
+        for i, node in enumerate(self.nodes):
+            if i:
+                yield "\n"
+            yield from node.iter_chunks()
+        yield "\n}"
 
 
 class ModifierDefinition(AstNode):
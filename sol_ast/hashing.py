@@ -0,0 +1,154 @@
+"""Content-based identity for sol_ast subtrees.
+
+structural_hash() is a Merkle hash: a node's digest covers its class, its attributes and the
+digests of its children, so two subtrees that would render the same way (and have the same
+attributes) hash the same, whatever their ids. Digests are computed bottom-up without
+recursion and cached on each node; NodeTransformer drops the cache of the nodes it rewrites.
+Nodes edited by hand need clear_structural_hash().
+"""
+
+from enum import Enum
+from hashlib import blake2b
+
+from sol_ast.ast import AstNode
+from sol_ast.visitor import children, is_node, walk
+
+DIGEST_SIZE = 16
+# slots that identify or locate a node, refer to other nodes by id, or cache derived data,
+# rather than describe it
+_NON_STRUCTURAL_SLOTS = frozenset(
+    {
+        "_id",
+        "_structural_hash",
+        "_rendered",
+        "frozen",
+        "src",
+        "parent",
+        "__weakref__",
+        "scope",
+        "source_unit",
+        "referenced_declaration",
+        "overloaded_declarations",
+        "function_return_parameters",
+        "base_functions",
+        "base_modifiers",
+        "contract_dependencies",
+        "used_errors",
+        "used_events",
+        "internal_function_ids",
+        "exported_symbols",
+        "declaration",
+        "value_size",
+    }
+)
+_hash_fields_cache: dict[type, tuple[str, ...]] = {}
+
+
+def hash_fields(cls: type[AstNode]) -> tuple[str, ...]:
+    """The attributes that make up a node's structure: all its slots except ids and id
+    references, locations, parents and caches. A class that declares `_fields` (see
+    sol_ast.visitor.node_fields) is described by those plus its other public slots
+    """
+    fields = _hash_fields_cache.get(cls)
+    if fields is None:
+        declared = getattr(cls, "_fields", None)
+        slots = [
+            name
+            for klass in reversed(cls.__mro__)
+            for name in klass.__dict__.get("__slots__", ())
+            if name not in _NON_STRUCTURAL_SLOTS
+        ]
+        if declared is None:
+            fields = tuple(slots)
+        else:
+            # private slots back the declared fields
+            rest = (n for n in slots if not n.startswith("_") and n not in declared)
+            fields = (*declared, *rest)
+        _hash_fields_cache[cls] = fields
+    return fields
+
+
+def _encode(value: object, out: list[bytes]) -> None:
+    """Append bytes describing an attribute value; child nodes contribute their digest"""
+    if is_node(value):
+        digest = getattr(value, "_structural_hash", None)
+        out.append(b"N" + (digest or structural_hash(value)))
+    elif value is None or isinstance(value, (str, int)):
+        out.append(b"V" + repr(value).encode())
+    elif isinstance(value, (list, tuple)):
+        out.append(b"[%d" % len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        out.append(b"{%d" % len(value))
+        for key, item in sorted(value.items(), key=repr):
+            _encode(key, out)
+            _encode(item, out)
+    elif isinstance(value, Enum):
+        out.append(b"E" + type(value).__name__.encode() + repr(value.value).encode())
+    elif hasattr(type(value), "__slots__"):
+        # plain slotted records such as TypeDescriptions
+        out.append(b"R" + type(value).__name__.encode())
+        for name in type(value).__slots__:
+            _encode(getattr(value, name, None), out)
+    else:
+        out.append(b"V" + repr(value).encode())
+
+
+def _digest(node: AstNode) -> bytes:
+    out = [type(node).__qualname__.encode()]
+    for name in hash_fields(type(node)):
+        out.append(b"|")
+        _encode(getattr(node, name, None), out)
+    return blake2b(b"".join(out), digest_size=DIGEST_SIZE).digest()
+
+
+def structural_hash(node: AstNode) -> bytes:
+    """The Merkle digest of the subtree rooted at node"""
+    cached = getattr(node, "_structural_hash", None)
+    if cached is not None:
+        return cached
+    # post-order: a node is hashed once all its children are
+    stack = [(node, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if getattr(current, "_structural_hash", None) is not None:
+            continue
+        if expanded:
+            current._structural_hash = _digest(current)
+            continue
+        stack.append((current, True))
+        stack.extend(
+            (child, False)
+            for child in children(current)
+            if getattr(child, "_structural_hash", None) is None
+        )
+    return node._structural_hash
+
+
+def structurally_equal(a: AstNode, b: AstNode) -> bool:
+    """Whether two subtrees have the same structure (node ids are not compared)"""
+    return a is b or structural_hash(a) == structural_hash(b)
+
+
+def clear_structural_hash(root: AstNode) -> None:
+    """Drop the cached digests of every node under root, e.g. after editing it in place"""
+    for node in walk(root):
+        node._structural_hash = None
+
+
+class StructuralKey:
+    """Wraps a node so dicts and sets compare it by structure, e.g. to deduplicate
+    subtrees or memoize their rendered text"""
+
+    __slots__ = ("node", "digest")
+
+    def __init__(self, node: AstNode):
+        self.node = node
+        self.digest = structural_hash(node)
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, StructuralKey) and self.digest == other.digest
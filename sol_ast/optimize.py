@@ -0,0 +1,304 @@
+"""Optimization passes over sol_ast trees.
+
+ConstantFolder evaluates Yul builtin calls and Solidity binary operations whose operands are
+known (literals, or names bound in a constants environment such as the library's own
+`constant` declarations), and applies algebraic identities like `and(x, 0) -> 0` when the
+operand being dropped has no side effects.
+
+prune_constants() removes constant declarations that no code refers to.
+"""
+
+from typing import Callable, Iterator, Mapping, Optional, Union
+
+from sol_ast.ast import (
+    AstNode,
+    BinaryOperation,
+    ContractDefinition,
+    Identifier,
+    IdentifierPath,
+    Literal,
+    SourceUnit,
+    VariableDeclaration,
+    VariableDeclarationStatement,
+    YulExpression,
+    YulFunctionCall,
+    YulIdentifier,
+    YulLiteral,
+)
+from sol_ast.enums import BinaryOperator, LiteralKind, Mutability, YulLiteralKind
+from sol_ast.visitor import NodeTransformer, walk
+
+WORD = 1 << 256
+MAX_UINT = WORD - 1
+# folded values above this are rendered in hex
+_HEX_THRESHOLD = 0xFFFF
+
+
+def _signed(x: int) -> int:
+    return x - WORD if x >> 255 else x
+
+
+def _sdiv(a: int, b: int) -> int:
+    if b == 0:
+        return 0
+    a, b = _signed(a), _signed(b)
+    quotient = abs(a) // abs(b)
+    return (-quotient if (a < 0) != (b < 0) else quotient) % WORD
+
+
+def _smod(a: int, b: int) -> int:
+    if b == 0:
+        return 0
+    a, b = _signed(a), _signed(b)
+    remainder = abs(a) % abs(b)
+    return (-remainder if a < 0 else remainder) % WORD
+
+
+def _byte(i: int, x: int) -> int:
+    return (x >> (248 - i * 8)) & 0xFF if i < 32 else 0
+
+
+def _signextend(b: int, x: int) -> int:
+    if b >= 31:
+        return x
+    sign_bit = 1 << (b * 8 + 7)
+    low = x & ((sign_bit << 1) - 1)
+    return (low | (MAX_UINT ^ ((sign_bit << 1) - 1))) if low & sign_bit else low
+
+
+# EVM semantics of the side-effect-free builtins, on 256-bit words; argument order is the
+# Yul argument order
+YUL_BUILTINS: dict[str, Callable[..., int]] = {
+    "add": lambda a, b: (a + b) % WORD,
+    "sub": lambda a, b: (a - b) % WORD,
+    "mul": lambda a, b: (a * b) % WORD,
+    "div": lambda a, b: a // b if b else 0,
+    "sdiv": _sdiv,
+    "mod": lambda a, b: a % b if b else 0,
+    "smod": _smod,
+    "exp": lambda a, b: pow(a, b, WORD),
+    "addmod": lambda a, b, n: (a + b) % n if n else 0,
+    "mulmod": lambda a, b, n: (a * b) % n if n else 0,
+    "not": lambda a: MAX_UINT ^ a,
+    "iszero": lambda a: int(a == 0),
+    "eq": lambda a, b: int(a == b),
+    "lt": lambda a, b: int(a < b),
+    "gt": lambda a, b: int(a > b),
+    "slt": lambda a, b: int(_signed(a) < _signed(b)),
+    "sgt": lambda a, b: int(_signed(a) > _signed(b)),
+    "and": lambda a, b: a & b,
+    "or": lambda a, b: a | b,
+    "xor": lambda a, b: a ^ b,
+    "byte": _byte,
+    "shl": lambda shift, x: (x << shift) % WORD if shift < 256 else 0,
+    "shr": lambda shift, x: x >> shift if shift < 256 else 0,
+    "sar": lambda shift, x: (_signed(x) >> min(shift, 255)) % WORD,
+    "signextend": _signextend,
+}
+
+# Solidity operators folded on non-negative integer constants; any result outside uint256
+# (or an inexact division, which Solidity evaluates as a rational) is left unfolded
+SOLIDITY_OPERATORS: dict[BinaryOperator, Callable[[int, int], Optional[int]]] = {
+    BinaryOperator.Add: lambda a, b: a + b,
+    BinaryOperator.Sub: lambda a, b: a - b,
+    BinaryOperator.Mul: lambda a, b: a * b,
+    BinaryOperator.Div: lambda a, b: a // b if b and a % b == 0 else None,
+    BinaryOperator.Mod: lambda a, b: a % b if b else None,
+    BinaryOperator.Pow: lambda a, b: a**b if b < 256 else None,
+    BinaryOperator.Shl: lambda a, b: a << b if b < 256 else None,
+    BinaryOperator.Shr: lambda a, b: a >> b,
+    BinaryOperator.BitAnd: lambda a, b: a & b,
+    BinaryOperator.BitOr: lambda a, b: a | b,
+    BinaryOperator.Xor: lambda a, b: a ^ b,
+}
+
+
+def parse_number(value: str) -> Optional[int]:
+    """The integer value of a decimal or hex number literal, or None"""
+    try:
+        return int(value.replace("_", ""), 0)
+    except ValueError:
+        return None
+
+
+def yul_number(value: int) -> YulLiteral:
+    return YulLiteral.interned(hex(value) if value > _HEX_THRESHOLD else str(value))
+
+
+def solidity_number(value: int) -> Literal:
+    if value > _HEX_THRESHOLD:
+        return Literal.interned(hex(value), LiteralKind.HexNumber)
+    return Literal.interned(str(value), LiteralKind.Number)
+
+
+def is_pure(expression: YulExpression) -> bool:
+    """Whether evaluating a Yul expression has no side effects (and cannot revert)"""
+    stack: list[AstNode] = [expression]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, YulFunctionCall):
+            if node.function_name.name not in YUL_BUILTINS:
+                return False
+            stack.extend(node.arguments)
+        elif not isinstance(node, (YulLiteral, YulIdentifier)):
+            return False
+    return True
+
+
+def collect_constants(root: AstNode) -> dict[str, int]:
+    """Values of the integer `constant` declarations under root, in declaration order; a
+    constant may refer to ones declared before it
+    """
+    constants: dict[str, int] = {}
+    folder = ConstantFolder(constants)
+    for node in walk(root):
+        if (
+            isinstance(node, VariableDeclaration)
+            and node.mutability == Mutability.Constant
+            and node.value is not None
+        ):
+            value = folder.value_of(folder.visit(node.value))
+            if value is not None:
+                constants[node.name.name] = value
+    return constants
+
+
+class ConstantFolder(NodeTransformer):
+    """Fold constant Yul builtin calls and Solidity binary operations. Names in `constants` are
+    treated as known values: Yul code must not declare locals that shadow them.
+    """
+
+    def __init__(self, constants: Optional[Mapping[str, int]] = None):
+        self.constants = constants if constants is not None else {}
+
+    def value_of(self, node: AstNode) -> Optional[int]:
+        if isinstance(node, YulLiteral):
+            if node.kind != YulLiteralKind.Number:
+                return None
+            return parse_number(node.value)
+        if isinstance(node, Literal):
+            if node.kind not in (LiteralKind.Number, LiteralKind.HexNumber):
+                return None
+            if node.subdenomination:
+                return None
+            return parse_number(node.value)
+        if isinstance(node, (Identifier, YulIdentifier)):
+            return self.constants.get(node.name)
+        return None
+
+    def visit_YulFunctionCall(self, node: YulFunctionCall) -> YulExpression:
+        name = node.function_name.name
+        evaluate = YUL_BUILTINS.get(name)
+        if evaluate is None:
+            return node
+        values = [self.value_of(arg) for arg in node.arguments]
+        if None not in values:
+            try:
+                return yul_number(evaluate(*values))
+            except TypeError:  # wrong arity: leave it for the compiler to reject
+                return node
+        return self.simplify(node, name, values)
+
+    def simplify(
+        self, node: YulFunctionCall, name: str, values: list[Optional[int]]
+    ) -> YulExpression:
+        """Algebraic identities for calls with some known arguments"""
+        args = node.arguments
+        if len(args) == 2:
+            (a, b), (x, y) = args, values
+            if name in ("add", "or", "xor") and (x == 0 or y == 0):
+                return b if x == 0 else a
+            if name == "sub" and y == 0:
+                return a
+            if name in ("shl", "shr", "sar") and x == 0:
+                return b
+            if name in ("mul", "div") and y == 1:
+                return a
+            if name == "mul" and x == 1:
+                return b
+            if name == "and" and (x == MAX_UINT or y == MAX_UINT):
+                return b if x == MAX_UINT else a
+            if name in ("and", "mul") and (x == 0 or y == 0):
+                dropped = b if x == 0 else a
+                if is_pure(dropped):
+                    return yul_number(0)
+            if name in ("shl", "shr") and x is not None and x >= 256 and is_pure(b):
+                return yul_number(0)
+            if name == "signextend" and x is not None and x >= 31:
+                return b
+        elif name == "iszero":
+            # iszero(iszero(iszero(x))) -> iszero(x)
+            inner = args[0]
+            if (
+                isinstance(inner, YulFunctionCall)
+                and inner.function_name.name == "iszero"
+                and isinstance(inner.arguments[0], YulFunctionCall)
+                and inner.arguments[0].function_name.name == "iszero"
+            ):
+                return inner.arguments[0]
+        return node
+
+    def visit_BinaryOperation(self, node: BinaryOperation) -> AstNode:
+        evaluate = SOLIDITY_OPERATORS.get(node.operator)
+        lhs, rhs = self.value_of(node.lhs), self.value_of(node.rhs)
+        if evaluate is None or lhs is None or rhs is None:
+            return node
+        value = evaluate(lhs, rhs)
+        if value is None or not 0 <= value <= MAX_UINT:
+            return node
+        return solidity_number(value)
+
+
+def fold_constants(
+    root: AstNode, constants: Optional[Mapping[str, int]] = None
+) -> AstNode:
+    """Run ConstantFolder over root; by default the constants declared under root are known"""
+    if constants is None:
+        constants = collect_constants(root)
+    return ConstantFolder(constants).visit(root)
+
+
+def _constant_name(node: AstNode) -> Optional[str]:
+    """The name declared by a constant declaration (bare or wrapped in a statement)"""
+    if isinstance(node, VariableDeclarationStatement) and len(node.assignments) == 1:
+        node = node.assignments[0]
+    if isinstance(node, VariableDeclaration) and node.mutability == Mutability.Constant:
+        return node.name.name
+    return None
+
+
+def _referenced_names(root: AstNode) -> Iterator[str]:
+    for node in walk(root):
+        if isinstance(node, (Identifier, YulIdentifier, IdentifierPath)):
+            yield node.name
+
+
+def prune_constants(root: Union[ContractDefinition, SourceUnit]) -> list[str]:
+    """Remove the top-level constant declarations of root that nothing else in it refers
+    to, directly or through other live constants; returns the removed names. Only use it on
+    code whose constants are not referenced from outside (e.g. as `Library.CONSTANT`).
+    """
+    constants: dict[str, AstNode] = {}
+    live: set[str] = set()
+    for node in root.nodes:
+        name = _constant_name(node)
+        if name is not None:
+            constants[name] = node
+        else:
+            live.update(_referenced_names(node))
+    # mark: constants reachable from the rest of the code, through constant values
+    pending = [name for name in live if name in constants]
+    while pending:
+        declaration = constants[pending.pop()]
+        if isinstance(declaration, VariableDeclarationStatement):
+            declaration = declaration.assignments[0]
+        if declaration.value is None:
+            continue
+        for name in _referenced_names(declaration.value):
+            if name in constants and name not in live:
+                live.add(name)
+                pending.append(name)
+    dead = [name for name in constants if name not in live]
+    if dead:
+        root.nodes = [node for node in root.nodes if _constant_name(node) not in dead]
+    return dead
@@ -1,6 +1,7 @@
-from typing import TypeVar, TYPE_CHECKING, Iterable
+from typing import Callable, TypeVar, TYPE_CHECKING, Iterable, Iterator
 from itertools import chain
 from abc import ABCMeta
+import os
 
 
 if TYPE_CHECKING:
@@ -15,6 +16,17 @@ def wrap_block(nodes: Iterable[SerializableNode], semicolon: bool) -> Iterable[s
     return chain("{", indent(x.fmt() + (";" if semicolon else "") for x in nodes), "}")
 
 
+def iter_block(nodes: Iterable[SerializableNode], semicolon: bool) -> Iterator[str]:
+    """Streaming counterpart of line_join(wrap_block(nodes, semicolon)): one node per line"""
+    yield "{"
+    for node in nodes:
+        yield "\n"
+        yield from node.iter_chunks()
+        if semicolon:
+            yield ";"
+    yield "\n}"
+
+
 def indent(lines: Iterable[str], indent: int = 0) -> Iterable[str]:
     indent_str = " " * 4 * indent
     return (f"{indent_str}{x}" for x in lines)
@@ -24,32 +36,87 @@ def line_join(lines: Iterable[str]) -> str:
     return f"\n".join(x for x in lines if x)
 
 
-def super_checker(node: type[SerializableNode]) -> type[SerializableNode]:
-    old_init = node.__init__
+# structural checks on node construction and statement formatting are debug-only: they are
+# installed when SOL_AST_VALIDATE is set to a non-zero value, or via set_validation(True)
+_validation_enabled = os.environ.get("SOL_AST_VALIDATE", "0") not in ("", "0")
+# (class, attribute, original, wrapper factory) for every check that can be installed
+_checks: list[tuple[type, str, Callable, Callable[[Callable], Callable]]] = []
 
-    def new_init(self, *args, **kwargs):
-        old_init(self, *args, **kwargs)
-        assert self.d is not None
 
-    node.__init__ = new_init
+def validation_enabled() -> bool:
+    return _validation_enabled
+
 
+def set_validation(enabled: bool) -> bool:
+    """Install or remove the structural checks on every node class; returns the previous setting"""
+    global _validation_enabled
+    previous, _validation_enabled = _validation_enabled, enabled
+    for node, attr, original, make_check in _checks:
+        setattr(node, attr, make_check(original) if enabled else original)
+    return previous
+
+
+def install_check(
+    node: type[T], attr: str, make_check: Callable[[Callable], Callable]
+) -> type[T]:
+    """Register a check wrapping `attr` as defined on `node` itself; it is only in place while
+    validation is enabled, otherwise calls go straight to the original method
+    """
+    original = node.__dict__.get(attr)
+    if original is None:
+        return node
+    _checks.append((node, attr, original, make_check))
+    if _validation_enabled:
+        setattr(node, attr, make_check(original))
     return node
 
 
-def statement_checker(node: type[StatementNode]) -> type[StatementNode]:
-    old_fmt = node.fmt
+def checked_init(old_init: Callable) -> Callable:
+    def new_init(self, *args, **kwargs):
+        old_init(self, *args, **kwargs)
+        assert hasattr(self, "_id"), f"{type(self).__name__} did not call AstNode.__init__"
 
+    return new_init
+
+
+def checked_fmt(old_fmt: Callable) -> Callable:
     def new_fmt(self) -> str:
         output = old_fmt(self)
-        assert output.endswith(";"), f"Statement {self} does not end with a semicolon"
+        assert output.endswith(";"), f"Statement {output!r} does not end with a semicolon"
         return output
 
-    node.fmt = new_fmt
-    return node
+    return new_fmt
+
+
+def super_checker(node: type[SerializableNode]) -> type[SerializableNode]:
+    return install_check(node, "__init__", checked_init)
+
+
+def statement_checker(node: type[StatementNode]) -> type[StatementNode]:
+    return install_check(node, "fmt", checked_fmt)
+
+
+def annotation_slots(bases: tuple[type, ...], dct: dict) -> tuple[str, ...]:
+    """Slots for the attributes a class body annotates, minus those its bases already have.
+    The root of a hierarchy also gets a __weakref__ slot.
+    """
+    inherited = {"__weakref__"} if any(hasattr(b, "__weakref__") for b in bases) else set()
+    for base in bases:
+        for klass in base.__mro__:
+            inherited.update(klass.__dict__.get("__slots__", ()))
+    slots = tuple(
+        name
+        for name in dct.get("__annotations__", {})
+        if name not in dct and name not in inherited
+    )
+    return slots if inherited else slots + ("__weakref__",)
 
 
 class NodeDictChecker(ABCMeta):
     def __new__(cls, name, bases, dct):
+        # nodes are slotted: every annotated attribute becomes a slot, so no per-instance __dict__
+        if "__slots__" not in dct:
+            dct["__slots__"] = annotation_slots(bases, dct)
         x = super().__new__(cls, name, bases, dct)
         x = super_checker(x)  # type: ignore
         return x
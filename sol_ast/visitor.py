@@ -0,0 +1,171 @@
+"""Generic traversal of sol_ast trees. walk(), NodeVisitor and NodeTransformer keep their own
+explicit stacks instead of recursing, so they handle trees of any depth or size.
+"""
+
+from typing import Callable, ClassVar, Iterator, Optional
+
+from sol_ast.ast import AstNode
+
+# bookkeeping slots that never hold children
+_NON_CHILD_SLOTS = frozenset({"src", "parent", "__weakref__"})
+_fields_cache: dict[type, tuple[str, ...]] = {}
+
+
+def node_fields(cls: type[AstNode]) -> tuple[str, ...]:
+    """The attributes of a node class that may hold child nodes, in declaration order. A class
+    can override the derived list with a plain `_fields` tuple (e.g. when its children sit
+    behind properties); private slots are never considered.
+    """
+    fields = _fields_cache.get(cls)
+    if fields is None:
+        fields = getattr(cls, "_fields", None)
+        if fields is None:
+            fields = tuple(
+                name
+                for klass in reversed(cls.__mro__)
+                for name in klass.__dict__.get("__slots__", ())
+                if not name.startswith("_") and name not in _NON_CHILD_SLOTS
+            )
+        fields = _fields_cache[cls] = tuple(fields)
+    return fields
+
+
+def is_node(value: object) -> bool:
+    """isinstance(value, AstNode), memoized per type (AstNode's ABCMeta check is slow)"""
+    cls = type(value)
+    known = _node_types.get(cls)
+    if known is None:
+        known = _node_types[cls] = issubclass(cls, AstNode)
+    return known
+
+
+_node_types: dict[type, bool] = {}
+
+
+def children(node: AstNode) -> list[AstNode]:
+    """The direct children of a node, in field order"""
+    found = []
+    for name in node_fields(type(node)):
+        value = getattr(node, name, None)
+        if is_node(value):
+            found.append(value)
+        elif isinstance(value, (list, tuple)):
+            found.extend(item for item in value if is_node(item))
+    return found
+
+
+def walk(node: AstNode) -> Iterator[AstNode]:
+    """Every node of the tree rooted at `node`, in pre-order"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(children(node)))
+
+
+class _Dispatcher:
+    """Resolves visit_<ClassName> methods along the node's MRO, once per (visitor, node) class"""
+
+    _dispatch: ClassVar[dict[type, Callable]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
+    @classmethod
+    def _method_for(cls, node_cls: type) -> Callable:
+        method = cls._dispatch.get(node_cls)
+        if method is None:
+            method = cls.generic_visit  # type: ignore
+            for klass in node_cls.__mro__:
+                found = getattr(cls, f"visit_{klass.__name__}", None)
+                if found is not None:
+                    method = found
+                    break
+            cls._dispatch[node_cls] = method
+        return method
+
+
+class NodeVisitor(_Dispatcher):
+    """Pre-order traversal calling visit_<ClassName>(node) for each node, or the method for the
+    nearest base class that has one, or generic_visit(). Returning False from a visit method
+    skips that node's children.
+    """
+
+    def visit(self, node: AstNode) -> None:
+        method_for = type(self)._method_for
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if method_for(type(node))(self, node) is False:
+                continue
+            stack.extend(reversed(children(node)))
+
+    def generic_visit(self, node: AstNode) -> Optional[bool]:
+        return None
+
+
+class NodeTransformer(_Dispatcher):
+    """Post-order rewrite: children are transformed before their parent, and each visit method
+    returns the node to put in its place. Returning None drops the node from a list field, or
+    clears a single-node field. visit() returns the (possibly replaced) root.
+    """
+
+    def visit(self, node: AstNode) -> Optional[AstNode]:
+        method_for = type(self)._method_for
+        # (node, number of children) entries are pending parents whose children are done
+        stack: list[tuple[AstNode, Optional[int]]] = [(node, None)]
+        results: list[Optional[AstNode]] = []
+        # whether anything in the subtree of the matching result was rewritten
+        modified: list[bool] = []
+        while stack:
+            node, child_count = stack.pop()
+            if child_count is None:
+                kids = children(node)
+                stack.append((node, len(kids)))
+                stack.extend((child, None) for child in reversed(kids))
+                continue
+            dirty = False
+            if child_count:
+                replacements = results[-child_count:]
+                dirty = any(modified[-child_count:])
+                del results[-child_count:], modified[-child_count:]
+                dirty = self._patch(node, iter(replacements)) or dirty
+            if dirty:
+                # sol_ast.hashing digests cover the whole subtree
+                node._structural_hash = None
+            result = method_for(type(node))(self, node)
+            results.append(result)
+            modified.append(dirty or result is not node)
+        return results[0]
+
+    @staticmethod
+    def _patch(node: AstNode, replacements: Iterator[Optional[AstNode]]) -> bool:
+        """Write transformed children back, consuming them in children() order; returns
+        whether any child was replaced or removed"""
+        patched = False
+        for name in node_fields(type(node)):
+            value = getattr(node, name, None)
+            if is_node(value):
+                new = next(replacements)
+                if new is not value:
+                    setattr(node, name, new)
+                    patched = True
+            elif isinstance(value, (list, tuple)):
+                items = []
+                changed = False
+                for item in value:
+                    if is_node(item):
+                        new = next(replacements)
+                        changed = changed or new is not item
+                        if new is not None:
+                            items.append(new)
+                    else:
+                        items.append(item)
+                if changed:
+                    setattr(node, name, type(value)(items))
+                    patched = True
+        return patched
+
+    def generic_visit(self, node: AstNode) -> Optional[AstNode]:
+        return node
@@ -0,0 +1,242 @@
+import gc
+from io import StringIO
+from unittest import TestCase
+from sol_ast.ast import (
+    ArrayTypeName,
+    ElementaryTypeName,
+    FunctionCall,
+    Identifier,
+    IndexAccess,
+    LazyIdAllocator,
+    License,
+    Literal,
+    NewExpression,
+    NodeIndex,
+    SequentialIdAllocator,
+    LineStatement,
+    PragmaDirective,
+    YulAssignment,
+    YulBlock,
+    YulForLoop,
+    YulIdentifier,
+    YulLiteral,
+    YulVariableDeclaration,
+    set_interning,
+    yul_add,
+    yul_lt,
+)
+from sol_ast.enums import FunctionCallKind
+from sol_ast.utils import set_validation
+from packed_udvts.member import Member
+from packed_udvts.udvt import UserDefinedValueType
+
+
+class TestNodeIndex(TestCase):
+    def test_no_index_by_default(self):
+        node = Identifier("foo")
+        with NodeIndex() as index:
+            pass
+        self.assertNotIn(node.id, index)
+
+    def test_lookup_by_id(self):
+        with NodeIndex() as index:
+            node = Identifier("foo")
+            yul_node = YulIdentifier("bar")
+        self.assertIs(index[node.id], node)
+        self.assertIs(index.get(yul_node.id), yul_node)
+        self.assertEqual(len(index), 2)
+
+    def test_nested_indexes(self):
+        with NodeIndex() as outer:
+            with NodeIndex() as inner:
+                node = Identifier("foo")
+            after = Identifier("bar")
+        self.assertIn(node.id, outer)
+        self.assertIn(node.id, inner)
+        self.assertIn(after.id, outer)
+        self.assertNotIn(after.id, inner)
+
+    def test_index_is_weak(self):
+        with NodeIndex() as index:
+            node = Identifier("foo")
+        node_id = node.id
+        del node
+        gc.collect()
+        self.assertNotIn(node_id, index)
+
+
+class TestIdAllocator(TestCase):
+    def test_sequential_ids(self):
+        with SequentialIdAllocator():
+            ids = [Identifier("foo").id for _ in range(3)]
+        self.assertEqual(ids, [1, 2, 3])
+
+    def test_lazy_ids(self):
+        with LazyIdAllocator(start=10):
+            first = Identifier("foo")
+            second = Identifier("bar")
+            self.assertIsNone(first._id)
+            self.assertEqual(second.id, 10)
+            self.assertEqual(first.id, 11)
+
+    def test_render_file_is_deterministic(self):
+        u = UserDefinedValueType.from_members(
+            name="UDVT", members=[Member(name="foo", width_bits=8)], value_type="uint256"
+        )
+        first, second = u.render_file(), u.render_file()
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(first.nodes[-1].id, second.nodes[-1].id)
+
+    def test_render_file_keeps_lazy_mode(self):
+        u = UserDefinedValueType.from_members(
+            name="UDVT", members=[Member(name="foo", width_bits=8)], value_type="uint256"
+        )
+        with LazyIdAllocator():
+            unit = u.render_file()
+        self.assertIsNone(unit._id)
+
+
+class TestSlots(TestCase):
+    def test_nodes_have_no_dict(self):
+        for node in (Identifier("foo"), YulIdentifier("foo"), Literal("1"), License("MIT")):
+            self.assertFalse(hasattr(node, "__dict__"), type(node).__name__)
+
+    def test_unknown_attribute_rejected(self):
+        with self.assertRaises(AttributeError):
+            Identifier("foo").not_a_field = 1  # type: ignore
+
+
+class Unterminated(LineStatement):
+    def fmt(self) -> str:
+        return "foo"
+
+
+class TestValidation(TestCase):
+    def setUp(self):
+        self.previous = set_validation(False)
+
+    def tearDown(self):
+        set_validation(self.previous)
+
+    def test_disabled_calls_originals(self):
+        self.assertIs(Unterminated.fmt, Unterminated.__dict__["fmt"])
+        self.assertEqual(Unterminated().fmt(), "foo")
+
+    def test_enabled_checks_statements(self):
+        original = Unterminated.fmt
+        set_validation(True)
+        self.assertIsNot(Unterminated.fmt, original)
+        with self.assertRaises(AssertionError):
+            Unterminated().fmt()
+        set_validation(False)
+        self.assertIs(Unterminated.fmt, original)
+
+
+class TestStreaming(TestCase):
+    def setUp(self):
+        self.unit = UserDefinedValueType.from_members(
+            name="UDVT",
+            members=[Member(name="foo", width_bits=8), Member(name="bar", width_bits=16)],
+            value_type="uint256",
+        ).render_file()
+
+    def test_write_to_list(self):
+        buffer: list[str] = []
+        self.unit.write(buffer)
+        self.assertGreater(len(buffer), 1)
+        self.assertEqual("".join(buffer), self.unit.fmt())
+
+    def test_write_to_file(self):
+        f = StringIO()
+        self.unit.write(f)
+        self.assertEqual(f.getvalue(), self.unit.fmt())
+        self.assertTrue(f.getvalue().startswith("// SPDX-License-Identifier: MIT\n"))
+
+
+class TestYulForLoop(TestCase):
+    def test_fmt(self):
+        i = YulIdentifier("i")
+        loop = YulForLoop(
+            pre=YulBlock(YulVariableDeclaration(i, value=YulLiteral("0"))),
+            condition=yul_lt(i, YulIdentifier("n")),
+            post=YulBlock(YulAssignment(i, value=yul_add(i, YulLiteral("1")))),
+            body=YulBlock(),
+        )
+        expected = "for {\nlet i := 0\n} lt(i, n) {\ni := add(i, 1)\n} {\n}"
+        self.assertEqual(loop.fmt(), expected)
+        buffer: list[str] = []
+        loop.write(buffer)
+        self.assertEqual("".join(buffer), expected)
+
+
+class TestExpressions(TestCase):
+    def test_index_access(self):
+        index = Literal("0")
+        self.assertEqual(IndexAccess(Identifier("words"), index).fmt(), "words[0 ]")
+        call = FunctionCall(
+            expression=Identifier("f"), kind=FunctionCallKind.FunctionCall
+        )
+        self.assertEqual(IndexAccess(call, index).fmt(), "(f())[0 ]")
+
+    def test_new_expression(self):
+        new = NewExpression(ArrayTypeName(ElementaryTypeName("uint256")))
+        self.assertEqual(
+            FunctionCall(
+                expression=new,
+                arguments=[Literal("2")],
+                kind=FunctionCallKind.FunctionCall,
+            ).fmt(),
+            "new uint256[](2 )",
+        )
+
+
+class TestSourceUnitRendering(TestCase):
+    def setUp(self):
+        self.unit = UserDefinedValueType.from_members(
+            name="UDVT", members=[Member(name="foo", width_bits=8)], value_type="uint256"
+        ).render_file()
+
+    def test_rendering_is_idempotent(self):
+        node_count = len(self.unit.nodes)
+        first = self.unit.fmt()
+        self.assertEqual(self.unit.fmt(), first)
+        self.assertEqual(first.count("SPDX-License-Identifier"), 1)
+        self.assertEqual(len(self.unit.nodes), node_count)
+
+    def test_frozen_unit_memoizes(self):
+        self.unit.freeze()
+        self.assertIs(self.unit.fmt(), self.unit.fmt())
+        self.assertEqual("".join(self.unit.iter_chunks()), self.unit.fmt())
+        with self.assertRaises(AttributeError):
+            self.unit.nodes.append(License("MIT"))  # type: ignore
+
+    def test_edits_invalidate_cache(self):
+        self.unit.freeze()
+        before = self.unit.fmt()
+        self.unit.append(PragmaDirective(["abicoder", "v2"]))
+        self.assertEqual(self.unit.fmt(), before + "\npragma abicoder v2;")
+        self.unit.license = License("UNLICENSED")
+        self.assertIn("SPDX-License-Identifier: UNLICENSED", self.unit.fmt())
+        self.assertIsInstance(self.unit.nodes, tuple)
+
+
+class TestInterning(TestCase):
+    def test_same_instance_within_allocator(self):
+        with SequentialIdAllocator():
+            first = YulIdentifier.interned("self")
+            self.assertIs(YulIdentifier.interned("self"), first)
+            self.assertIs(Identifier("self").to_yul_identifier(), first)
+            self.assertIsNot(YulIdentifier.interned("other"), first)
+
+    def test_allocators_do_not_share(self):
+        with SequentialIdAllocator():
+            first = Identifier.interned("foo")
+        with SequentialIdAllocator():
+            self.assertIsNot(Identifier.interned("foo"), first)
+
+    def test_disabled(self):
+        previous = set_interning(False)
+        try:
+            self.assertIsNot(Literal.interned("1"), Literal.interned("1"))
+        finally:
+            set_interning(previous)
@@ -0,0 +1,42 @@
+from unittest import TestCase
+from packed_udvts.constant_pool import ConstantPool
+from packed_udvts.member import Member
+from packed_udvts.region import Region
+from packed_udvts.udvt import UserDefinedValueType
+
+
+class TestConstantPool(TestCase):
+    def test_dedupes_by_name(self):
+        a = Region(Member(name="a", width_bits=8), offset_bits=0)
+        b = Region(Member(name="b", width_bits=8), offset_bits=8)
+        pool = ConstantPool(a.get_constant_declarations())
+        pool.extend(b.get_constant_declarations())
+        names = [d.name.name for d in pool]
+        self.assertEqual(names.count("_8_BIT_END_MASK"), 1)
+        self.assertIn("B_OFFSET", pool)
+        self.assertEqual(len(pool), len(set(names)))
+
+    def test_conflict(self):
+        pool = ConstantPool(
+            Region(Member(name="a", width_bits=8), 0).get_constant_declarations()
+        )
+        with self.assertRaises(ValueError):
+            pool.extend(
+                Region(Member(name="a", width_bits=8), 8).get_constant_declarations()
+            )
+
+    def test_packed_array_declares_mask_once(self):
+        u = UserDefinedValueType.packed_array_of(Member(name="flag", width_bits=1))
+        self.assertEqual(u.render_file().fmt().count("_1_BIT_END_MASK  ="), 1)
+
+    def test_combined_file(self):
+        a = UserDefinedValueType.from_members(
+            "A", [Member("x", 8), Member("y", 16)], "uint256"
+        )
+        b = UserDefinedValueType.from_members("B", [Member("z", 8)], "uint256")
+        unit = UserDefinedValueType.render_combined_file([a, b])
+        text = unit.fmt()
+        self.assertEqual(text.count("_8_BIT_END_MASK  ="), 1)
+        self.assertLess(text.index("_8_BIT_END_MASK  ="), text.index("library AType"))
+        self.assertIn("library BType", text)
+        self.assertIn("X_NOT_MASK  =", text)
@@ -0,0 +1,88 @@
+from unittest import TestCase
+from sol_ast.ast import (
+    BinaryOperation,
+    Identifier,
+    Literal,
+    UserDefinedTypeName,
+    YulFunctionCall,
+    YulIdentifier,
+    YulLiteral,
+)
+from sol_ast.enums import BinaryOperator, LiteralKind
+from sol_ast.hashing import (
+    StructuralKey,
+    clear_structural_hash,
+    structural_hash,
+    structurally_equal,
+)
+from sol_ast.optimize import fold_constants
+from packed_udvts.member import Member
+from packed_udvts.region import Region
+
+
+def getter(width_bits: int, offset_bits: int):
+    region = Region(Member(name="foo", width_bits=width_bits), offset_bits)
+    return region.getter(UserDefinedTypeName("Udt"))
+
+
+class TestStructuralHash(TestCase):
+    def test_ids_do_not_matter(self):
+        a, b = getter(8, 16), getter(8, 16)
+        self.assertIsNot(a, b)
+        self.assertNotEqual(a.id, b.id)
+        self.assertTrue(structurally_equal(a, b))
+        self.assertFalse(structurally_equal(a, getter(8, 0)))
+        self.assertFalse(structurally_equal(a, getter(16, 16)))
+
+    def test_attributes_matter(self):
+        self.assertNotEqual(
+            structural_hash(YulLiteral("1")), structural_hash(YulIdentifier("1"))
+        )
+        self.assertNotEqual(
+            structural_hash(
+                BinaryOperation(Identifier("a"), BinaryOperator.Add, Identifier("b"))
+            ),
+            structural_hash(
+                BinaryOperation(Identifier("a"), BinaryOperator.Sub, Identifier("b"))
+            ),
+        )
+
+    def test_transformer_invalidates_ancestors(self):
+        inner = YulFunctionCall(
+            YulIdentifier("add"), [YulLiteral("1"), YulLiteral("2")]
+        )
+        outer = YulFunctionCall(YulIdentifier("mul"), [YulIdentifier("x"), inner])
+        before = structural_hash(outer)
+        fold_constants(outer)
+        self.assertEqual(outer.fmt(), "mul(x, 3)")
+        expected = YulFunctionCall(
+            YulIdentifier("mul"), [YulIdentifier("x"), YulLiteral("3")]
+        )
+        self.assertNotEqual(structural_hash(outer), before)
+        self.assertTrue(structurally_equal(outer, expected))
+
+    def test_manual_edit_needs_clear(self):
+        expr = BinaryOperation(
+            Identifier("a"), BinaryOperator.Add, Literal("1", LiteralKind.Number)
+        )
+        before = structural_hash(expr)
+        expr.rhs = Literal("2", LiteralKind.Number)
+        self.assertEqual(structural_hash(expr), before)
+        clear_structural_hash(expr)
+        self.assertNotEqual(structural_hash(expr), before)
+
+    def test_deep_tree(self):
+        expr = Identifier("x")
+        for _ in range(10_000):
+            expr = BinaryOperation(
+                expr, BinaryOperator.Add, Literal("1", LiteralKind.Number)
+            )
+        self.assertEqual(len(structural_hash(expr)), 16)
+
+    def test_structural_key(self):
+        keys = {
+            StructuralKey(getter(8, 16)),
+            StructuralKey(getter(8, 16)),
+            StructuralKey(getter(8, 0)),
+        }
+        self.assertEqual(len(keys), 2)
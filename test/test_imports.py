@@ -0,0 +1,29 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+
+def modules_after(statement: str) -> set[str]:
+    """The modules loaded by a fresh interpreter after running an import statement"""
+    result = subprocess.run(
+        [sys.executable, "-c", f"{statement}; import sys; print(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+class TestImports(TestCase):
+    def test_generator_import_is_lean(self):
+        loaded = modules_after("import packed_udvts.udvt")
+        for module in ("tkinter", "random", "sol_ast.optimize", "sol_ast.hashing"):
+            self.assertNotIn(module, loaded)
+
+    def test_lazy_package_attributes(self):
+        loaded = modules_after("from packed_udvts import Member")
+        self.assertIn("packed_udvts.member", loaded)
+        self.assertNotIn("packed_udvts.udvt", loaded)
+        self.assertIn(
+            "sol_ast.optimize", modules_after("import sol_ast; sol_ast.optimize")
+        )
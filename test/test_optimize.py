@@ -0,0 +1,138 @@
+from unittest import TestCase
+from sol_ast.ast import (
+    BinaryOperation,
+    ContractDefinition,
+    ElementaryTypeName,
+    ExpressionStatement,
+    Identifier,
+    Literal,
+    VariableDeclaration,
+    VariableDeclarationStatement,
+    YulIdentifier,
+    YulLiteral,
+    yul_and,
+    yul_gt,
+    yul_iszero,
+    yul_sar,
+    yul_sdiv,
+    yul_shl,
+    yul_signextend,
+    yul_sload,
+    yul_smod,
+    yul_sub,
+    yul_tload,
+)
+from sol_ast.enums import BinaryOperator, ContractKind, Mutability
+from sol_ast.optimize import MAX_UINT, ConstantFolder, fold_constants, prune_constants
+from packed_udvts.member import Member
+from packed_udvts.region import Region
+from packed_udvts.udvt import UserDefinedValueType
+
+
+def lit(value: int) -> YulLiteral:
+    return YulLiteral(hex(value % (1 << 256)))
+
+
+def fold(expr, **constants) -> str:
+    return ConstantFolder(constants).visit(expr).fmt()
+
+
+class TestYulFolding(TestCase):
+    def test_nested(self):
+        self.assertEqual(fold(yul_shl(lit(7), yul_gt(lit(300), lit(0xFF)))), "128")
+        self.assertEqual(fold(yul_sub(lit(0), lit(1))), hex(MAX_UINT))
+
+    def test_signed(self):
+        self.assertEqual(fold(yul_sdiv(lit(-7), lit(2))), hex(MAX_UINT - 2))
+        self.assertEqual(fold(yul_smod(lit(-7), lit(2))), hex(MAX_UINT))
+        self.assertEqual(fold(yul_sar(lit(4), lit(-32))), hex(MAX_UINT - 1))
+        self.assertEqual(fold(yul_signextend(lit(0), lit(0x80))), hex(MAX_UINT - 0x7F))
+        self.assertEqual(fold(yul_signextend(lit(0), lit(0x17F))), "127")
+
+    def test_constants(self):
+        expr = yul_shl(YulIdentifier("OFFSET"), YulIdentifier("MASK"))
+        self.assertEqual(fold(expr, OFFSET=8, MASK=0xFF), "65280")
+        self.assertEqual(fold(expr), "shl(OFFSET, MASK)")
+
+    def test_identities(self):
+        x = YulIdentifier("x")
+        self.assertEqual(fold(yul_and(x, lit(0))), "0")
+        self.assertEqual(fold(yul_and(x, YulIdentifier("M")), M=MAX_UINT), "x")
+        self.assertEqual(fold(yul_shl(lit(0), x)), "x")
+        self.assertEqual(fold(yul_iszero(yul_iszero(yul_iszero(x)))), "iszero(x)")
+
+    def test_impure_operand_kept(self):
+        self.assertEqual(
+            fold(yul_and(yul_sload(lit(0)), lit(0))), "and(sload(0x0), 0x0)"
+        )
+        self.assertEqual(
+            fold(yul_and(yul_tload(lit(0)), lit(0))), "and(tload(0x0), 0x0)"
+        )
+
+
+class TestSolidityFolding(TestCase):
+    def test_bytecode_minimal_not_mask(self):
+        region = Region(Member(name="foo", width_bits=12), offset_bits=20)
+        folded = fold_constants(
+            region.not_mask_expression(bytecode_minimal=True),
+            {"FOO_OFFSET": 20, "FOO_WIDTH_BITS": 12},
+        )
+        self.assertEqual(folded.fmt(), region.not_mask.fmt())
+
+    def test_render_file_flag(self):
+        u = UserDefinedValueType.from_members(
+            name="UDVT",
+            members=[Member(name="foo", width_bits=8, signed=True)],
+            value_type="uint256",
+        )
+        # nothing to fold: only the unused width constant goes
+        unoptimized = u.render_file().fmt().replace(
+            "uint256 constant FOO_WIDTH_BITS  = 8 ;\n", ""
+        )
+        self.assertEqual(u.render_file(optimize=True).fmt(), unoptimized)
+
+
+def constant(name: str, value) -> VariableDeclarationStatement:
+    return VariableDeclarationStatement(
+        assignments=[
+            VariableDeclaration(
+                mutability=Mutability.Constant,
+                type_name=ElementaryTypeName("uint256"),
+                name=Identifier(name),
+                value=value,
+            )
+        ],
+        initial_value=None,
+    )
+
+
+class TestPruneConstants(TestCase):
+    def test_reachability(self):
+        library = ContractDefinition(
+            constant("A", Literal("1")),
+            constant(
+                "B", BinaryOperation(Identifier("A"), BinaryOperator.Add, Literal("1"))
+            ),
+            constant("C", Identifier("D")),
+            constant("D", Literal("2")),
+            ExpressionStatement(Identifier("B")),
+            name="L",
+            kind=ContractKind.Library,
+        )
+        self.assertEqual(prune_constants(library), ["C", "D"])
+        self.assertEqual(len(library.nodes), 3)
+        self.assertEqual(prune_constants(library), [])
+
+    def test_library_drops_width_bits(self):
+        u = UserDefinedValueType.from_members(
+            name="UDVT",
+            members=[
+                Member(name="foo", width_bits=8),
+                Member(name="bar", width_bits=8),
+            ],
+            value_type="uint256",
+        )
+        self.assertIn("FOO_WIDTH_BITS", u.render_file().fmt())
+        optimized = u.render_file(optimize=True).fmt()
+        self.assertNotIn("WIDTH_BITS", optimized)
+        self.assertIn("BAR_OFFSET", optimized)
@@ -0,0 +1,56 @@
+from unittest import TestCase
+from packed_udvts.member import Member
+from packed_udvts.packer import AccessGroup, Packing, pack_members
+from packed_udvts.record import PackedRecord
+
+a = Member(name="a", width_bits=200)
+b = Member(name="b", width_bits=100)
+c = Member(name="c", width_bits=50)
+d = Member(name="d", width_bits=50)
+members = [a, b, c, d]
+groups = [AccessGroup("hot", ["a", "c"], weight=5), AccessGroup("cold", ["b", "d"])]
+
+
+def names(packing: Packing) -> list[list[str]]:
+    return [[m.name for m in word] for word in packing.words]
+
+
+class TestPacker(TestCase):
+    def test_co_accessed_members_share_a_word(self):
+        packing = pack_members(members, groups)
+        self.assertEqual(names(packing), [["a", "c"], ["b", "d"]])
+        self.assertEqual(packing.report(), {"hot": 1, "cold": 1})
+        self.assertEqual(packing.expected_slots(), 1.0)
+        # declaration order splits the hot group
+        in_order = PackedRecord("R", members)
+        baseline = Packing(
+            members,
+            groups,
+            [[r.member for r in w.regions] for w in in_order.words],
+        )
+        self.assertEqual(baseline.report(), {"hot": 2, "cold": 1})
+        self.assertGreater(baseline.expected_slots(), packing.expected_slots())
+
+    def test_oversized_group_and_ungrouped_members(self):
+        wide = [Member(name=f"m{i}", width_bits=100) for i in range(4)]
+        packing = pack_members(wide, [AccessGroup("all", ["m0", "m1", "m2"])])
+        self.assertEqual(packing.report(), {"all": 2})
+        self.assertEqual(sum(len(word) for word in packing.words), 4)
+        self.assertEqual(len(packing.words), 2)
+
+    def test_outputs(self):
+        packing = pack_members(members, groups)
+        udvts = packing.to_udvts("Account")
+        self.assertEqual([u.name.name for u in udvts], ["AccountWord0", "AccountWord1"])
+        self.assertEqual([r.offset_bits for r in udvts[0].regions], [0, 200])
+        record = packing.to_record("Account")
+        self.assertEqual(record.word_of, {"a": 0, "c": 0, "b": 1, "d": 1})
+        # create keeps declaration order
+        self.assertIn(
+            "function createAccount(uint200 _a, uint104 _b, uint56 _c, uint56 _d)",
+            record.create_declaration().fmt(),
+        )
+
+    def test_unknown_member(self):
+        with self.assertRaises(AssertionError):
+            pack_members(members, [AccessGroup("bad", ["e"])])
@@ -0,0 +1,99 @@
+from unittest import TestCase
+from packed_udvts.member import Member
+from packed_udvts.record import PackedRecord
+
+owner = Member(name="owner", width_bits=160)
+tick = Member(name="tick", width_bits=24, signed=True)
+liquidity = Member(name="liquidity", width_bits=125)
+fee = Member(name="fee", width_bits=18)
+members = [owner, tick, liquidity, fee]
+
+
+def layout(record: PackedRecord) -> list[list[tuple[str, int]]]:
+    return [[(r.member.name, r.offset_bits) for r in w.regions] for w in record.words]
+
+
+class TestPackedRecord(TestCase):
+    def test_layout(self):
+        record = PackedRecord("Position", members)
+        self.assertEqual(record.width_bits, 327)
+        self.assertEqual(
+            layout(record),
+            [[("owner", 0), ("tick", 160)], [("liquidity", 0), ("fee", 125)]],
+        )
+        self.assertEqual(
+            record.word_of, {"owner": 0, "tick": 0, "liquidity": 1, "fee": 1}
+        )
+        self.assertEqual(
+            record.struct_declaration.fmt(),
+            "struct Position {\nPositionWord0 word0;\nPositionWord1 word1;\n}",
+        )
+
+    def test_straddle_layout(self):
+        record = PackedRecord("Position", members, allow_straddle=True)
+        self.assertEqual(
+            layout(record),
+            [
+                [("owner", 0), ("tick", 160), ("liquidity_lo", 184)],
+                [("liquidity_hi", 0), ("fee", 53)],
+            ],
+        )
+        # only plain unsigned integers are split
+        signed = PackedRecord(
+            "R",
+            [
+                Member(name="a", width_bits=200),
+                Member(name="b", width_bits=64, signed=True),
+            ],
+            allow_straddle=True,
+        )
+        self.assertEqual(layout(signed), [[("a", 0)], [("b", 0)]])
+
+    def test_accessors_touch_one_word(self):
+        record = PackedRecord("Position", members)
+        self.assertEqual(
+            record.getter(fee).fmt(),
+            "function getFee(Position memory self) internal pure returns (uint24 _fee) "
+            "{\n_fee = self.word1.getFee();\n}",
+        )
+        self.assertEqual(
+            record.setter(tick).fmt(),
+            "function setTick(Position memory self, int24 _tick) internal pure "
+            "{\nself.word0 = self.word0.setTick(_tick);\n}",
+        )
+
+    def test_create_and_unpack(self):
+        record = PackedRecord("Position", members, allow_straddle=True)
+        create = record.create_declaration().fmt()
+        self.assertIn("if (_liquidity > _125_BIT_END_MASK)", create)
+        self.assertIn(
+            "self.word0 = PositionWord0Type.createPositionWord0(_owner, _tick, "
+            "uint72(_liquidity & _72_BIT_END_MASK));",
+            create,
+        )
+        self.assertIn(
+            "self.word1 = PositionWord1Type.createPositionWord1("
+            "uint56(_liquidity >> LIQUIDITY_LO_WIDTH_BITS), _fee);",
+            create,
+        )
+        unpack = record.unpack_declaration().fmt()
+        self.assertIn(
+            "(_owner, _tick, _liquidityLo) = self.word0.unpackPositionWord0();", unpack
+        )
+        self.assertIn(
+            "_liquidity = ((uint128(_liquidityHi)) << LIQUIDITY_LO_WIDTH_BITS) "
+            "| _liquidityLo;",
+            unpack,
+        )
+
+    def test_render_file(self):
+        record = PackedRecord("Position", members, allow_straddle=True)
+        rendered = record.render_file().fmt()
+        # width masks are declared once, at file level
+        self.assertEqual(rendered.count("uint256 constant _72_BIT_END_MASK"), 1)
+        for name in ("PositionWord0Type", "PositionWord1Type", "PositionType"):
+            self.assertIn(f"library {name} ", rendered)
+        self.assertIn("using PositionType for Position global;", rendered)
+        optimized = record.render_file(optimize=True).fmt()
+        self.assertNotIn("OWNER_WIDTH_BITS", optimized)
+        self.assertIn("uint256 constant LIQUIDITY_LO_WIDTH_BITS", optimized)
@@ -32,17 +32,52 @@ class TestRegion(TestCase):
         member = Member(name="foo", width_bits=5, bytesN=None, signed=False)
         r = Region(member=member, offset_bits=14)
         setter_str = f"""function setFoo(Udt self, uint8 _foo) internal pure returns (Udt updated) {{
-require(_foo <= _5_BIT_END_MASK, "foo value too large");
+bool err;
 assembly {{
+err := gt(_foo, _5_BIT_END_MASK)
 updated := or(and(self, FOO_NOT_MASK), shl({r.offset_bits_name}, _foo))
 }}
+if (err)
+{{
+revert UnsafeValue();
+}}
 }}"""
         result = r.setter(UserDefinedTypeName("Udt")).fmt()
-        print(result)
-        print("!!!")
-        print(setter_str)
         self.assertEqual(result, setter_str)
 
+    def test_signed_setter_shares_compacted_value(self):
+        member = Member(name="foo", width_bits=16, signed=True, expansion_bits=8)
+        r = Region(member=member, offset_bits=0)
+        setter_str = """function setFoo(Udt self, int24 _foo) internal pure returns (Udt updated) {
+bool err;
+assembly {
+let fooCompacted := sar(FOO_EXPANSION_BITS, _foo)
+err := or(iszero(iszero(and(_foo, FOO_EMPTY_MASK))), iszero(eq(signextend(1, fooCompacted), fooCompacted)))
+updated := or(and(self, FOO_NOT_MASK), and(fooCompacted, _16_BIT_END_MASK))
+}
+if (err)
+{
+revert UnsafeValue();
+}
+}"""
+        self.assertEqual(r.setter(UserDefinedTypeName("Udt")).fmt(), setter_str)
+        getter_str = """function getFoo(Udt self) internal pure returns (int24 _foo) {
+assembly {
+_foo := shl(FOO_EXPANSION_BITS, signextend(1, and(self, _16_BIT_END_MASK)))
+}
+}"""
+        self.assertEqual(r.getter(UserDefinedTypeName("Udt")).fmt(), getter_str)
+
+    def test_violation_predicate(self):
+        r = Region(member=Member(name="foo", width_bits=256), offset_bits=0)
+        self.assertIsNone(r.violation_predicate(r.compacted_reference()))
+        member = Member(name="foo", width_bits=7, expansion_bits=1)
+        r = Region(member=member, offset_bits=0)
+        self.assertEqual(
+            r.violation_predicate(r.compacted_reference()).fmt(),
+            "or(iszero(iszero(and(_foo, FOO_EMPTY_MASK))), gt(fooCompacted, _7_BIT_END_MASK))",
+        )
+
     def test_getter(self):
         member = Member(name="foo", width_bits=5, bytesN=None, signed=False)
         r = Region(member=member, offset_bits=14)
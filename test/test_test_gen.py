@@ -40,3 +40,127 @@ UDVT memory u = createUDVT(foo, bar, baz);
 """
         result = self.tg.fuzz_get_set_region(foo_region).fmt()
         self.assertEqual(result, test_method)
+
+    def test_fuzz_fused_getter(self):
+        fused = UserDefinedValueType(
+            name="UDVT",
+            regions=[foo_region, bar_region, baz_region],
+            value_type="uint256",
+            fused_getters=[("baz", "foo")],
+        )
+        test_gen = TestGen(fused)
+        result = test_gen.fuzz_fused_getter(("baz", "foo")).fmt()
+        self.assertIn(
+            "(uint72 fusedBaz, int8 fusedFoo) = (uDVT.getBazAndFoo());", result
+        )
+        self.assertIn(
+            'assertEq(fusedFoo, foo, "fused getter getBazAndFoo failed for foo");',
+            result,
+        )
+        self.assertIn("function testFusedGetBazAndFoo(", test_gen.generate().fmt())
+
+    def test_fuzz_fused_setter(self):
+        fused = UserDefinedValueType(
+            name="UDVT",
+            regions=[foo_region, bar_region, baz_region],
+            value_type="uint256",
+            fused_setters=[("foo", "baz")],
+        )
+        result = TestGen(fused).fuzz_fused_setter(("foo", "baz")).fmt()
+        self.assertIn(
+            "function testFusedSetFooAndBaz(int8 foo, bytes4 bar, uint72 baz, "
+            "int8 updatedFoo, uint72 updatedBaz) public",
+            result,
+        )
+        self.assertIn(
+            "UDVT updatedUdvt = (uDVT.setFooAndBaz(updatedFoo, updatedBaz));", result
+        )
+        self.assertIn(
+            "assertEq(updatedUdvt.getBar(), bar, "
+            '"getter for bar failed after setFooAndBaz");',
+            result,
+        )
+
+    def test_fuzz_create_unpack(self):
+        result = self.tg.fuzz_create_unpack().fmt()
+        self.assertIn(
+            "(int8 unpackedFoo, bytes4 unpackedBar, uint72 unpackedBaz) = "
+            "(uDVT.unpackUDVT());",
+            result,
+        )
+        self.assertIn('assertEq(unpackedBaz, baz, "unpack failed for baz");', result)
+        self.assertIn("function testCreateUnpackUDVT(", self.tg.generate().fmt())
+
+    def test_fuzz_store_load(self):
+        self.assertNotIn("testStoreLoad", self.tg.generate().fmt())
+        stored = UserDefinedValueType(
+            name="UDVT",
+            regions=[foo_region, bar_region, baz_region],
+            value_type="uint256",
+            storage_accessors=True,
+        )
+        result = TestGen(stored).fuzz_store_load().fmt()
+        self.assertIn("UDVTType.storeBar(slot, bar);", result)
+        self.assertIn(
+            'assertEq(UDVTType.loadBaz(slot), baz, "loadBaz failed");', result
+        )
+        self.assertIn("= (UDVTType.loadUnpackedUDVT(slot));", result)
+        self.assertIn("function testStoreLoadUDVT(", TestGen(stored).generate().fmt())
+
+    def test_fuzz_transient_store_load(self):
+        transient = UserDefinedValueType(
+            name="UDVT",
+            regions=[foo_region, bar_region, baz_region],
+            value_type="uint256",
+            transient_accessors=True,
+        )
+        result = TestGen(transient).fuzz_store_load(transient=True).fmt()
+        self.assertIn("function testTransientStoreLoadUDVT(", result)
+        self.assertIn("UDVTType.tstoreBar(slot, bar);", result)
+        self.assertIn("= (UDVTType.tloadUnpackedUDVT(slot));", result)
+        generated = TestGen(transient).generate().fmt()
+        self.assertIn("pragma solidity ^0.8.24;", generated)
+        self.assertNotIn("function testStoreLoadUDVT(", generated)
+
+    def test_fuzz_calldata_get(self):
+        self.assertNotIn("readCalldata", self.tg.generate().fmt())
+        decoded = UserDefinedValueType(
+            name="UDVT",
+            regions=[foo_region, bar_region, baz_region],
+            value_type="uint256",
+            calldata_accessors=True,
+        )
+        tg = TestGen(decoded)
+        result = tg.fuzz_calldata_get().fmt()
+        self.assertIn("UDVT[] memory words = (new UDVT[](2 ));", result)
+        self.assertIn("words[1 ] = uDVT;", result)
+        self.assertIn(
+            "(int8 calldataFoo, int8[] memory calldataFooArray) = "
+            "(this.readCalldataFoo(words));",
+            result,
+        )
+        expected = """
+function readCalldataBaz(UDVT[] calldata words) external pure returns (uint72 single, uint72[] memory values) {
+single = UDVTType.calldataGetBaz(0x44);
+values = UDVTType.calldataGetBazArray(words);
+}"""
+        self.assertEqual(tg.calldata_reader(baz_region).fmt(), expected.strip())
+        generated = tg.generate().fmt()
+        self.assertIn("function testCalldataGetUDVT(", generated)
+        self.assertIn("function readCalldataBar(", generated)
+
+    def test_fuzz_packed_array(self):
+        self.assertNotIn("testPackedArray", self.tg.generate().fmt())
+        array = UserDefinedValueType.packed_array_of(
+            Member(name="x", width_bits=16), static_accessors=False
+        )
+        tg = TestGen(array)
+        result = tg.fuzz_packed_array().fmt()
+        self.assertIn("xArray packedArray;", result)
+        self.assertIn("packedArray = packedArray.push(second);", result)
+        self.assertIn('assertEq(packedArray.get(1 ), second, "set changed 1");', result)
+        generated = tg.generate().fmt()
+        self.assertIn("function testPackedArrayxArray(", generated)
+        # without static accessors there are no per-index tests
+        self.assertNotIn("function testGetSetIndex0", generated)
+        self.assertNotIn("function testCreateUnpack", generated)
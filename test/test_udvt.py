@@ -46,11 +46,18 @@ class TestUserDefinedValueType(TestCase):
     def test_create_declaration(self):
         create_declaration = f"""
 function createUDVT(int8 _foo, bytes4 _bar, uint72 _baz) internal pure returns (UDVT self) {{
+bool err;
 assembly {{
-self := or(shl(7, gt(_foo, _8_BIT_END_MASK)), and(_foo, _8_BIT_END_MASK))
-self := or(self, shl(BAR_OFFSET, shr(224, _bar)))
+let barCompacted := shr(BAR_EXPANSION_BITS, _bar)
+err := or(or(iszero(eq(signextend(0, _foo), _foo)), gt(barCompacted, _31_BIT_END_MASK)), gt(_baz, _69_BIT_END_MASK))
+self := and(_foo, _8_BIT_END_MASK)
+self := or(self, shl(BAR_OFFSET, barCompacted))
 self := or(self, shl(BAZ_OFFSET, _baz))
 }}
+if (err)
+{{
+revert UnsafeValue();
+}}
 }}"""
         self.assertEqual(
             self.u.create_declaration(typesafe=True).fmt(), create_declaration.strip()
@@ -78,6 +85,285 @@ _baz := and(shr(BAZ_OFFSET, self), _69_BIT_END_MASK)
         result = self.u.unpack_declaration(typesafe=False).fmt()
         self.assertEqual(result, create_declaration.strip())
 
+    def test_optimize_for_layout(self):
+        hot = UserDefinedValueType.from_members(
+            name="UDVT",
+            members=members,
+            value_type="uint256",
+            optimize_for={"baz": 3, "foo": 2},
+        )
+        self.assertEqual([r.member for r in hot.regions], members)
+        self.assertEqual([r.offset_bits for r in hot.regions], [248, 69, 0])
+        foo, _, baz = hot.regions
+        self.assertEqual(
+            baz._shift_and_unmask_statement().fmt(),
+            "_baz := and(self, _69_BIT_END_MASK)",
+        )
+        self.assertEqual(
+            foo._shift_and_unmask_statement().fmt(), "_foo := sar(FOO_OFFSET, self)"
+        )
+        create = hot.create_declaration().fmt()
+        self.assertIn("self := shl(FOO_OFFSET, _foo)", create)
+        self.assertIn("self := or(self, _baz)", create)
+        # unweighted members keep declaration order
+        self.assertEqual(
+            UserDefinedValueType.layout(members, {"bar": 1}), [31, 0, 39]
+        )
+        with self.assertRaises(AssertionError):
+            UserDefinedValueType.layout(members, {"missing": 1})
+
+    def test_fused_getter(self):
+        fused = UserDefinedValueType.from_members(
+            name="UDVT",
+            members=members,
+            value_type="uint256",
+            fused_getters=[("baz", "foo")],
+        )
+        expected = """
+function getBazAndFoo(UDVT self) internal pure returns (uint72 _baz, int8 _foo) {
+assembly {
+_baz := and(shr(BAZ_OFFSET, self), _69_BIT_END_MASK)
+_foo := signextend(0, and(self, _8_BIT_END_MASK))
+}
+}"""
+        self.assertEqual(fused.fused_getter(("baz", "foo")).fmt(), expected.strip())
+        self.assertIn("function getBazAndFoo(", fused.library_declaration().fmt())
+        with self.assertRaises(ValueError):
+            fused.fused_getter(("baz", "missing"))
+
+    def test_fused_setter(self):
+        fused = UserDefinedValueType.from_members(
+            name="UDVT",
+            members=members,
+            value_type="uint256",
+            fused_setters=[("foo", "baz")],
+        )
+        expected = """
+function setFooAndBaz(UDVT self, int8 _foo, uint72 _baz) internal pure returns (UDVT updated) {
+bool err;
+assembly {
+err := or(iszero(eq(signextend(0, _foo), _foo)), gt(_baz, _69_BIT_END_MASK))
+updated := or(or(and(self, FOO_AND_BAZ_NOT_MASK), and(_foo, _8_BIT_END_MASK)), shl(BAZ_OFFSET, _baz))
+}
+if (err)
+{
+revert UnsafeValue();
+}
+}"""
+        self.assertEqual(fused.fused_setter(("foo", "baz")).fmt(), expected.strip())
+        mask = fused.constant_pool().statements()[-1].fmt()
+        self.assertEqual(
+            mask,
+            "uint256 constant FOO_AND_BAZ_NOT_MASK  = "
+            "0xfffffffffffffffffffffffffffffffffffff000000000000000007fffffff00;",
+        )
+        self.assertNotIn("err", fused.fused_setter(("foo", "baz"), typesafe=False).fmt())
+
+    def test_unchecked_variants(self):
+        expected = """
+function setBazUnsafe(UDVT self, uint72 _baz) internal pure returns (UDVT updated) {
+if (DEBUG_ASSERTIONS)
+{
+bool err;
+assembly {
+err := gt(_baz, _69_BIT_END_MASK)
+}
+if (err)
+{
+revert UnsafeValue();
+}
+}
+assembly {
+updated := or(and(self, BAZ_NOT_MASK), shl(BAZ_OFFSET, _baz))
+}
+}"""
+        self.assertEqual(baz_region.unsafe_setter(self.u.name).fmt(), expected.strip())
+        create = self.u.create_unchecked_declaration().fmt()
+        self.assertTrue(
+            create.startswith(
+                "function createUDVTUnchecked(int8 _foo, bytes4 _bar, uint72 _baz)"
+            )
+        )
+        self.assertTrue(
+            create.endswith(
+                """assembly {
+self := and(_foo, _8_BIT_END_MASK)
+self := or(self, shl(BAR_OFFSET, shr(BAR_EXPANSION_BITS, _bar)))
+self := or(self, shl(BAZ_OFFSET, _baz))
+}
+}"""
+            )
+        )
+        library = self.u.library_declaration().fmt()
+        self.assertNotIn("Unsafe(", library)
+        self.assertNotIn("DEBUG_ASSERTIONS", library)
+        library = self.u.library_declaration(unchecked=True).fmt()
+        self.assertIn("bool constant DEBUG_ASSERTIONS  = false;", library)
+        self.assertIn("function setFooUnsafe(", library)
+        self.assertIn("function createUDVTUnchecked(", library)
+        library = self.u.library_declaration(
+            unchecked=True, debug_assertions=True, optimize=True
+        ).fmt()
+        self.assertIn("bool constant DEBUG_ASSERTIONS  = true;", library)
+
+    def test_storage_accessors(self):
+        expected = """
+function storeBaz(bytes32 slot, uint72 _baz) internal {
+bool err;
+assembly {
+err := gt(_baz, _69_BIT_END_MASK)
+sstore(slot, or(and(sload(slot), BAZ_NOT_MASK), shl(BAZ_OFFSET, _baz)))
+}
+if (err)
+{
+revert UnsafeValue();
+}
+}"""
+        self.assertEqual(baz_region.storer().fmt(), expected.strip())
+        expected = """
+function loadBar(bytes32 slot) internal view returns (bytes4 _bar) {
+assembly {
+_bar := shl(BAR_EXPANSION_BITS, and(shr(BAR_OFFSET, sload(slot)), _31_BIT_END_MASK))
+}
+}"""
+        self.assertEqual(bar_region.loader().fmt(), expected.strip())
+        expected = """
+function loadUnpackedUDVT(bytes32 slot) internal view returns (int8 _foo, bytes4 _bar, uint72 _baz) {
+assembly {
+let word := sload(slot)
+_foo := signextend(0, and(word, _8_BIT_END_MASK))
+_bar := shl(BAR_EXPANSION_BITS, and(shr(BAR_OFFSET, word), _31_BIT_END_MASK))
+_baz := and(shr(BAZ_OFFSET, word), _69_BIT_END_MASK)
+}
+}"""
+        self.assertEqual(self.u.load_unpacked_declaration().fmt(), expected.strip())
+        self.assertNotIn("sload", self.u.library_declaration().fmt())
+        stored = UserDefinedValueType.from_members(
+            name="UDVT", members=members, value_type="uint256", storage_accessors=True
+        )
+        library = stored.library_declaration().fmt()
+        self.assertIn("function storeFoo(bytes32 slot, int8 _foo) internal {", library)
+        self.assertIn("function loadUnpackedUDVT(bytes32 slot)", library)
+
+    def test_transient_accessors(self):
+        expected = """
+function tstoreBaz(bytes32 slot, uint72 _baz) internal {
+bool err;
+assembly {
+err := gt(_baz, _69_BIT_END_MASK)
+tstore(slot, or(and(tload(slot), BAZ_NOT_MASK), shl(BAZ_OFFSET, _baz)))
+}
+if (err)
+{
+revert UnsafeValue();
+}
+}"""
+        self.assertEqual(baz_region.storer(transient=True).fmt(), expected.strip())
+        self.assertIn(
+            "_bar := shl(BAR_EXPANSION_BITS, and(shr(BAR_OFFSET, tload(slot)), ",
+            bar_region.loader(transient=True).fmt(),
+        )
+        self.assertIn(
+            "function tloadUnpackedUDVT(bytes32 slot)",
+            self.u.load_unpacked_declaration(transient=True).fmt(),
+        )
+        self.assertIn("pragma solidity ^0.8.20;", self.u.render_file().fmt())
+        transient = UserDefinedValueType.from_members(
+            name="UDVT", members=members, value_type="uint256", transient_accessors=True
+        )
+        rendered = transient.render_file().fmt()
+        self.assertIn("pragma solidity ^0.8.24;", rendered)
+        self.assertIn("function tstoreFoo(bytes32 slot, int8 _foo) internal {", rendered)
+        self.assertNotIn("sload", rendered)
+        combined = UserDefinedValueType.render_combined_file([self.u, transient])
+        self.assertIn("pragma solidity ^0.8.24;", combined.fmt())
+
+    def test_calldata_accessors(self):
+        expected = """
+function calldataGetBaz(uint256 offset) internal pure returns (uint72 _baz) {
+assembly {
+_baz := and(shr(BAZ_OFFSET, calldataload(offset)), _69_BIT_END_MASK)
+}
+}"""
+        self.assertEqual(baz_region.calldata_getter().fmt(), expected.strip())
+        expected = """
+function calldataGetFooArray(UDVT[] calldata words) internal pure returns (int8[] memory values) {
+assembly ("memory-safe") {
+values := mload(0x40)
+mstore(values, words.length)
+let dst := add(values, 0x20)
+let end := add(words.offset, shl(5, words.length))
+for {
+let src := words.offset
+} lt(src, end) {
+src := add(src, 0x20)
+} {
+mstore(dst, signextend(0, and(calldataload(src), _8_BIT_END_MASK)))
+dst := add(dst, 0x20)
+}
+mstore(0x40, dst)
+}
+}"""
+        self.assertEqual(
+            foo_region.calldata_array_getter(self.u.name).fmt(), expected.strip()
+        )
+        self.assertNotIn("calldataload", self.u.library_declaration().fmt())
+        decoded = UserDefinedValueType.from_members(
+            name="UDVT", members=members, value_type="uint256", calldata_accessors=True
+        )
+        library = decoded.library_declaration().fmt()
+        self.assertIn("function calldataGetBar(uint256 offset)", library)
+        self.assertIn("function calldataGetBazArray(UDVT[] calldata words)", library)
+
+    def test_packed_array_accessors(self):
+        flags = UserDefinedValueType.packed_array_of(
+            Member(name="flag", width_bits=1), static_accessors=False
+        )
+        assert flags.array is not None
+        self.assertEqual(flags.array.capacity, 248)
+        self.assertEqual(flags.array.element.offset_bits, 8)
+        expected = """
+function get(flagArray self, uint256 i) internal pure returns (uint8 _element) {
+bool outOfBounds;
+assembly {
+outOfBounds := iszero(lt(i, and(self, _8_BIT_END_MASK)))
+_element := and(shr(add(ELEMENT_OFFSET, mul(i, ELEMENT_WIDTH_BITS)), self), _1_BIT_END_MASK)
+}
+if (outOfBounds)
+{
+revert IndexOutOfBounds();
+}
+}"""
+        self.assertEqual(flags.array.getter(flags.name).fmt(), expected.strip())
+        library = flags.library_declaration().fmt()
+        for function in ("length", "get", "set", "push", "pop"):
+            self.assertIn(f"function {function}(flagArray self", library)
+        self.assertNotIn("function getIndex0(", library)
+        self.assertNotIn("function createflagArray(", library)
+        self.assertNotIn("INDEX1_OFFSET", library)
+        self.assertIn("uint256 constant CAPACITY  = 248 ;", library)
+        self.assertIn(
+            "updated := or(and(add(self, 1), not(shl(shift, _1_BIT_END_MASK))), "
+            "shl(shift, _element))",
+            library,
+        )
+        static = UserDefinedValueType.packed_array_of(Member(name="flag", width_bits=1))
+        library = static.library_declaration().fmt()
+        self.assertIn("function getIndex0(", library)
+        self.assertIn("function push(flagArray self", library)
+        # the length holds 0 through max_length inclusive
+        eight = UserDefinedValueType.packed_array_of(
+            Member(name="x", width_bits=8), max_length=8
+        )
+        self.assertEqual(eight.regions[0].member.width_bits, 4)
+        with self.assertRaises(AssertionError):
+            UserDefinedValueType(
+                name="UDVT",
+                regions=[foo_region],
+                value_type="uint256",
+                static_accessors=False,
+            )
+
     # def test_library_declaration(self):
     #     library_declaration = f""""""
     #     self.assertEqual(self.u.library_declaration(typesafe=True), library_declaration)
@@ -0,0 +1,109 @@
+from unittest import TestCase
+from sol_ast.ast import (
+    BinaryOperation,
+    FunctionDefinition,
+    Identifier,
+    Literal,
+    LiteralKind,
+    ParameterList,
+    SourceUnit,
+    YulBlock,
+    YulExpressionStatement,
+    YulFunctionCall,
+    YulIdentifier,
+    YulLiteral,
+)
+from sol_ast.visitor import NodeTransformer, NodeVisitor, node_fields, walk
+from packed_udvts.member import Member
+from packed_udvts.udvt import UserDefinedValueType
+
+
+def yul_add(lhs, rhs):
+    return YulFunctionCall(YulIdentifier("add"), [lhs, rhs])
+
+
+class TestWalk(TestCase):
+    def test_fields(self):
+        self.assertEqual(node_fields(BinaryOperation)[-3:], ("lhs", "operator", "rhs"))
+        self.assertEqual(node_fields(SourceUnit), ("license", "nodes"))
+        self.assertNotIn("parent", node_fields(FunctionDefinition))
+
+    def test_pre_order(self):
+        expr = yul_add(YulLiteral("1"), YulIdentifier("x"))
+        names = [type(n).__name__ for n in walk(expr)]
+        self.assertEqual(
+            names, ["YulFunctionCall", "YulIdentifier", "YulLiteral", "YulIdentifier"]
+        )
+
+    def test_deep_tree(self):
+        expr = Identifier("x")
+        for _ in range(10_000):
+            expr = BinaryOperation(expr, "+", Literal("1", LiteralKind.Number))
+        self.assertEqual(sum(1 for _ in walk(expr)), 20_001)
+
+    def test_reaches_whole_library(self):
+        unit = UserDefinedValueType.from_members(
+            name="UDVT",
+            members=[Member(name="foo", width_bits=8)],
+            value_type="uint256",
+        ).render_file()
+        kinds = {type(n) for n in walk(unit)}
+        self.assertIn(FunctionDefinition, kinds)
+        self.assertIn(ParameterList, kinds)
+        self.assertIn(YulFunctionCall, kinds)
+
+
+class TestNodeVisitor(TestCase):
+    def test_dispatch_along_mro(self):
+        class Collector(NodeVisitor):
+            def __init__(self):
+                self.seen = []
+
+            def visit_YulFunctionCall(self, node):
+                self.seen.append(node.function_name.name)
+
+            def visit_AstNode(self, node):
+                self.seen.append("*")
+
+        c = Collector()
+        c.visit(yul_add(YulLiteral("1"), yul_add(YulLiteral("2"), YulLiteral("3"))))
+        self.assertEqual(c.seen, ["add", "*", "*", "add", "*", "*", "*"])
+
+    def test_prune(self):
+        class Calls(NodeVisitor):
+            count = 0
+
+            def visit_YulFunctionCall(self, node):
+                self.count += 1
+                return False
+
+        c = Calls()
+        c.visit(yul_add(YulLiteral("1"), yul_add(YulLiteral("2"), YulLiteral("3"))))
+        self.assertEqual(c.count, 1)
+
+
+class TestNodeTransformer(TestCase):
+    def test_replace_post_order(self):
+        class Fold(NodeTransformer):
+            def visit_YulFunctionCall(self, node):
+                a, b = node.arguments
+                if isinstance(a, YulLiteral) and isinstance(b, YulLiteral):
+                    return YulLiteral(str(int(a.value) + int(b.value)))
+                return node
+
+        expr = yul_add(YulLiteral("1"), yul_add(YulLiteral("2"), YulLiteral("3")))
+        self.assertEqual(Fold().visit(expr).fmt(), "6")
+
+    def test_remove_from_list(self):
+        class DropPop(NodeTransformer):
+            def visit_YulExpressionStatement(self, node):
+                if node.expression.function_name.name == "pop":
+                    return None
+                return node
+
+        block = YulBlock(
+            YulExpressionStatement(YulFunctionCall(YulIdentifier("pop"), [])),
+            YulExpressionStatement(yul_add(YulLiteral("1"), YulLiteral("2"))),
+        )
+        DropPop().visit(block)
+        self.assertEqual(len(block.statements), 1)